@@ -2,16 +2,16 @@
 # This client is for Bireysel Başvuru: https://kararlarbilgibankasi.anayasa.gov.tr
 
 import httpx
-from bs4 import BeautifulSoup, Tag
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 import html
 import re
 import io
 from urllib.parse import urlencode, urljoin, quote
-from markitdown import MarkItDown
 import math # For math.ceil for pagination
 
+from http_transport import create_http_client, CACHE_IMMUTABLE
+from lazy_imports import lazy_import
 from .models import (
     AnayasaBireyselReportSearchRequest,
     AnayasaBireyselReportDecisionDetail,
@@ -20,6 +20,9 @@ from .models import (
     AnayasaBireyselBasvuruDocumentMarkdown, # Model for Bireysel Başvuru document
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -31,7 +34,7 @@ class AnayasaBireyselBasvuruApiClient:
     DOCUMENT_MARKDOWN_CHUNK_SIZE = 5000 # Character limit per page
 
     def __init__(self, request_timeout: float = 60.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
             headers={
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -39,7 +42,6 @@ class AnayasaBireyselBasvuruApiClient:
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             },
             timeout=request_timeout,
-            verify=True,
             follow_redirects=True
         )
 
@@ -76,7 +78,7 @@ class AnayasaBireyselBasvuruApiClient:
             logger.error(f"AnayasaBireyselBasvuruApiClient: Error processing Bireysel Başvuru Report search request: {e}")
             raise
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = bs4.BeautifulSoup(html_content, 'html.parser')
 
         total_records = None
         bulunan_karar_div = soup.find("div", class_="bulunankararsayisi")
@@ -190,7 +192,7 @@ class AnayasaBireyselBasvuruApiClient:
             return None
         
         processed_html = html.unescape(full_decision_html_content)
-        soup = BeautifulSoup(processed_html, "html.parser")
+        soup = bs4.BeautifulSoup(processed_html, "html.parser")
         html_input_for_markdown = ""
 
         karar_tab_content = soup.find("div", id="Karar") 
@@ -241,7 +243,7 @@ class AnayasaBireyselBasvuruApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_text = conversion_result.text_content
         except Exception as e:
@@ -264,7 +266,7 @@ class AnayasaBireyselBasvuruApiClient:
         resmi_gazete_info_from_page = None
 
         try:
-            response = await self.http_client.get(full_url)
+            response = await self.http_client.get(full_url, extensions=CACHE_IMMUTABLE)
             response.raise_for_status()
             html_content_from_api = response.text
 
@@ -274,7 +276,7 @@ class AnayasaBireyselBasvuruApiClient:
                     source_url=full_url, markdown_chunk=None, current_page=page_number, total_pages=0, is_paginated=False
                 )
 
-            soup = BeautifulSoup(html_content_from_api, 'html.parser')
+            soup = bs4.BeautifulSoup(html_content_from_api, 'html.parser')
 
             meta_desc_tag = soup.find("meta", attrs={"name": "description"})
             if meta_desc_tag and meta_desc_tag.get("content"):
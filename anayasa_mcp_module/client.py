@@ -2,16 +2,16 @@
 # This client is for Norm Denetimi: https://normkararlarbilgibankasi.anayasa.gov.tr
 
 import httpx
-from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 import html
 import re
 import io
 from urllib.parse import urlencode, urljoin, quote
-from markitdown import MarkItDown
 import math # For math.ceil for pagination
 
+from http_transport import create_http_client, CACHE_IMMUTABLE
+from lazy_imports import lazy_import
 from .models import (
     AnayasaNormDenetimiSearchRequest,
     AnayasaDecisionSummary,
@@ -20,6 +20,9 @@ from .models import (
     AnayasaDocumentMarkdown, # Model for Norm Denetimi document
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -30,7 +33,7 @@ class AnayasaMahkemesiApiClient:
     DOCUMENT_MARKDOWN_CHUNK_SIZE = 5000 # Character limit per page
 
     def __init__(self, request_timeout: float = 60.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
             headers={
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -38,7 +41,6 @@ class AnayasaMahkemesiApiClient:
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             },
             timeout=request_timeout,
-            verify=True,
             follow_redirects=True
         )
 
@@ -113,7 +115,7 @@ class AnayasaMahkemesiApiClient:
             logger.error(f"AnayasaMahkemesiApiClient: Error processing Norm Denetimi search request: {e}")
             raise
 
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = bs4.BeautifulSoup(html_content, 'html.parser')
 
         total_records = None
         bulunan_karar_div = soup.find("div", class_="bulunankararsayisi")
@@ -191,7 +193,7 @@ class AnayasaMahkemesiApiClient:
             return None
 
         processed_html = html.unescape(full_decision_html_content)
-        soup = BeautifulSoup(processed_html, "html.parser")
+        soup = bs4.BeautifulSoup(processed_html, "html.parser")
         html_input_for_markdown = ""
 
         karar_tab_content = soup.find("div", id="Karar") # "KARAR" tab content
@@ -232,7 +234,7 @@ class AnayasaMahkemesiApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_text = conversion_result.text_content
         except Exception as e:
@@ -258,7 +260,7 @@ class AnayasaMahkemesiApiClient:
         try:
             # Use a new client instance for document fetching if headers/timeout needs to be different,
             # or reuse self.http_client if settings are compatible. For now, self.http_client.
-            get_response = await self.http_client.get(full_url, headers={"Accept": "text/html"})
+            get_response = await self.http_client.get(full_url, headers={"Accept": "text/html"}, extensions=CACHE_IMMUTABLE)
             get_response.raise_for_status()
             html_content_from_api = get_response.text
 
@@ -269,7 +271,7 @@ class AnayasaMahkemesiApiClient:
                 )
 
             # Extract metadata from the page content (E.K. No, Date, RG)
-            soup = BeautifulSoup(html_content_from_api, "html.parser")
+            soup = bs4.BeautifulSoup(html_content_from_api, "html.parser")
             karar_metni_div = soup.find("div", class_="KararMetni") # Usually within div#Karar
             if not karar_metni_div: # Fallback if not in KararMetni
                 karar_metni_div = soup.find("div", class_="WordSection1")
@@ -9,10 +9,12 @@ Usage:
     uvicorn asgi_app:app --host 0.0.0.0 --port 8000
 """
 
+import asyncio
 import os
 import time
 import logging
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, HTTPException, Query
 from fastapi.responses import JSONResponse, HTMLResponse, Response
@@ -22,7 +24,10 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 # Import the proper create_app function that includes all middleware
-from mcp_server_main import create_app
+from mcp_server_main import (
+    create_app, restore_semantic_snapshot, persist_semantic_snapshot,
+    WARMUP_ENABLED, run_warmup, is_warm, warmup_status
+)
 
 # Conditional auth-related imports (only if auth enabled)
 _auth_check = os.getenv("ENABLE_AUTH", "false").lower() == "true"
@@ -161,14 +166,18 @@ async def custom_401_handler(request: Request, exc: HTTPException):
 # FastAPI health check endpoint - BEFORE mounting MCP app
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for monitoring"""
-    return {
-        "status": "healthy",
+    """Health check endpoint for monitoring (503 until the startup warmup has finished)"""
+    body = {
+        "status": "healthy" if is_warm() else "warming",
         "service": "Yargı MCP Server",
         "version": "0.1.0",
         "tools_count": len(mcp_server._tool_manager._tools),
-        "auth_enabled": os.getenv("ENABLE_AUTH", "false").lower() == "true"
+        "auth_enabled": os.getenv("ENABLE_AUTH", "false").lower() == "true",
+        "warmup": warmup_status
     }
+    if not is_warm():
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 # Add explicit redirect for /mcp to /mcp/ with method preservation
 @app.api_route("/mcp", methods=["GET", "POST", "HEAD", "OPTIONS"])
@@ -582,8 +591,22 @@ async def mcp_token_endpoint(request: Request):
 # Mount MCP app at /mcp/ with trailing slash
 app.mount("/mcp/", mcp_app)
 
+@asynccontextmanager
+async def lifespan(app_instance):
+    """Warm the semantic index from a snapshot, run the MCP lifespan (and optional warmup), then persist the index."""
+    await restore_semantic_snapshot()
+    async with mcp_app.lifespan(app_instance):
+        # Warmup runs in the background; /health reports 503 until it finishes
+        warmup_task = asyncio.create_task(run_warmup()) if WARMUP_ENABLED else None
+        try:
+            yield
+        finally:
+            if warmup_task is not None and not warmup_task.done():
+                warmup_task.cancel()
+    persist_semantic_snapshot()
+
 # Set the lifespan context after mounting
-app.router.lifespan_context = mcp_app.lifespan
+app.router.lifespan_context = lifespan
 
 # Export for uvicorn
 __all__ = ["app"]
\ No newline at end of file
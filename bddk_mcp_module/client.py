@@ -8,8 +8,9 @@ import re
 import io
 import math
 from urllib.parse import urlparse
-from markitdown import MarkItDown
 
+from http_transport import create_http_client, CACHE_REVALIDATE
+from lazy_imports import lazy_import
 from .models import (
     BddkSearchRequest,
     BddkDecisionSummary,
@@ -17,6 +18,8 @@ from .models import (
     BddkDocumentMarkdown
 )
 
+markitdown = lazy_import("markitdown")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(
@@ -45,13 +48,13 @@ class BddkApiClient:
         else:
             logger.info("Using Tavily API key from environment variable")
         
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             headers={
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             },
             timeout=httpx.Timeout(request_timeout)
         )
-        self.markitdown = MarkItDown()
+        self.markitdown = markitdown.MarkItDown()
     
     async def close_client_session(self):
         """Close the HTTP client session."""
@@ -192,12 +195,17 @@ class BddkApiClient:
                     logger.info(f"Trying BDDK document URL: {url}")
                     response = await self.http_client.get(
                         url,
-                        follow_redirects=True
+                        follow_redirects=True,
+                        extensions=CACHE_REVALIDATE
                     )
                     response.raise_for_status()
                     document_url = url
                     break
-                except httpx.HTTPStatusError:
+                except httpx.HTTPStatusError as e:
+                    # Not found under this pattern; server errors were already
+                    # retried by the transport and would fail for the others too
+                    if e.response.status_code >= 500:
+                        raise
                     continue
             
             if not response or not document_url:
@@ -4,16 +4,20 @@ import httpx
 import base64
 from typing import Optional
 import logging
-from markitdown import MarkItDown
 import io
 
+from http_transport import create_http_client, run_sync_within_deadline
+from lazy_imports import lazy_import
 from .models import (
     BedestenSearchRequest, BedestenSearchResponse,
     BedestenDocumentRequest, BedestenDocumentResponse,
-    BedestenDocumentMarkdown, BedestenDocumentRequestData
+    BedestenDocumentMarkdown, BedestenDocumentRequestData,
+    BedestenDocumentData
 )
 from .enums import get_full_birim_adi
 
+markitdown = lazy_import("markitdown")
+
 logger = logging.getLogger(__name__)
 
 class BedestenApiClient:
@@ -26,8 +30,10 @@ class BedestenApiClient:
     DOCUMENT_ENDPOINT = "/emsal-karar/getDocumentContent"
     
     def __init__(self, request_timeout: float = 60.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
+            idempotent_post=True,  # Search/document POSTs are read-only
+            hedge=True,  # Long latency tail; active when HTTP_HEDGING is enabled
             headers={
                 "Accept": "*/*",
                 "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -87,6 +93,15 @@ class BedestenApiClient:
         """
         logger.info(f"BedestenApiClient: Fetching document for markdown conversion (ID: {document_id})")
         
+        document_data = await self.get_document_content(document_id)
+        # Inline without a deadline; otherwise bounded by the calling tool's remaining budget
+        return await run_sync_within_deadline(self.convert_document_to_markdown, document_id, document_data)
+    
+    async def get_document_content(self, document_id: str) -> BedestenDocumentData:
+        """
+        Fetch raw document content (base64 HTML or PDF) without converting it.
+        Lets callers overlap network fetches with CPU-bound conversion.
+        """
         try:
             # Prepare request
             doc_request = BedestenDocumentRequest(
@@ -112,13 +127,28 @@ class BedestenApiClient:
             if not hasattr(doc_response.data, 'mimeType') or doc_response.data.mimeType is None:
                 raise ValueError("Document data does not contain mimeType")
             
+            return doc_response.data
+            
+        except httpx.RequestError as e:
+            logger.error(f"BedestenApiClient: HTTP error fetching document {document_id}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"BedestenApiClient: Error processing document {document_id}: {e}")
+            raise
+    
+    def convert_document_to_markdown(self, document_id: str, document_data: BedestenDocumentData) -> BedestenDocumentMarkdown:
+        """
+        Convert fetched document content to markdown.
+        Synchronous and CPU-bound; safe to run in a worker thread.
+        """
+        try:
             # Decode base64 content with error handling
             try:
-                content_bytes = base64.b64decode(doc_response.data.content)
+                content_bytes = base64.b64decode(document_data.content)
             except Exception as e:
                 raise ValueError(f"Failed to decode base64 content: {str(e)}")
             
-            mime_type = doc_response.data.mimeType
+            mime_type = document_data.mimeType
             
             logger.info(f"BedestenApiClient: Document mime type: {mime_type}")
             
@@ -139,9 +169,6 @@ class BedestenApiClient:
                 mime_type=mime_type
             )
             
-        except httpx.RequestError as e:
-            logger.error(f"BedestenApiClient: HTTP error fetching document {document_id}: {e}")
-            raise
         except Exception as e:
             logger.error(f"BedestenApiClient: Error processing document {document_id}: {e}")
             raise
@@ -157,7 +184,7 @@ class BedestenApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             result = md_converter.convert(html_stream)
             markdown_content = result.text_content
             
@@ -178,7 +205,7 @@ class BedestenApiClient:
             pdf_stream = io.BytesIO(pdf_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             result = md_converter.convert(pdf_stream)
             markdown_content = result.text_content
             
@@ -1,14 +1,14 @@
 # danistay_mcp_module/client.py
 
 import httpx
-from bs4 import BeautifulSoup 
 from typing import Dict, Any, List, Optional
 import logging
 import html
 import re
 import io
-from markitdown import MarkItDown
 
+from http_transport import create_http_client
+from lazy_imports import lazy_import
 from .models import (
     DanistayKeywordSearchRequest,
     DanistayDetailedSearchRequest,
@@ -18,6 +18,9 @@ from .models import (
     DanistayDetailedSearchRequestData
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -29,15 +32,16 @@ class DanistayApiClient:
     DOCUMENT_ENDPOINT = "/getDokuman"
 
     def __init__(self, request_timeout: float = 30.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
+            idempotent_post=True,  # Search/document POSTs are read-only
             headers={
                 "Content-Type": "application/json; charset=UTF-8", # Arama endpoint'leri için
                 "Accept": "application/json, text/plain, */*",    # Arama endpoint'leri için
                 "X-Requested-With": "XMLHttpRequest",
             },
             timeout=request_timeout,
-            verify=False 
+            tls_profile="insecure"
         )
 
     def _prepare_keywords_for_api(self, keywords: List[str]) -> List[str]:
@@ -133,7 +137,7 @@ class DanistayApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_text = conversion_result.text_content
             logger.info("DanistayApiClient: HTML to Markdown conversion successful.")
@@ -7,8 +7,9 @@ import logging
 import html
 import re
 import io
-from markitdown import MarkItDown
 
+from http_transport import create_http_client
+from lazy_imports import lazy_import
 from .models import (
     EmsalSearchRequest,
     EmsalDetailedSearchRequestData, 
@@ -16,6 +17,8 @@ from .models import (
     EmsalDocumentMarkdown
 )
 
+markitdown = lazy_import("markitdown")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -27,15 +30,16 @@ class EmsalApiClient:
     DOCUMENT_ENDPOINT = "/getDokuman"
 
     def __init__(self, request_timeout: float = 30.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
+            idempotent_post=True,  # Search/document POSTs are read-only
             headers={
                 "Content-Type": "application/json; charset=UTF-8",
                 "Accept": "application/json, text/plain, */*",
                 "X-Requested-With": "XMLHttpRequest",
             },
             timeout=request_timeout,
-            verify=False # As per user's original FastAPI code
+            tls_profile="insecure" # As per user's original FastAPI code
         )
 
     async def search_detailed_decisions(
@@ -123,7 +127,7 @@ class EmsalApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_text = conversion_result.text_content
             logger.info("EmsalApiClient: HTML to Markdown conversion successful.")
@@ -0,0 +1,41 @@
+# http_transport/__init__.py
+
+from .transport import (
+    PoolConfig,
+    HTTP2_AVAILABLE,
+    create_http_client,
+    get_host_pool,
+    get_pool_stats,
+    close_shared_pools,
+    prewarm_connections,
+    get_breaker_states,
+)
+from .breaker import CircuitOpenError
+from .retry import RetryPolicy
+from .hedging import HedgePolicy
+from .cache import CACHE_REVALIDATE, CACHE_IMMUTABLE, http_cache
+from .deadline import DeadlineExceeded, deadline_scope, remaining, check_deadline, run_sync_within_deadline
+from .registry import ResourceRegistry
+
+__all__ = [
+    'PoolConfig',
+    'HTTP2_AVAILABLE',
+    'create_http_client',
+    'get_host_pool',
+    'get_pool_stats',
+    'close_shared_pools',
+    'prewarm_connections',
+    'get_breaker_states',
+    'CircuitOpenError',
+    'RetryPolicy',
+    'HedgePolicy',
+    'CACHE_REVALIDATE',
+    'CACHE_IMMUTABLE',
+    'http_cache',
+    'DeadlineExceeded',
+    'deadline_scope',
+    'remaining',
+    'check_deadline',
+    'run_sync_within_deadline',
+    'ResourceRegistry',
+]
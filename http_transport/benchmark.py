@@ -0,0 +1,173 @@
+# http_transport/benchmark.py
+"""
+Per-document fetch latency: a new client per request vs the shared pools.
+
+The "fresh" mode reproduces the old document fetch paths (a new SSL
+context and httpx.AsyncClient for every document, so every fetch pays a
+TCP+TLS handshake); the "pooled" mode reuses one client from
+create_http_client(), so only the first fetch opens a connection.
+
+Usage:
+    # Built-in targets (Uyuşmazlık and KİK document hosts)
+    python -m http_transport.benchmark --requests 20
+
+    # Specific document URLs
+    python -m http_transport.benchmark --target kik \\
+        --url "https://ekap.kik.gov.tr/EKAP/Vatandas/KurulKararGoster.aspx?KararId=..."
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import ssl
+import statistics
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+import httpx
+
+from .transport import create_http_client, get_ssl_context, close_shared_pools
+
+logger = logging.getLogger(__name__)
+
+HTML_HEADERS = {"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"}
+
+
+@dataclass
+class BenchmarkTarget:
+    """A document host and the TLS profile its client uses."""
+    name: str
+    url: str
+    tls_profile: str
+
+
+DEFAULT_TARGETS = [
+    BenchmarkTarget(name="uyusmazlik", url="https://kararlar.uyusmazlik.gov.tr/", tls_profile="insecure"),
+    BenchmarkTarget(name="kik", url="https://ekap.kik.gov.tr/EKAP/Vatandas/kurulkararsorgu.aspx", tls_profile="legacy"),
+]
+
+
+def _fresh_ssl_context(tls_profile: str) -> ssl.SSLContext:
+    """Build a new SSL context per call, as the old fetch paths did."""
+    context = ssl.create_default_context()
+    if tls_profile != "default":
+        reference = get_ssl_context(tls_profile)
+        context.check_hostname = reference.check_hostname
+        context.verify_mode = reference.verify_mode
+        context.options = reference.options
+        if tls_profile == "legacy":
+            context.set_ciphers('ALL:!aNULL:!eNULL:!EXPORT:!DES:!RC4:!MD5:!PSK:!SRP:!CAMELLIA')
+    return context
+
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    """p50/p95/mean latency in milliseconds."""
+    if not latencies:
+        return {"count": 0}
+    ordered = sorted(latencies)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "count": len(ordered),
+        "p50_ms": round(statistics.median(ordered) * 1000, 1),
+        "p95_ms": round(ordered[p95_index] * 1000, 1),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 1),
+    }
+
+
+async def run_fresh(target: BenchmarkTarget, requests: int, timeout: float) -> Dict[str, Any]:
+    latencies, errors = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(verify=_fresh_ssl_context(target.tls_profile), headers=HTML_HEADERS,
+                                         timeout=timeout, follow_redirects=True) as client:
+                response = await client.get(target.url)
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            errors += 1
+            logger.warning(f"{target.name} fresh request failed: {e}")
+            continue
+        latencies.append(time.perf_counter() - start)
+    return {**summarize(latencies), "errors": errors}
+
+
+async def run_pooled(target: BenchmarkTarget, requests: int, timeout: float) -> Dict[str, Any]:
+    latencies, errors = [], 0
+    async with create_http_client(headers=HTML_HEADERS, timeout=timeout, follow_redirects=True,
+                                  tls_profile=target.tls_profile) as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                response = await client.get(target.url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                errors += 1
+                logger.warning(f"{target.name} pooled request failed: {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+    return {**summarize(latencies), "errors": errors}
+
+
+async def run_benchmark(targets: List[BenchmarkTarget], requests: int = 20, timeout: float = 30.0) -> List[Dict[str, Any]]:
+    """Fetch each target `requests` times in both modes, sequentially."""
+    results = []
+    try:
+        for target in targets:
+            fresh = await run_fresh(target, requests, timeout)
+            pooled = await run_pooled(target, requests, timeout)
+            saved = None
+            if fresh.get("mean_ms") is not None and pooled.get("mean_ms") is not None:
+                saved = round(fresh["mean_ms"] - pooled["mean_ms"], 1)
+            results.append({
+                "target": target.name,
+                "url": target.url,
+                "fresh": fresh,
+                "pooled": pooled,
+                "saved_per_document_ms": saved,
+            })
+    finally:
+        await close_shared_pools()
+    return results
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    header = f"{'target':<12} {'mode':<7} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9} {'errors':>7}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        for mode in ("fresh", "pooled"):
+            stats = result[mode]
+            lines.append(
+                f"{result['target']:<12} {mode:<7} {stats['count']:>4} "
+                f"{stats.get('p50_ms', '-'):>9} {stats.get('p95_ms', '-'):>9} "
+                f"{stats.get('mean_ms', '-'):>9} {stats['errors']:>7}"
+            )
+        if result["saved_per_document_ms"] is not None:
+            lines.append(f"{'':<12} saved {result['saved_per_document_ms']} ms per document")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Document fetch latency: new client per request vs shared pools")
+    parser.add_argument("--target", choices=[t.name for t in DEFAULT_TARGETS],
+                        help="Benchmark only this target (required with --url)")
+    parser.add_argument("--url", help="Document URL to fetch instead of the target's default page")
+    parser.add_argument("--requests", type=int, default=20, help="Fetches per mode")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    targets = [t for t in DEFAULT_TARGETS if args.target in (None, t.name)]
+    if args.url:
+        if not args.target:
+            parser.error("--url requires --target")
+        targets = [BenchmarkTarget(name=args.target, url=args.url, tls_profile=targets[0].tls_profile)]
+
+    results = asyncio.run(run_benchmark(targets, args.requests, args.timeout))
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+
+if __name__ == "__main__":
+    main()
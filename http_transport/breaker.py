@@ -0,0 +1,116 @@
+# http_transport/breaker.py
+"""
+Per-host circuit breaker.
+
+After `failure_threshold` consecutive failures (timeouts, connection
+errors, 500/502/503/504) the circuit opens and requests to the host fail immediately
+with CircuitOpenError instead of waiting for the full client timeout.
+After `recovery_timeout` seconds one probe request is let through
+(half-open); its success closes the circuit, its failure re-opens it.
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float, last_error: Optional[str] = None, request: Optional[httpx.Request] = None):
+        message = f"{host} is unavailable (circuit open after repeated failures); retry in {retry_in:.0f}s"
+        if last_error:
+            message += f". Last error: {last_error}"
+        super().__init__(message, request=request)
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one host."""
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            host: Host name (used in errors and stats)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before a half-open probe
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_request(self, request: Optional[httpx.Request] = None) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already in flight)
+        """
+        if self.state == CLOSED:
+            return False
+        now = time.monotonic()
+        if self.state == OPEN and now - self.opened_at >= self.recovery_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        retry_in = max(0.0, self.recovery_timeout - (now - self.opened_at))
+        raise CircuitOpenError(self.host, retry_in, self.last_error, request=request)
+
+    def record_success(self, probe: bool = False):
+        if probe:
+            self._probe_in_flight = False
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.opened_at = None
+
+    def record_failure(self, error: str, probe: bool = False):
+        if probe:
+            self._probe_in_flight = False
+        self.consecutive_failures += 1
+        self.last_error = error
+        if probe or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Give up the half-open probe slot without a verdict (e.g. the request was cancelled)."""
+        self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN and self.opened_at is not None:
+            retry_in = round(max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_s": retry_in,
+            "last_error": self.last_error,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,202 @@
+# http_transport/cache.py
+"""
+Conditional-GET cache for rarely changing upstream pages.
+
+Requests opt in per call with extensions=CACHE_REVALIDATE or
+extensions=CACHE_IMMUTABLE. Response bodies are kept with their ETag and
+Last-Modified validators; a repeat request is sent with If-None-Match /
+If-Modified-Since and a 304 answer is served from the cache. Immutable
+pages (published decisions) are additionally served without contacting
+the server for `immutable_max_age` seconds. When the upstream cannot be
+reached (timeouts, open circuit, 500/502/503/504) a cached copy up to
+`max_stale` seconds past its last validation is served instead of failing,
+marked with a `Warning: 110` header and the "stale" response extension.
+
+Entries are keyed by URL plus the request headers that select a
+representation (Accept, Accept-Language, Cookie), so pages of one session
+are never served to another. Responses with `Vary: *` are not stored, and
+other Vary-listed headers must match the stored request's values.
+
+Bodies are stored as received (still content-encoded) in a process-wide
+LRU bounded by total size.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+CACHE_REVALIDATE = {"cache": "revalidate"}
+CACHE_IMMUTABLE = {"cache": "immutable"}
+
+# Request headers that are always part of the cache key
+KEY_HEADERS = ("accept", "accept-language", "cookie")
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+@dataclass
+class CachedResponse:
+    """Stored response of one URL."""
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    content: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Values of the response's Vary-listed request headers when it was stored
+    vary: Tuple[Tuple[str, Optional[str]], ...] = ()
+    stored_at: float = field(default_factory=time.monotonic)
+
+    def matches(self, request: httpx.Request) -> bool:
+        """Whether the request selects the same representation (its Vary headers match)."""
+        return all(request.headers.get(name) == value for name, value in self.vary)
+
+    def to_response(self, request: httpx.Request, stale: bool = False) -> httpx.Response:
+        if not stale:
+            return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+        headers = httpx.Headers(self.headers)
+        headers["Warning"] = STALE_WARNING
+        headers["Age"] = str(int(time.monotonic() - self.stored_at))
+        return httpx.Response(self.status_code, headers=headers, content=self.content, request=request,
+                              extensions={"stale": True})
+
+
+class HttpCache:
+    """Size-bounded LRU of cacheable GET responses keyed by URL and representation headers."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, immutable_max_age: float = 86400.0,
+                 max_stale: float = 86400.0):
+        """
+        Initialize HTTP cache.
+
+        Args:
+            max_bytes: Total body size kept before evicting the least recently used entries
+            immutable_max_age: Seconds an immutable page is served without revalidation
+            max_stale: Seconds since its last validation an entry may be served on upstream errors
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 8
+        self.immutable_max_age = immutable_max_age
+        self.max_stale = max_stale
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.size_bytes = 0
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def make_key(request: httpx.Request) -> str:
+        """URL plus the representation-selecting request headers (cookies only as a digest)."""
+        parts = [str(request.url)]
+        for name in KEY_HEADERS:
+            value = request.headers.get(name)
+            if value is None:
+                continue
+            if name == "cookie":
+                value = hashlib.sha256(value.encode()).hexdigest()
+            parts.append(f"{name}={value}")
+        return "\n".join(parts)
+
+    def get(self, key: str, request: Optional[httpx.Request] = None) -> Optional[CachedResponse]:
+        """Entry stored under key, if its Vary headers match the request."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if request is not None and not entry.matches(request):
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse, mode: str) -> bool:
+        """Whether an entry may be served without asking the server."""
+        return mode == "immutable" and time.monotonic() - entry.stored_at < self.immutable_max_age
+
+    def can_serve_stale(self, entry: CachedResponse) -> bool:
+        """Whether an entry is recent enough to stand in for a failed request."""
+        return time.monotonic() - entry.stored_at < self.max_stale
+
+    def put(self, key: str, request: httpx.Request, response: httpx.Response, content: bytes, mode: str) -> bool:
+        """Store a 200 response; returns False if it is not cacheable."""
+        cache_control = response.headers.get("cache-control", "").lower()
+        if response.status_code != 200 or "no-store" in cache_control:
+            return False
+        vary_names = [name.strip().lower() for name in response.headers.get("vary", "").split(",") if name.strip()]
+        if "*" in vary_names:
+            return False
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not (etag or last_modified or mode == "immutable"):
+            return False
+        if len(content) > self.max_entry_bytes:
+            return False
+        self.pop(key)
+        self._entries[key] = CachedResponse(
+            status_code=response.status_code,
+            headers=list(response.headers.raw),
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            vary=tuple((name, request.headers.get(name)) for name in vary_names if name not in KEY_HEADERS),
+        )
+        self.size_bytes += len(content)
+        while self.size_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted.content)
+        return True
+
+    def pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry.content)
+
+    def refresh(self, entry: CachedResponse, not_modified: httpx.Response):
+        """Restart an entry's age after a 304, picking up new validators."""
+        entry.stored_at = time.monotonic()
+        entry.etag = not_modified.headers.get("etag", entry.etag)
+        entry.last_modified = not_modified.headers.get("last-modified", entry.last_modified)
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the cache."""
+        return {
+            "entries": len(self._entries),
+            "size_mb": round(self.size_bytes / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "immutable_max_age_s": self.immutable_max_age,
+            "max_stale_s": self.max_stale,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "mb_saved": round(self.bytes_saved / (1024 * 1024), 2),
+        }
+
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+http_cache = HttpCache(
+    max_bytes=int(float(os.getenv("HTTP_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    immutable_max_age=float(os.getenv("HTTP_CACHE_IMMUTABLE_MAX_AGE", "86400")),
+    max_stale=float(os.getenv("HTTP_CACHE_MAX_STALE", "86400")),
+)
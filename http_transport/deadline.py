@@ -0,0 +1,86 @@
+# http_transport/deadline.py
+"""
+Per-call deadlines carried in a context variable.
+
+A tool invocation runs inside deadline_scope(seconds); everything it
+awaits sees the same deadline through remaining(). The shared transport
+shrinks httpx timeouts to the remaining budget and stops retrying or
+hedging when it is spent, and run_sync_within_deadline() bounds blocking
+work such as document conversion. Nested scopes can only shorten the
+deadline, never extend it.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is started or still running after the call's deadline."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]):
+    """Run the block with a deadline `seconds` from now (None or <= 0: no new deadline)."""
+    if seconds is None or seconds <= 0:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    """Whether the current deadline has passed (or is too close to start anything)."""
+    budget = remaining()
+    return budget is not None and budget <= 0.05
+
+
+def check_deadline(what: str = "operation"):
+    """Raise DeadlineExceeded instead of starting `what` after the deadline."""
+    if deadline_expired():
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+
+def bound_timeouts(timeouts: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    """httpx timeout extension capped at the remaining budget."""
+    budget = remaining()
+    if budget is None:
+        return timeouts
+    budget = max(budget, 0.001)
+    return {name: budget if value is None else min(value, budget) for name, value in timeouts.items()}
+
+
+async def run_sync_within_deadline(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Call a blocking function without overrunning the deadline.
+
+    Without a deadline the function runs inline, as before. With one, it
+    runs in a worker thread and the caller gets DeadlineExceeded when the
+    budget runs out (the thread finishes in the background).
+    """
+    budget = remaining()
+    if budget is None:
+        return func(*args)
+    if budget <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {getattr(func, '__name__', 'call')}")
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(func, *args), budget)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Deadline exceeded during {getattr(func, '__name__', 'call')}") from None
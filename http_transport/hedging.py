@@ -0,0 +1,91 @@
+# http_transport/hedging.py
+"""
+Hedged requests for hosts with a long latency tail.
+
+If an idempotent request has not received response headers after about
+the host's recent p95 latency, an identical second request is sent and
+whichever answers first is used; the other is cancelled. Hedges are
+limited to `ratio` of the host's requests (token bucket), so the extra
+load stays bounded even when the whole host is slow.
+"""
+
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Any
+
+from .retry import RetryBudget
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to hedge and how much extra load is allowed."""
+    enabled: bool = False
+    quantile: float = 0.95
+    # Delay used until enough latency samples have been collected
+    default_delay: float = 2.0
+    min_delay: float = 0.05
+    min_samples: int = 20
+    window: int = 200
+    ratio: float = 0.1
+
+    @classmethod
+    def from_env(cls) -> "HedgePolicy":
+        """Build the policy from HTTP_HEDGE* environment variables."""
+        return cls(
+            enabled=os.getenv("HTTP_HEDGING", "false").lower() in ("1", "true", "yes"),
+            quantile=float(os.getenv("HTTP_HEDGE_QUANTILE", "0.95")),
+            default_delay=float(os.getenv("HTTP_HEDGE_DEFAULT_DELAY", "2")),
+            ratio=float(os.getenv("HTTP_HEDGE_RATIO", "0.1")),
+        )
+
+
+DEFAULT_HEDGE_POLICY = HedgePolicy.from_env()
+
+
+class Hedger:
+    """Latency window, hedge budget and hedge counters of one host."""
+
+    def __init__(self, policy: HedgePolicy = DEFAULT_HEDGE_POLICY):
+        self.policy = policy
+        self.latencies: Deque[float] = deque(maxlen=policy.window)
+        self.budget = RetryBudget(policy.ratio, min_tokens=max(1.0, policy.ratio * 20))
+
+        self.requests = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.budget_exhausted = 0
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first attempt before hedging (about the recent p95)."""
+        if len(self.latencies) < self.policy.min_samples:
+            return self.policy.default_delay
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(self.policy.quantile * len(ordered)))
+        return max(self.policy.min_delay, ordered[index])
+
+    def on_request(self):
+        self.requests += 1
+        self.budget.on_request()
+
+    def try_hedge(self) -> bool:
+        """Take a hedge token; False if the host's hedge budget is used up."""
+        if self.budget.try_spend():
+            self.hedges_sent += 1
+            return True
+        self.budget_exhausted += 1
+        return False
+
+    def record_latency(self, latency: float):
+        self.latencies.append(latency)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+        }
@@ -0,0 +1,138 @@
+# http_transport/limiter.py
+"""
+Adaptive (AIMD) concurrency limit for one upstream host.
+
+The permitted number of in-flight requests grows by about one per
+round-trip while responses stay fast and the limit is actually in use,
+and is cut multiplicatively on overload signals: timeouts, connection
+errors, 429 and 500/502/503/504 responses, or latency far above the host's baseline.
+All clients talking to a host share its limiter through the host pool.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Any, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter; safe to share between event loops run one after another."""
+
+    def __init__(self,
+                 initial_limit: float = 8,
+                 min_limit: float = 1,
+                 max_limit: float = 20,
+                 backoff_ratio: float = 0.5,
+                 latency_tolerance: float = 3.0,
+                 baseline_alpha: float = 0.05):
+        """
+        Initialize limiter.
+
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound (normally the pool's max_connections)
+            backoff_ratio: Factor applied to the limit on an overload signal
+            latency_tolerance: Latency above baseline * tolerance counts as congestion
+            baseline_alpha: Smoothing factor of the baseline (healthy) latency
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_alpha = baseline_alpha
+
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Overload signals from requests started before the last cut do not cut again
+        self._last_decrease = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+        self.max_waiting = 0
+
+    def _release_waiters(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        """Wait for a slot under the current limit."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_waiting = max(self.max_waiting, len(self._waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted just as we were cancelled; hand it on
+                self.in_flight -= 1
+                self._release_waiters()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._release_waiters()
+
+    def on_success(self, latency: float, started_at: float):
+        """Record a healthy response that took `latency` seconds."""
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        elif latency > self.baseline_latency * self.latency_tolerance:
+            # Much slower than usual: the host is queueing
+            self._decrease(started_at, ratio=max(self.backoff_ratio, 0.9))
+            return
+        else:
+            self.baseline_latency += self.baseline_alpha * (latency - self.baseline_latency)
+
+        # Additive increase only when the limit is actually the bottleneck
+        if self.in_flight + 1 >= int(self.limit) and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self.increases += 1
+            self._release_waiters()
+
+    def on_overload(self, started_at: float):
+        """Record a timeout, connection error, 429 or 500/502/503/504 response."""
+        self._decrease(started_at, ratio=self.backoff_ratio)
+
+    def _decrease(self, started_at: float, ratio: float):
+        if started_at < self._last_decrease:
+            return
+        self.limit = max(self.min_limit, self.limit * ratio)
+        self._last_decrease = time.monotonic()
+        self.decreases += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "max_waiting": self.max_waiting,
+            "baseline_latency_ms": round(self.baseline_latency * 1000, 1) if self.baseline_latency is not None else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
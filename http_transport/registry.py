@@ -0,0 +1,81 @@
+# http_transport/registry.py
+"""
+Lazily created, lifespan-managed resources (API clients and friends).
+
+Resources are registered with a factory and only built the first time a
+tool asks for them, so a stdio session that calls one tool constructs one
+client. aclose() closes whatever was created, newest first, and is called
+from the server lifespan instead of an atexit hook.
+"""
+
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceRegistry:
+    """Named resources created on first use and closed together at shutdown."""
+
+    def __init__(self):
+        self._factories: Dict[str, Tuple[Callable[[], Any], Optional[str]]] = {}
+        # Insertion order is creation order
+        self._instances: Dict[str, Any] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], close: Optional[str] = "close_client_session"):
+        """
+        Register a resource factory.
+
+        Args:
+            name: Resource name used with get()
+            factory: Zero-argument callable building the resource
+            close: Name of the (sync or async) method closing the resource, or None
+        """
+        if name in self._factories:
+            raise ValueError(f"Resource '{name}' is already registered")
+        self._factories[name] = (factory, close)
+
+    def get(self, name: str) -> Any:
+        """Get a resource, creating it on first use."""
+        instance = self._instances.get(name)
+        if instance is None:
+            try:
+                factory, _ = self._factories[name]
+            except KeyError:
+                raise KeyError(f"Unknown resource '{name}'. Registered: {', '.join(self._factories)}") from None
+            instance = factory()
+            self._instances[name] = instance
+            logger.info(f"Created resource '{name}' ({instance.__class__.__name__})")
+        return instance
+
+    def is_created(self, name: str) -> bool:
+        return name in self._instances
+
+    def created(self) -> List[str]:
+        """Names of the resources created so far, in creation order."""
+        return list(self._instances)
+
+    async def aclose(self):
+        """Close every created resource, newest first. Resources are re-created on next use."""
+        instances = list(self._instances.items())
+        self._instances.clear()
+        for name, instance in reversed(instances):
+            _, close = self._factories[name]
+            if close is None:
+                continue
+            try:
+                result = getattr(instance, close)()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error closing resource '{name}': {e}")
+        if instances:
+            logger.info(f"Closed {len(instances)} resources")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registered and created resource names."""
+        return {
+            "registered": list(self._factories),
+            "created": self.created(),
+        }
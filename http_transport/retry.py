@@ -0,0 +1,122 @@
+# http_transport/retry.py
+"""
+Retry policy for idempotent upstream requests.
+
+Transient failures (connection errors, timeouts, 429/502/503/504) are
+retried with exponential backoff and full jitter. Each request has a
+budget: at most `max_attempts` attempts and `max_elapsed` seconds from the
+first attempt, so a retried call never blows far past what the caller
+expected. Retry-After is honoured when it fits in that budget. A per-host
+token bucket caps retries at a fraction of recent traffic, so an outage
+does not multiply the load on an already struggling server.
+
+Only GET/HEAD/OPTIONS are retried by default; clients whose POSTs are
+pure searches opt in with create_http_client(idempotent_post=True), and a
+single request can override either way with extensions={"retry": bool}.
+"""
+
+import email.utils
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff and budget settings shared by all retried requests."""
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_elapsed: float = 20.0
+    # Retries allowed per request sent to a host (token bucket refill rate)
+    retry_ratio: float = 0.2
+    min_retry_tokens: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build the policy from HTTP_RETRY_* environment variables."""
+        return cls(
+            max_attempts=int(os.getenv("HTTP_RETRY_MAX_ATTEMPTS", "3")),
+            backoff_base=float(os.getenv("HTTP_RETRY_BACKOFF_BASE", "0.5")),
+            backoff_max=float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "8")),
+            max_elapsed=float(os.getenv("HTTP_RETRY_MAX_ELAPSED", "20")),
+            retry_ratio=float(os.getenv("HTTP_RETRY_RATIO", "0.2")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy.from_env()
+
+
+def is_retryable_request(request: httpx.Request, idempotent_post: bool = False) -> bool:
+    """Whether a request may be sent more than once."""
+    override = request.extensions.get("retry")
+    if override is not None:
+        return bool(override)
+    if request.method in IDEMPOTENT_METHODS:
+        return True
+    return idempotent_post and request.method == "POST"
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """Transient transport errors; pool exhaustion and open circuits are not retried."""
+    if isinstance(e, httpx.PoolTimeout):
+        return False
+    return isinstance(e, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryBudget:
+    """Per-host token bucket limiting retries to a fraction of recent requests."""
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = min_tokens
+        self.tokens = min_tokens
+
+        self.retries = 0
+        self.exhausted = 0
+
+    def on_request(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False if the host's retry budget is used up."""
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": round(self.tokens, 1),
+            "retries": self.retries,
+            "budget_exhausted": self.exhausted,
+        }
@@ -0,0 +1,543 @@
+# http_transport/transport.py
+"""
+Shared HTTP transport for all upstream API clients.
+
+Every client gets its own httpx.AsyncClient (base URL, headers, cookies and
+timeouts stay per client), but requests are routed to one process-wide
+connection pool per (host, TLS profile). Clients that talk to the same host
+(e.g. the Anayasa norm/bireysel clients and the unified client wrapping them)
+therefore share warm keep-alive connections, pool limits are explicit, and
+HTTP/2 is negotiated via ALPN where the server supports it.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import ssl
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+
+from .breaker import CircuitBreaker
+from .cache import HTTP_CACHE_ENABLED, http_cache
+from .deadline import DeadlineExceeded, bound_timeouts, check_deadline, deadline_expired, remaining
+from .hedging import DEFAULT_HEDGE_POLICY, Hedger
+from .limiter import AdaptiveConcurrencyLimiter
+from .retry import (
+    DEFAULT_RETRY_POLICY,
+    RETRY_STATUSES,
+    RetryBudget,
+    RetryPolicy,
+    is_retryable_error,
+    is_retryable_request,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# TLS profiles used by the upstream servers:
+#   default  - normal certificate verification
+#   insecure - verification disabled (servers with broken chains)
+#   legacy   - verification disabled, legacy renegotiation and wider cipher list (KİK)
+TLS_PROFILES = ("default", "insecure", "legacy")
+_LEGACY_CIPHERS = 'ALL:!aNULL:!eNULL:!EXPORT:!DES:!RC4:!MD5:!PSK:!SRP:!CAMELLIA'
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for one host."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    # Adaptive (AIMD) in-flight request limit, bounded by max_connections
+    adaptive_concurrency: bool = True
+    initial_concurrency: int = 8
+    # Fail fast while a host is down
+    circuit_breaker: bool = True
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+
+
+def _env_pool_config() -> PoolConfig:
+    return PoolConfig(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes"),
+        adaptive_concurrency=os.getenv("HTTP_ADAPTIVE_CONCURRENCY", "true").lower() in ("1", "true", "yes"),
+        initial_concurrency=int(os.getenv("HTTP_INITIAL_CONCURRENCY", "8")),
+        circuit_breaker=os.getenv("HTTP_CIRCUIT_BREAKER", "true").lower() in ("1", "true", "yes"),
+        breaker_failure_threshold=int(os.getenv("HTTP_BREAKER_FAILURE_THRESHOLD", "5")),
+        breaker_recovery_timeout=float(os.getenv("HTTP_BREAKER_RECOVERY_TIMEOUT", "30")),
+    )
+
+
+DEFAULT_POOL_CONFIG = _env_pool_config()
+
+# Hosts that need different limits than the default
+HOST_POOL_CONFIGS: Dict[str, PoolConfig] = {
+    # Semantic search fetches many documents concurrently
+    "bedesten.adalet.gov.tr": PoolConfig(
+        max_connections=max(DEFAULT_POOL_CONFIG.max_connections, 40),
+        max_keepalive_connections=max(DEFAULT_POOL_CONFIG.max_keepalive_connections, 20),
+        keepalive_expiry=DEFAULT_POOL_CONFIG.keepalive_expiry,
+        http2=DEFAULT_POOL_CONFIG.http2,
+        adaptive_concurrency=DEFAULT_POOL_CONFIG.adaptive_concurrency,
+        initial_concurrency=max(DEFAULT_POOL_CONFIG.initial_concurrency, 16),
+        circuit_breaker=DEFAULT_POOL_CONFIG.circuit_breaker,
+        breaker_failure_threshold=DEFAULT_POOL_CONFIG.breaker_failure_threshold,
+        breaker_recovery_timeout=DEFAULT_POOL_CONFIG.breaker_recovery_timeout,
+    ),
+}
+
+
+def get_pool_config(host: str) -> PoolConfig:
+    """Pool settings for a host."""
+    return HOST_POOL_CONFIGS.get(host, DEFAULT_POOL_CONFIG)
+
+
+# Keyed by (TLS profile, HTTP/2): httpcore sets the ALPN protocols on the
+# context it is given, so pools that differ in HTTP/2 must not share one
+_ssl_contexts: Dict[Tuple[str, bool], ssl.SSLContext] = {}
+
+
+def get_ssl_context(tls_profile: str, http2: bool = False) -> ssl.SSLContext:
+    """SSL context for a TLS profile and HTTP/2 setting, built once per process."""
+    if tls_profile not in TLS_PROFILES:
+        raise ValueError(f"Unknown TLS profile: {tls_profile}. Valid options: {', '.join(TLS_PROFILES)}")
+    key = (tls_profile, http2)
+    context = _ssl_contexts.get(key)
+    if context is None:
+        context = ssl.create_default_context()
+        if tls_profile in ("insecure", "legacy"):
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if tls_profile == "legacy":
+            # Enable legacy server connect option for older SSL implementations (Python 3.12+)
+            if hasattr(ssl, 'OP_LEGACY_SERVER_CONNECT'):
+                context.options |= ssl.OP_LEGACY_SERVER_CONNECT
+            context.set_ciphers(_LEGACY_CIPHERS)
+        # The same protocols httpcore would set, so its own call changes nothing
+        context.set_alpn_protocols(["http/1.1", "h2"] if http2 else ["http/1.1"])
+        _ssl_contexts[key] = context
+    return context
+
+
+# Server errors that signal a failing backend; other 5xx (501, 505, vendor
+# codes) are answers about the request itself and say nothing about load
+BACKEND_FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def is_overload_status(status_code: int) -> bool:
+    """Responses that signal an overloaded or failing backend."""
+    return status_code == 429 or status_code in BACKEND_FAILURE_STATUSES
+
+
+def is_overload_error(error: Exception) -> bool:
+    """Transport errors that signal an overloaded or unreachable backend (not local pool exhaustion)."""
+    if isinstance(error, httpx.PoolTimeout):
+        return False
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_host_limiter(host: str) -> AdaptiveConcurrencyLimiter:
+    """Get or create the adaptive concurrency limiter of a host."""
+    limiter = _limiters.get(host)
+    if limiter is None:
+        config = get_pool_config(host)
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=config.initial_concurrency,
+            max_limit=config.max_connections,
+        )
+        _limiters[host] = limiter
+    return limiter
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_host_breaker(host: str) -> CircuitBreaker:
+    """Get or create the circuit breaker of a host."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        config = get_pool_config(host)
+        breaker = CircuitBreaker(
+            host,
+            failure_threshold=config.breaker_failure_threshold,
+            recovery_timeout=config.breaker_recovery_timeout,
+        )
+        _breakers[host] = breaker
+    return breaker
+
+
+def get_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Circuit breaker state of every host contacted so far."""
+    return {host: breaker.get_stats() for host, breaker in _breakers.items()}
+
+
+class HostPool:
+    """Connection pool for one (host, TLS profile) with request statistics and an adaptive concurrency limit."""
+
+    def __init__(self, host: str, tls_profile: str, config: PoolConfig):
+        self.host = host
+        self.tls_profile = tls_profile
+        self.config = config
+        self.http2 = config.http2 and HTTP2_AVAILABLE
+        self.transport = httpx.AsyncHTTPTransport(
+            verify=get_ssl_context(tls_profile, self.http2),
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        # Shared with pools of the same host under other TLS profiles
+        self.limiter = get_host_limiter(host) if config.adaptive_concurrency else None
+        self.breaker = get_host_breaker(host) if config.circuit_breaker else None
+        self.retry_budget = RetryBudget(DEFAULT_RETRY_POLICY.retry_ratio, DEFAULT_RETRY_POLICY.min_retry_tokens)
+        self.hedger = Hedger(DEFAULT_HEDGE_POLICY)
+        self.requests = 0
+        self.errors = 0
+        self.active_requests = 0
+        self.responses_by_http_version: Dict[str, int] = {}
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        if self.breaker is None:
+            return await self._send_limited(request)
+        probe = self.breaker.before_request(request)
+        try:
+            response = await self._send_limited(request)
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.release_probe()
+            raise
+        except Exception as e:
+            if is_overload_error(e) and not deadline_expired():
+                self.breaker.record_failure(str(e) or e.__class__.__name__, probe)
+            elif probe:
+                self.breaker.release_probe()
+            raise
+        if response.status_code in BACKEND_FAILURE_STATUSES:
+            self.breaker.record_failure(f"HTTP {response.status_code}", probe)
+        else:
+            self.breaker.record_success(probe)
+        return response
+
+    async def _send_limited(self, request: httpx.Request) -> httpx.Response:
+        if self.limiter is None:
+            return await self.transport.handle_async_request(request)
+        # The slot covers the time to response headers; bodies are streamed afterwards
+        async with self.limiter.slot():
+            started_at = time.monotonic()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                # A timeout cut short by the caller's deadline says nothing about the host
+                if is_overload_error(e) and not deadline_expired():
+                    self.limiter.on_overload(started_at)
+                raise
+            if is_overload_status(response.status_code):
+                self.limiter.on_overload(started_at)
+            else:
+                self.limiter.on_success(time.monotonic() - started_at, started_at)
+            return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.active_requests += 1
+        try:
+            response = await self._send(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.active_requests -= 1
+        http_version = response.extensions.get("http_version", b"HTTP/1.1")
+        if isinstance(http_version, bytes):
+            http_version = http_version.decode("ascii", "replace")
+        self.responses_by_http_version[http_version] = self.responses_by_http_version.get(http_version, 0) + 1
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration, request counters and current connections."""
+        connections = idle = 0
+        # httpcore does not expose pool state publicly; report it when available
+        pool = getattr(self.transport, "_pool", None)
+        for connection in getattr(pool, "connections", []) or []:
+            connections += 1
+            try:
+                if connection.is_idle():
+                    idle += 1
+            except Exception:
+                pass
+        return {
+            "host": self.host,
+            "tls_profile": self.tls_profile,
+            **asdict(self.config),
+            "http2": self.http2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "active_requests": self.active_requests,
+            "connections": connections,
+            "idle_connections": idle,
+            "responses_by_http_version": dict(self.responses_by_http_version),
+            "concurrency": self.limiter.get_stats() if self.limiter is not None else None,
+            "circuit": self.breaker.state if self.breaker is not None else None,
+            "retries": self.retry_budget.get_stats(),
+            "hedging": self.hedger.get_stats() if self.hedger.requests else None,
+        }
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_pools: Dict[Tuple[str, str], HostPool] = {}
+
+
+def get_host_pool(host: str, tls_profile: str = "default") -> HostPool:
+    """Get or create the process-wide pool for a host and TLS profile."""
+    key = (host, tls_profile)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = HostPool(host, tls_profile, get_pool_config(host))
+        _pools[key] = pool
+        logger.info(f"Created connection pool for {host} (tls={tls_profile}, http2={pool.http2}, "
+                    f"max_connections={pool.config.max_connections})")
+    return pool
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Client-side transport that routes each request to the shared pool of its host.
+
+    Closing a client does not close the shared pools; they live until
+    close_shared_pools() is called at shutdown.
+    """
+
+    def __init__(self, tls_profile: str = "default", idempotent_post: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None, hedge: bool = False):
+        get_ssl_context(tls_profile)  # Validate the profile early
+        self.tls_profile = tls_profile
+        self.idempotent_post = idempotent_post
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.hedge = hedge and DEFAULT_HEDGE_POLICY.enabled
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        pool = get_host_pool(request.url.host, self.tls_profile)
+        cache_mode = request.extensions.get("cache")
+        if cache_mode and HTTP_CACHE_ENABLED and request.method == "GET":
+            return await self._send_cached(pool, request, cache_mode)
+        return await self._send(pool, request)
+
+    async def _send_cached(self, pool: HostPool, request: httpx.Request, mode: str) -> httpx.Response:
+        """Serve from the HTTP cache, revalidating with the stored validators when needed."""
+        key = http_cache.make_key(request)
+        entry = http_cache.get(key, request)
+        if entry is not None:
+            if http_cache.is_fresh(entry, mode):
+                http_cache.hits += 1
+                http_cache.bytes_saved += len(entry.content)
+                return entry.to_response(request)
+            request.headers.update(http_cache.conditional_headers(entry))
+        try:
+            response = await self._send(pool, request)
+        except (httpx.TransportError, DeadlineExceeded) as e:
+            if entry is None or not http_cache.can_serve_stale(entry):
+                raise
+            http_cache.stale_served += 1
+            logger.warning(f"Serving stale cached copy of {request.url} after upstream error: {e}")
+            return entry.to_response(request, stale=True)
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            http_cache.refresh(entry, response)
+            http_cache.revalidated += 1
+            http_cache.bytes_saved += len(entry.content)
+            return entry.to_response(request)
+        if (entry is not None and response.status_code in BACKEND_FAILURE_STATUSES
+                and http_cache.can_serve_stale(entry)):
+            await response.aclose()
+            http_cache.stale_served += 1
+            logger.warning(f"Serving stale cached copy of {request.url} after HTTP {response.status_code}")
+            return entry.to_response(request, stale=True)
+        http_cache.misses += 1
+        if response.status_code != 200:
+            return response
+        # Body as received (still content-encoded); the client decodes it as usual
+        content = b"".join([chunk async for chunk in response.aiter_raw()])
+        http_cache.put(key, request, response, content, mode)
+        return httpx.Response(response.status_code, headers=response.headers.raw, content=content,
+                              request=request, extensions=response.extensions)
+
+    async def _send(self, pool: HostPool, request: httpx.Request) -> httpx.Response:
+        if not is_retryable_request(request, self.idempotent_post):
+            return await self._send_attempt(pool, request)
+        if self.retry_policy.max_attempts <= 1:
+            return await self._send_once(pool, request)
+        return await self._send_with_retries(pool, request)
+
+    async def _send_attempt(self, pool: HostPool, request: httpx.Request) -> httpx.Response:
+        """Send one attempt with its timeouts capped at the caller's remaining deadline."""
+        check_deadline(f"{request.method} {request.url}")
+        request.extensions["timeout"] = bound_timeouts(request.extensions.get("timeout", {}))
+        return await pool.handle_async_request(request)
+
+    async def _send_once(self, pool: HostPool, request: httpx.Request) -> httpx.Response:
+        if self.hedge:
+            return await self._send_hedged(pool, request)
+        return await self._send_attempt(pool, request)
+
+    async def _send_hedged(self, pool: HostPool, request: httpx.Request) -> httpx.Response:
+        """Send the request; if it is slower than the host's p95, race an identical second one."""
+        hedger = pool.hedger
+        hedger.on_request()
+        started_at = [time.monotonic()]
+        attempts = [asyncio.ensure_future(self._send_attempt(pool, request))]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedger.hedge_delay())
+            if not done and hedger.try_hedge():
+                attempts.append(asyncio.ensure_future(self._send_attempt(pool, request)))
+                started_at.append(time.monotonic())
+            pending = set(attempts)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((a for a in attempts if a in done and a.exception() is None), None)
+            if winner is None:
+                # Every attempt failed; report the first request's error
+                return attempts[0].result()
+            # The winner's own latency, so hedged requests do not inflate the p95
+            hedger.record_latency(time.monotonic() - started_at[attempts.index(winner)])
+            if len(attempts) > 1:
+                if winner is attempts[0]:
+                    hedger.primary_wins += 1
+                else:
+                    hedger.hedge_wins += 1
+            return winner.result()
+        finally:
+            losers = [a for a in attempts if a is not winner]
+            for attempt in losers:
+                attempt.cancel()
+            for attempt, result in zip(losers, await asyncio.gather(*losers, return_exceptions=True)):
+                if isinstance(result, httpx.Response):
+                    await result.aclose()
+
+    async def _send_with_retries(self, pool: HostPool, request: httpx.Request) -> httpx.Response:
+        started_at = time.monotonic()
+        pool.retry_budget.on_request()
+        attempt = 1
+        while True:
+            try:
+                response = await self._send_once(pool, request)
+            except Exception as e:
+                if not is_retryable_error(e):
+                    raise
+                delay = self._retry_delay(pool, attempt, started_at)
+                if delay is None:
+                    raise
+                reason = str(e) or e.__class__.__name__
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self._retry_delay(pool, attempt, started_at, retry_after)
+                if delay is None:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+            logger.info(f"Retrying {request.method} {request.url} in {delay:.2f}s "
+                        f"(attempt {attempt + 1}/{self.retry_policy.max_attempts}): {reason}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, pool: HostPool, attempt: int, started_at: float,
+                     retry_after: Optional[float] = None) -> Optional[float]:
+        """Delay before the next attempt, or None if the request is out of retries."""
+        policy = self.retry_policy
+        if attempt >= policy.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else policy.backoff(attempt)
+        if time.monotonic() - started_at + delay > policy.max_elapsed:
+            return None
+        budget = remaining()
+        if budget is not None and delay >= budget:
+            return None
+        if not pool.retry_budget.try_spend():
+            return None
+        return delay
+
+    async def aclose(self):
+        pass
+
+
+def create_http_client(tls_profile: str = "default", idempotent_post: bool = False, hedge: bool = False,
+                       **kwargs: Any) -> httpx.AsyncClient:
+    """
+    Create an httpx.AsyncClient backed by the shared per-host pools.
+
+    Args:
+        tls_profile: One of TLS_PROFILES; replaces httpx's 'verify' argument
+        idempotent_post: Retry POST requests too (for clients whose POSTs are read-only searches)
+        hedge: Hedge slow idempotent requests (only when HTTP_HEDGING is enabled)
+        **kwargs: Any other httpx.AsyncClient argument (base_url, headers, timeout, ...)
+
+    Returns:
+        Configured AsyncClient
+    """
+    if "verify" in kwargs or "transport" in kwargs:
+        raise TypeError("create_http_client() configures TLS and transport itself; pass tls_profile instead")
+    return httpx.AsyncClient(transport=SharedTransport(tls_profile, idempotent_post, hedge=hedge), **kwargs)
+
+
+async def prewarm_connections(http_client: httpx.AsyncClient, url: Optional[str] = None, connections: int = 1) -> int:
+    """
+    Open keep-alive connections in the shared pool behind an API client.
+
+    Sends `connections` concurrent HEAD requests so that many connections
+    (TCP + TLS, and DNS) are established and left idle in the pool; they
+    stay warm for the pool's keepalive_expiry. The response status does
+    not matter, only that the server answered.
+
+    Args:
+        http_client: Client created with create_http_client()
+        url: URL to request; defaults to the client's base URL
+        connections: Number of connections to open
+
+    Returns:
+        Number of requests that got a response
+    """
+    target = url or str(http_client.base_url)
+    results = await asyncio.gather(
+        *(http_client.head(target) for _ in range(max(1, connections))),
+        return_exceptions=True
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if len(failures) == len(results):
+        raise failures[0]
+    return len(results) - len(failures)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every shared pool, keyed by 'host (tls_profile)'."""
+    return {f"{host} ({tls_profile})": pool.get_stats() for (host, tls_profile), pool in _pools.items()}
+
+
+async def close_shared_pools():
+    """Close every shared pool (call once at shutdown)."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        try:
+            await pool.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing connection pool for {pool.host}: {e}")
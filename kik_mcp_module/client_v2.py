@@ -3,7 +3,6 @@
 import httpx
 import logging
 import uuid
-import ssl
 import os
 from typing import Optional
 from datetime import datetime
@@ -16,6 +15,7 @@ try:
 except ImportError:
     HAS_CRYPTOGRAPHY = False
 
+from http_transport import create_http_client
 from .models_v2 import (
     KikV2DecisionType, KikV2SearchPayload, KikV2SearchPayloadDk, KikV2SearchPayloadMk,
     KikV2RequestData, KikV2QueryRequest, KikV2KeyValuePair, 
@@ -91,21 +91,9 @@ class KikV2ApiClient:
         return iv.hex() + ciphertext.hex()
 
     def __init__(self, request_timeout: float = 60.0):
-        # Create SSL context with legacy server support
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Enable legacy server connect option for older SSL implementations (Python 3.12+)
-        if hasattr(ssl, 'OP_LEGACY_SERVER_CONNECT'):
-            ssl_context.options |= ssl.OP_LEGACY_SERVER_CONNECT
-        
-        # Set broader cipher suite support including legacy ciphers
-        ssl_context.set_ciphers('ALL:!aNULL:!eNULL:!EXPORT:!DES:!RC4:!MD5:!PSK:!SRP:!CAMELLIA')
-        
-        self.http_client = httpx.AsyncClient(
+        # Legacy TLS profile: legacy server connect and broader cipher suite support
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
-            verify=ssl_context,
             headers={
                 "Accept": "application/json",
                 "Accept-Language": "tr",
@@ -121,7 +109,19 @@ class KikV2ApiClient:
                 "sec-ch-ua-mobile": "?0",
                 "sec-ch-ua-platform": '"macOS"'
             },
-            timeout=request_timeout
+            timeout=request_timeout,
+            tls_profile="legacy"
+        )
+        # Decision pages on ekap.kik.gov.tr are fetched as HTML with the same legacy TLS profile
+        self.document_client = create_http_client(
+            headers={
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "tr,en-US;q=0.5",
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+            },
+            timeout=60.0,
+            follow_redirects=True,
+            tls_profile="legacy"
         )
         
         # Generate security headers (these might need to be updated based on API requirements)
@@ -407,28 +407,10 @@ class KikV2ApiClient:
             # Step 2: Use httpx to get the document content
             logger.info(f"KikV2ApiClient: Step 2 - Using httpx to retrieve document from: {document_url}")
 
-            # Create a separate httpx client for document retrieval with HTML headers
-            doc_ssl_context = ssl.create_default_context()
-            doc_ssl_context.check_hostname = False
-            doc_ssl_context.verify_mode = ssl.CERT_NONE
-            if hasattr(ssl, 'OP_LEGACY_SERVER_CONNECT'):
-                doc_ssl_context.options |= ssl.OP_LEGACY_SERVER_CONNECT
-            doc_ssl_context.set_ciphers('ALL:!aNULL:!eNULL:!EXPORT:!DES:!RC4:!MD5:!PSK:!SRP:!CAMELLIA')
-
-            async with httpx.AsyncClient(
-                verify=doc_ssl_context,
-                headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "tr,en-US;q=0.5",
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
-                },
-                timeout=60.0,
-                follow_redirects=True
-            ) as doc_client:
-                response = await doc_client.get(document_url)
-                response.raise_for_status()
-                html_content = response.text
-                logger.info(f"KikV2ApiClient: Retrieved content via httpx, length: {len(html_content)}")
+            response = await self.document_client.get(document_url)
+            response.raise_for_status()
+            html_content = response.text
+            logger.info(f"KikV2ApiClient: Retrieved content via httpx, length: {len(html_content)}")
             
             # Convert HTML to Markdown using MarkItDown with BytesIO
             try:
@@ -472,4 +454,5 @@ class KikV2ApiClient:
     async def close_client_session(self):
         """Close HTTP client session."""
         await self.http_client.aclose()
+        await self.document_client.aclose()
         logger.info("KikV2ApiClient: HTTP client session closed.")
\ No newline at end of file
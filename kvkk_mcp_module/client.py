@@ -1,7 +1,6 @@
 # kvkk_mcp_module/client.py
 
 import httpx
-from bs4 import BeautifulSoup
 from typing import List, Optional, Dict, Any
 import logging
 import os
@@ -9,9 +8,10 @@ import re
 import io
 import math
 from urllib.parse import urljoin, urlparse, parse_qs
-from markitdown import MarkItDown
 from pydantic import HttpUrl
 
+from http_transport import create_http_client, CACHE_IMMUTABLE
+from lazy_imports import lazy_import
 from .models import (
     KvkkSearchRequest,
     KvkkDecisionSummary,
@@ -19,6 +19,9 @@ from .models import (
     KvkkDocumentMarkdown
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(
@@ -46,14 +49,13 @@ class KvkkApiClient:
         else:
             logger.info("Using Brave API token from environment variable")
         
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             headers={
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             },
             timeout=request_timeout,
-            verify=True,
             follow_redirects=True
         )
     
@@ -194,7 +196,7 @@ class KvkkApiClient:
     def _extract_decision_content_from_html(self, html: str, url: str) -> Dict[str, Any]:
         """Extract decision content from KVKK decision page HTML."""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = bs4.BeautifulSoup(html, 'html.parser')
             
             # Extract title
             title = None
@@ -269,7 +271,7 @@ class KvkkApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown(enable_plugins=False)
+            md_converter = markitdown.MarkItDown(enable_plugins=False)
             result = md_converter.convert(html_stream)
             return result.text_content
         except Exception as e:
@@ -282,7 +284,7 @@ class KvkkApiClient:
         
         try:
             # Fetch the decision page
-            response = await self.http_client.get(decision_url)
+            response = await self.http_client.get(decision_url, extensions=CACHE_IMMUTABLE)
             response.raise_for_status()
             
             # Extract content from HTML
@@ -0,0 +1,57 @@
+# lazy_imports.py
+"""
+Deferred imports for heavy optional dependencies.
+
+lazy_import("markitdown") returns a module object immediately; the real
+import runs on first attribute access (e.g. markitdown.MarkItDown()), so
+importing the server does not pay for converters, PDF readers or numpy
+until a tool actually needs them.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Placeholder that imports the real module on first attribute access.
+
+    Attribute lookups are delegated to the real module through the regular
+    import system, whose per-module locks make the first load safe when it
+    happens concurrently from worker threads (importlib.util.LazyLoader is
+    not thread-safe before Python 3.12).
+    """
+
+    def __getattr__(self, attr: str):
+        return getattr(importlib.import_module(self.__name__), attr)
+
+    def __dir__(self):
+        return dir(importlib.import_module(self.__name__))
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module lazily.
+
+    Args:
+        name: Absolute module name
+
+    Returns:
+        The module if already imported, otherwise a LazyModule for it
+
+    Raises:
+        ModuleNotFoundError: If the module (or its parent package) cannot be found
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """Whether a module has actually been imported."""
+    return name in sys.modules
@@ -221,7 +221,7 @@ async def oauth_callback(
             store = get_redis_session_store()
             if store:
                 # Store in Redis with automatic expiration
-                success = store.set_oauth_code(auth_code, code_data)
+                success = await store.set_oauth_code(auth_code, code_data)
                 if success:
                     logger.info(f"Stored authorization code {auth_code[:10]}... in Redis with real JWT token")
                 else:
@@ -332,7 +332,7 @@ async def oauth_callback_post(request: Request):
         # Try to get from Redis first, then fall back to in-memory
         store = get_redis_session_store()
         if store:
-            stored_code_data = store.get_oauth_code(code, delete_after_use=True)
+            stored_code_data = await store.get_oauth_code(code, delete_after_use=True)
             if stored_code_data:
                 logger.info(f"Retrieved authorization code {code[:10]}... from Redis")
             else:
@@ -457,7 +457,7 @@ async def token_endpoint(request: Request):
         # Try to get from Redis first, then fall back to in-memory
         store = get_redis_session_store()
         if store:
-            stored_code_data = store.get_oauth_code(code, delete_after_use=True)
+            stored_code_data = await store.get_oauth_code(code, delete_after_use=True)
             if stored_code_data:
                 logger.info(f"Retrieved authorization code {code[:10]}... from Redis (/token endpoint)")
             else:
@@ -1,22 +1,24 @@
 # mcp_server_main.py
 import asyncio
-import atexit
+import importlib.util
+import sys
+from contextlib import asynccontextmanager
 import logging
+import os
 import httpx
 import json
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from datetime import datetime
 from pydantic import HttpUrl, Field
-from typing import Optional, Dict, List, Literal, Any
+from typing import Optional, Dict, List, Literal, Any, Callable, Awaitable
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 
-# Optional tiktoken import for token counting
-try:
-    import tiktoken
-    TIKTOKEN_AVAILABLE = True
-except ImportError:
-    TIKTOKEN_AVAILABLE = False
-    tiktoken = None
+from lazy_imports import lazy_import
+
+# Optional tiktoken for token counting (imported on first use)
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+tiktoken = lazy_import("tiktoken") if TIKTOKEN_AVAILABLE else None
 from fastmcp.server.dependencies import get_access_token, AccessToken
 from fastmcp import Context
 
@@ -51,12 +53,19 @@ class TokenCountingMiddleware(Middleware):
         if not TIKTOKEN_AVAILABLE:
             raise ImportError("tiktoken is required for token counting. Install with: pip install tiktoken")
 
-        self.encoder = tiktoken.get_encoding(model)
+        self._encoder = None
         self.model = model
         self.token_stats = defaultdict(lambda: {"input": 0, "output": 0, "calls": 0})
         self.logger = logging.getLogger("token_counter")
         self.logger.setLevel(logging.INFO)
     
+    @property
+    def encoder(self):
+        """Tiktoken encoder, loaded on first use."""
+        if self._encoder is None:
+            self._encoder = tiktoken.get_encoding(self.model)
+        return self._encoder
+
     def count_tokens(self, text: str) -> int:
         """Count tokens in text using tiktoken."""
         if not text:
@@ -224,9 +233,80 @@ class TokenCountingMiddleware(Middleware):
 
 # --- End Token Counting Middleware ---
 
+# --- Tool Deadline Middleware ---
+# Default overall time budget of a tool call in seconds: short for search and
+# document tools, long for semantic search, which fetches and embeds up to ~100
+# decisions (0 disables a default; tools can still be given a budget per call)
+TOOL_DEADLINE_SECONDS = float(os.getenv("TOOL_DEADLINE_SECONDS", "45"))
+SEMANTIC_TOOL_DEADLINE_SECONDS = float(os.getenv("SEMANTIC_TOOL_DEADLINE_SECONDS", "180"))
+# Tools whose default budget differs from TOOL_DEADLINE_SECONDS
+TOOL_DEADLINE_DEFAULTS = {"search_bedesten_semantic": SEMANTIC_TOOL_DEADLINE_SECONDS}
+# Time a tool gets after its deadline to return partial results before it is cancelled
+TOOL_DEADLINE_GRACE_SECONDS = float(os.getenv("TOOL_DEADLINE_GRACE_SECONDS", "2"))
+
+class DeadlineMiddleware(Middleware):
+    """
+    Middleware giving every tool call a deadline.
+
+    The budget comes from the tool's `timeout_seconds` argument, the request's
+    `_meta.deadline_seconds`, or the tool's default (TOOL_DEADLINE_DEFAULTS,
+    else TOOL_DEADLINE_SECONDS). API clients see it
+    through http_transport.remaining(): httpx timeouts, retries, hedging and
+    Bedesten document conversion shrink to what is left. Tools that can
+    return partial results stop at the deadline themselves; anything still
+    running after the grace period is cancelled.
+    """
+
+    def __init__(self, default_seconds: float = TOOL_DEADLINE_SECONDS,
+                 grace_seconds: float = TOOL_DEADLINE_GRACE_SECONDS,
+                 tool_seconds: Optional[Dict[str, float]] = None):
+        self.default_seconds = default_seconds
+        self.grace_seconds = grace_seconds
+        self.tool_seconds = TOOL_DEADLINE_DEFAULTS if tool_seconds is None else tool_seconds
+
+    def get_deadline_seconds(self, context: MiddlewareContext) -> Optional[float]:
+        """Budget of a tool call in seconds, or None for no deadline."""
+        arguments = getattr(context.message, "arguments", None) or {}
+        default_seconds = self.tool_seconds.get(getattr(context.message, "name", None), self.default_seconds)
+        seconds = arguments.get("timeout_seconds")
+        if seconds is None and context.fastmcp_context is not None:
+            try:
+                meta = context.fastmcp_context.request_context.meta
+            except Exception:
+                meta = None
+            seconds = (getattr(meta, "model_extra", None) or {}).get("deadline_seconds")
+        try:
+            seconds = float(seconds) if seconds is not None else default_seconds
+        except (TypeError, ValueError):
+            seconds = default_seconds
+        return seconds if seconds > 0 else None
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        """Run the tool inside a deadline scope and cancel it when the budget is spent."""
+        seconds = self.get_deadline_seconds(context)
+        if seconds is None:
+            return await call_next(context)
+        tool_name = getattr(context.message, 'name', 'unknown_tool')
+        with deadline_scope(seconds):
+            try:
+                async with asyncio.timeout(seconds + self.grace_seconds):
+                    return await call_next(context)
+            except Exception as e:
+                # Timeouts cut short by the deadline surface as httpx or conversion errors too
+                if not deadline_expired():
+                    raise
+                logger.warning(f"Tool '{tool_name}' exceeded its {seconds:g}s deadline: {e}")
+                raise ToolError(f"'{tool_name}' did not finish within its {seconds:g}s time budget; "
+                                f"try a narrower query or a larger timeout") from e
+
+# --- End Tool Deadline Middleware ---
+
 # Create FastMCP app directly without authentication wrapper
 from fastmcp import FastMCP
 
+# Token counting middleware installed by create_app(), if any
+token_counter: Optional[TokenCountingMiddleware] = None
+
 def create_app(auth=None):
     """Create FastMCP app with standard capabilities and optional auth."""
     global app
@@ -236,9 +316,14 @@ def create_app(auth=None):
     else:
         logger.info("MCP server created with standard capabilities...")
     
+    app.add_middleware(DeadlineMiddleware())
+    logger.info(f"Tool deadline middleware added (default {f'{TOOL_DEADLINE_SECONDS:g}s' if TOOL_DEADLINE_SECONDS > 0 else 'none'}, "
+                f"semantic {f'{SEMANTIC_TOOL_DEADLINE_SECONDS:g}s' if SEMANTIC_TOOL_DEADLINE_SECONDS > 0 else 'none'})")
+    
     # Add token counting middleware only if tiktoken is available
     if TIKTOKEN_AVAILABLE:
         try:
+            global token_counter
             token_counter = TokenCountingMiddleware()
             app.add_middleware(token_counter)
             logger.info("Token counting middleware added to MCP server")
@@ -248,6 +333,8 @@ def create_app(auth=None):
     return app
 
 # --- Module Imports ---
+from http_transport import create_http_client, get_pool_stats, get_breaker_states, close_shared_pools, prewarm_connections, ResourceRegistry, http_cache
+from http_transport.deadline import deadline_scope, deadline_expired, remaining
 from yargitay_mcp_module.client import YargitayOfficialApiClient
 from bedesten_mcp_module.client import BedestenApiClient
 from bedesten_mcp_module.models import (
@@ -256,14 +343,17 @@ from bedesten_mcp_module.models import (
 )
 from bedesten_mcp_module.enums import BirimAdiEnum
 
-# Semantic Search Module Imports (conditional based on OPENROUTER_API_KEY)
-from semantic_search.embedder import is_openrouter_available
+# Semantic Search Module Imports (conditional based on OPENROUTER_API_KEY).
+# numpy and the semantic_search submodules load on first use, not at startup;
+# semantic_search resolves its exported classes lazily.
+import semantic_search
+from semantic_search import is_openrouter_available
+np = lazy_import("numpy")
+semantic_dedup = lazy_import("semantic_search.dedup")
+semantic_rerank = lazy_import("semantic_search.rerank")
 SEMANTIC_SEARCH_AVAILABLE = is_openrouter_available()
 
 if SEMANTIC_SEARCH_AVAILABLE:
-    from semantic_search.embedder import OpenRouterEmbedder
-    from semantic_search.vector_store import VectorStore
-    from semantic_search.processor import DocumentProcessor
     logger.info("Semantic search enabled (OPENROUTER_API_KEY found)")
 else:
     logger.info("Semantic search disabled (OPENROUTER_API_KEY not set)")
@@ -277,8 +367,6 @@ from uyusmazlik_mcp_module.client import UyusmazlikApiClient
 from uyusmazlik_mcp_module.models import (
     UyusmazlikSearchRequest, UyusmazlikBolumEnum, UyusmazlikTuruEnum, UyusmazlikKararSonucuEnum
 )
-from anayasa_mcp_module.client import AnayasaMahkemesiApiClient
-from anayasa_mcp_module.bireysel_client import AnayasaBireyselBasvuruApiClient
 from anayasa_mcp_module.unified_client import AnayasaUnifiedClient
 from anayasa_mcp_module.models import (
     AnayasaUnifiedSearchRequest,
@@ -295,7 +383,6 @@ from rekabet_mcp_module.models import (
     RekabetKararTuruGuidEnum
 )
 
-from sayistay_mcp_module.client import SayistayApiClient
 from sayistay_mcp_module.models import (
     SayistayUnifiedSearchRequest
 )
@@ -318,32 +405,120 @@ from bddk_mcp_module.models import (
 
 # Create a placeholder app that will be properly initialized after tools are defined
 
+# --- API Client Registry ---
+# Clients are created on first use and closed by the server lifespan. The
+# unified Anayasa and Sayıştay clients own their underlying clients.
+clients = ResourceRegistry()
+clients.register("yargitay", YargitayOfficialApiClient)
+clients.register("danistay", DanistayApiClient)
+clients.register("emsal", EmsalApiClient)
+clients.register("uyusmazlik", UyusmazlikApiClient)
+clients.register("anayasa", AnayasaUnifiedClient)
+clients.register("kik_v2", KikV2ApiClient)
+clients.register("rekabet", RekabetKurumuApiClient)
+clients.register("bedesten", BedestenApiClient)
+clients.register("sayistay", SayistayUnifiedClient)
+clients.register("kvkk", KvkkApiClient)
+clients.register("bddk", BddkApiClient)
+# Reusable HTTP client for health checks
+clients.register(
+    "health_check",
+    lambda: create_http_client(timeout=10.0, follow_redirects=True, tls_profile="insecure"),
+    close="aclose"
+)
+
+
+async def close_resources():
+    """Close every client created by this process, then the shared connection pools."""
+    logger.info("MCP Server closing clients...")
+    await clients.aclose()
+    await close_shared_pools()
+
+
+@asynccontextmanager
+async def server_lifespan(server):
+    """Tie client lifetimes to the server: nothing is created up front, everything created is closed on exit."""
+    try:
+        yield {}
+    finally:
+        await close_resources()
+
+
 # MCP app for Turkish legal databases with explicit capabilities
 app = FastMCP(
     name="Yargı MCP Server",
-    version="0.1.6"
+    version="0.1.6",
+    lifespan=server_lifespan
 )
 
-# --- Health Check Functions (using individual clients) ---
+# MinHash signatures of Bedesten decisions whose markdown has been seen, used to
+# collapse the same matter published by several courts (computed once per document)
+_bedesten_duplicate_index: Optional["semantic_dedup.NearDuplicateIndex"] = None
+
+
+def get_bedesten_duplicate_index() -> "semantic_dedup.NearDuplicateIndex":
+    """Get or create the Bedesten near-duplicate index."""
+    global _bedesten_duplicate_index
+    if _bedesten_duplicate_index is None:
+        _bedesten_duplicate_index = semantic_dedup.NearDuplicateIndex(max_entries=20000)
+    return _bedesten_duplicate_index
+
+# Reranker for tools without native relevance ranking (created on first use);
+# embedding-based when semantic search is configured, BM25 otherwise
+# Pages reranked together: the requested page plus the following ones, so the
+# best matches of a short window are returned instead of a reordered page
+RERANK_WINDOW_PAGES = max(1, int(os.getenv("RERANK_WINDOW_PAGES", "3")))
+_result_reranker: Optional["semantic_rerank.Reranker"] = None
 
-# --- API Client Instances ---
-yargitay_client_instance = YargitayOfficialApiClient()
-danistay_client_instance = DanistayApiClient()
-emsal_client_instance = EmsalApiClient()
-uyusmazlik_client_instance = UyusmazlikApiClient()
-anayasa_norm_client_instance = AnayasaMahkemesiApiClient()
-anayasa_bireysel_client_instance = AnayasaBireyselBasvuruApiClient()
-anayasa_unified_client_instance = AnayasaUnifiedClient()
-kik_v2_client_instance = KikV2ApiClient()
-rekabet_client_instance = RekabetKurumuApiClient()
-bedesten_client_instance = BedestenApiClient()
-sayistay_client_instance = SayistayApiClient()
-sayistay_unified_client_instance = SayistayUnifiedClient()
-kvkk_client_instance = KvkkApiClient()
-bddk_client_instance = BddkApiClient()
 
-# Health check client (singleton for reuse)
-_health_check_client: Optional[httpx.AsyncClient] = None
+def get_result_reranker() -> "semantic_rerank.Reranker":
+    """Get or create the shared result reranker."""
+    global _result_reranker
+    if _result_reranker is None:
+        _result_reranker = semantic_rerank.Reranker(embedder=get_semantic_dispatcher() if SEMANTIC_SEARCH_AVAILABLE else None)
+    return _result_reranker
+
+
+async def rerank_decisions(result: Dict[str, Any],
+                           rerank_query: str,
+                           key: str = "decisions",
+                           fetch_page: Optional[Callable[[int], Awaitable[List[Any]]]] = None) -> Dict[str, Any]:
+    """
+    Replace result[key] with the results most relevant to rerank_query (no-op for an empty query).
+
+    Args:
+        result: Tool result holding the requested page
+        rerank_query: Natural-language question to rank by
+        key: Key of the result list in result
+        fetch_page: Returns the results of the page `offset` pages after the requested one;
+            without it only the requested page is reordered
+
+    The requested page and up to RERANK_WINDOW_PAGES - 1 following pages are
+    reranked together and the best len(result[key]) results are returned, so
+    results from the following pages may be pulled forward.
+    """
+    if not rerank_query or not result.get(key):
+        return result
+    window = list(result[key])
+    page_size = len(window)
+    if fetch_page is not None and RERANK_WINDOW_PAGES > 1:
+        pages = await asyncio.gather(
+            *(fetch_page(offset) for offset in range(1, RERANK_WINDOW_PAGES)),
+            return_exceptions=True
+        )
+        for offset, page in enumerate(pages, start=1):
+            if isinstance(page, BaseException):
+                logger.warning(f"Rerank window: page +{offset} could not be fetched: {page}")
+                continue
+            window.extend(item for item in page if item not in window)
+    items, scores, method = await get_result_reranker().rerank(rerank_query, window)
+    for item, score in zip(items, scores):
+        if isinstance(item, dict):
+            item["rerank_score"] = score
+    result[key] = items[:page_size]
+    result["reranked_by"] = method
+    result["rerank_window"] = len(window)
+    return result
 
 
 KARAR_TURU_ADI_TO_GUID_ENUM_MAP = {
@@ -378,7 +553,8 @@ async def search_yargitay_detailed(
     baslangicTarihi: str = Field("", description="Start date for decision search (DD.MM.YYYY)."),
     bitisTarihi: str = Field("", description="End date for decision search (DD.MM.YYYY)."),
     # pageSize: int = Field(10, ge=1, le=10, description="Number of results per page."),
-    pageNumber: int = Field(1, ge=1, description="Page number to retrieve.")
+    pageNumber: int = Field(1, ge=1, description="Page number to retrieve."),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> CompactYargitaySearchResult:
     # Search Yargıtay decisions using primary API with 52 chamber filtering and advanced operators.
     
@@ -407,7 +583,7 @@ async def search_yargitay_detailed(
     
     logger.info(f"Tool 'search_yargitay_detailed' called: {search_query.model_dump_json(exclude_none=True, indent=2)}")
     try:
-        api_response = await yargitay_client_instance.search_detailed_decisions(search_query)
+        api_response = await clients.get("yargitay").search_detailed_decisions(search_query)
         if api_response and api_response.data and api_response.data.data:
             # Convert to clean decision entries without arananKelime field
             clean_decisions = [
@@ -439,12 +615,15 @@ async def search_yargitay_detailed(
         "idempotentHint": True
     }
 )
-async def get_yargitay_document_markdown(id: str) -> YargitayDocumentMarkdown:
+async def get_yargitay_document_markdown(
+    id: str,
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
+) -> YargitayDocumentMarkdown:
     # Get Yargıtay decision text as Markdown. Use ID from search results.
     logger.info(f"Tool 'get_yargitay_document_markdown' called for ID: {id}")
     if not id or not id.strip(): raise ValueError("Document ID must be a non-empty string.")
     try:
-        return await yargitay_client_instance.get_decision_document_as_markdown(id)
+        return await clients.get("yargitay").get_decision_document_as_markdown(id)
     except Exception as e:
         logger.exception(f"Error in tool 'get_yargitay_document_markdown'.")
         raise
@@ -467,6 +646,7 @@ async def search_danistay_by_keyword(
     notOrKelimeler: List[str] = Field(default_factory=list, description="Keywords for NOT OR logic."),
     pageNumber: int = Field(1, ge=1, description="Page number."),
     # pageSize: int = Field(10, ge=1, le=10, description="Results per page.")
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> CompactDanistaySearchResult:
     # Search Danıştay decisions with keyword logic.
     
@@ -483,7 +663,7 @@ async def search_danistay_by_keyword(
     
     logger.info(f"Tool 'search_danistay_by_keyword' called.")
     try:
-        api_response = await danistay_client_instance.search_keyword_decisions(search_query)
+        api_response = await clients.get("danistay").search_keyword_decisions(search_query)
         if api_response.data:
             return CompactDanistaySearchResult(
                 decisions=api_response.data.data,
@@ -519,6 +699,7 @@ async def search_danistay_detailed(
     madde: str = Field("", description="Article number."),
     pageNumber: int = Field(1, ge=1, description="Page number."),
     # pageSize: int = Field(10, ge=1, le=10, description="Results per page.")
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> CompactDanistaySearchResult:
     # Search Danıştay decisions with detailed filtering.
     
@@ -545,7 +726,7 @@ async def search_danistay_detailed(
     
     logger.info(f"Tool 'search_danistay_detailed' called.")
     try:
-        api_response = await danistay_client_instance.search_detailed_decisions(search_query)
+        api_response = await clients.get("danistay").search_detailed_decisions(search_query)
         if api_response.data:
             return CompactDanistaySearchResult(
                 decisions=api_response.data.data,
@@ -565,12 +746,15 @@ async def search_danistay_detailed(
         "idempotentHint": True
     }
 )
-async def get_danistay_document_markdown(id: str) -> DanistayDocumentMarkdown:
+async def get_danistay_document_markdown(
+    id: str,
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
+) -> DanistayDocumentMarkdown:
     # Get Danıştay decision text as Markdown. Use ID from search results.
     logger.info(f"Tool 'get_danistay_document_markdown' called for ID: {id}")
     if not id or not id.strip(): raise ValueError("Document ID must be a non-empty string for Danıştay.")
     try:
-        return await danistay_client_instance.get_decision_document_as_markdown(id)
+        return await clients.get("danistay").get_decision_document_as_markdown(id)
     except Exception as e:
         logger.exception(f"Error in tool 'get_danistay_document_markdown'.")
         raise
@@ -602,6 +786,8 @@ async def search_emsal_detailed_decisions(
     sort_direction: str = Field("desc", description="Sorting direction ('asc' or 'desc')."),
     page_number: int = Field(1, ge=1, description="Page number (accepts int)."),
     # page_size: int = Field(10, ge=1, le=10, description="Results per page.")
+    rerank_query: str = Field("", description="Optional question in natural language; returns the results of this page and the next few that are most relevant to it (best first)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Search Emsal precedent decisions with detailed criteria."""
     
@@ -628,14 +814,23 @@ async def search_emsal_detailed_decisions(
     
     logger.info("Tool 'search_emsal_detailed_decisions' called.")
     try:
-        api_response = await emsal_client_instance.search_detailed_decisions(search_query)
+        api_response = await clients.get("emsal").search_detailed_decisions(search_query)
         if api_response.data:
-            return CompactEmsalSearchResult(
+            result = CompactEmsalSearchResult(
                 decisions=api_response.data.data,
                 total_records=api_response.data.recordsTotal if api_response.data.recordsTotal is not None else 0,
                 requested_page=search_query.page_number,
                 page_size=search_query.page_size
             ).model_dump()
+
+            async def fetch_page(offset: int) -> List[Any]:
+                following = search_query.model_copy(update={"page_number": search_query.page_number + offset})
+                response = await clients.get("emsal").search_detailed_decisions(following)
+                if not response.data:
+                    return []
+                return [decision.model_dump() for decision in response.data.data]
+
+            return await rerank_decisions(result, rerank_query, fetch_page=fetch_page)
         logger.warning("API response for Emsal search did not contain expected data structure.")
         return CompactEmsalSearchResult(decisions=[], total_records=0, requested_page=search_query.page_number, page_size=search_query.page_size).model_dump()
     except Exception:
@@ -649,12 +844,15 @@ async def search_emsal_detailed_decisions(
         "idempotentHint": True
     }
 )
-async def get_emsal_document_markdown(id: str) -> Dict[str, Any]:
+async def get_emsal_document_markdown(
+    id: str,
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
+) -> Dict[str, Any]:
     """Get document as Markdown."""
     logger.info(f"Tool 'get_emsal_document_markdown' called for ID: {id}")
     if not id or not id.strip(): raise ValueError("Document ID required for Emsal.")
     try:
-        result = await emsal_client_instance.get_decision_document_as_markdown(id)
+        result = await clients.get("emsal").get_decision_document_as_markdown(id)
         return result.model_dump()
     except Exception:
         logger.exception("Error in tool 'get_emsal_document_markdown'.")
@@ -687,7 +885,8 @@ async def search_uyusmazlik_decisions(
     wild_card: str = Field("", description="Search for phrase and its inflections."),
     hepsi: str = Field("", description="Search for texts containing all specified words."),
     herhangi_birisi: str = Field("", description="Search for texts containing any of the specified words."),
-    not_hepsi: str = Field("", description="Exclude texts containing these specified words.")
+    not_hepsi: str = Field("", description="Exclude texts containing these specified words."),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Search Court of Jurisdictional Disputes decisions."""
     
@@ -727,7 +926,7 @@ async def search_uyusmazlik_decisions(
     
     logger.info("Tool 'search_uyusmazlik_decisions' called.")
     try:
-        result = await uyusmazlik_client_instance.search_decisions(search_params)
+        result = await clients.get("uyusmazlik").search_decisions(search_params)
         return result.model_dump()
     except Exception:
         logger.exception("Error in tool 'search_uyusmazlik_decisions'.")
@@ -741,14 +940,15 @@ async def search_uyusmazlik_decisions(
     }
 )
 async def get_uyusmazlik_document_markdown_from_url(
-    document_url: str = Field(..., description="Full URL to the Uyuşmazlık Mahkemesi decision document from search results")
+    document_url: str = Field(..., description="Full URL to the Uyuşmazlık Mahkemesi decision document from search results"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Get Uyuşmazlık Mahkemesi decision as Markdown."""
     logger.info(f"Tool 'get_uyusmazlik_document_markdown_from_url' called for URL: {str(document_url)}")
     if not document_url:
         raise ValueError("Document URL (document_url) is required for Uyuşmazlık document retrieval.")
     try:
-        result = await uyusmazlik_client_instance.get_decision_document_as_markdown(str(document_url))
+        result = await clients.get("uyusmazlik").get_decision_document_as_markdown(str(document_url))
         return result.model_dump()
     except Exception:
         logger.exception("Error in tool 'get_uyusmazlik_document_markdown_from_url'.")
@@ -816,7 +1016,9 @@ async def search_anayasa_unified(
     decision_start_date: str = Field("", description="Decision start date (bireysel_basvuru only)"),
     decision_end_date: str = Field("", description="Decision end date (bireysel_basvuru only)"),
     norm_type: Literal["ALL", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14", "0"] = Field("ALL", description="Norm type (bireysel_basvuru only)"),
-    subject_category: str = Field("", description="Subject category (bireysel_basvuru only)")
+    subject_category: str = Field("", description="Subject category (bireysel_basvuru only)"),
+    rerank_query: str = Field("", description="Optional question in natural language; returns the results of this page and the next few that are most relevant to it (best first)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> str:
     logger.info(f"Tool 'search_anayasa_unified' called for decision_type: {decision_type}")
     
@@ -839,8 +1041,14 @@ async def search_anayasa_unified(
             subject_category=subject_category
         )
         
-        result = await anayasa_unified_client_instance.search_unified(request)
-        return json.dumps(result.model_dump(), ensure_ascii=False, indent=2)
+        result = await clients.get("anayasa").search_unified(request)
+
+        async def fetch_page(offset: int) -> List[Any]:
+            following = request.model_copy(update={"page_to_fetch": page_to_fetch + offset})
+            return (await clients.get("anayasa").search_unified(following)).model_dump()["decisions"]
+
+        result_dict = await rerank_decisions(result.model_dump(), rerank_query, fetch_page=fetch_page)
+        return json.dumps(result_dict, ensure_ascii=False, indent=2)
         
     except Exception:
         logger.exception("Error in tool 'search_anayasa_unified'.")
@@ -856,12 +1064,13 @@ async def search_anayasa_unified(
 )
 async def get_anayasa_document_unified(
     document_url: str = Field(..., description="Document URL from search results"),
-    page_number: int = Field(1, ge=1, description="Page number for paginated content (1-indexed)")
+    page_number: int = Field(1, ge=1, description="Page number for paginated content (1-indexed)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> str:
     logger.info(f"Tool 'get_anayasa_document_unified' called for URL: {document_url}, Page: {page_number}")
     
     try:
-        result = await anayasa_unified_client_instance.get_document_unified(document_url, page_number)
+        result = await clients.get("anayasa").get_document_unified(document_url, page_number)
         return json.dumps(result.model_dump(mode='json'), ensure_ascii=False, indent=2)
         
     except Exception:
@@ -884,7 +1093,9 @@ async def search_kik_v2_decisions(
     basvuran: str = Field("", description="Applicant name"),
     idare_adi: str = Field("", description="Administration/procuring entity name"),
     baslangic_tarihi: str = Field("", description="Start date (YYYY-MM-DD format, e.g., '2025-01-01')"),
-    bitis_tarihi: str = Field("", description="End date (YYYY-MM-DD format, e.g., '2025-12-31')")
+    bitis_tarihi: str = Field("", description="End date (YYYY-MM-DD format, e.g., '2025-12-31')"),
+    rerank_query: str = Field("", description="Optional question in natural language; reorders the returned results by relevance to it (best first)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> dict:
     """Search Public Procurement Authority (KİK) decisions using the new v2 API.
     
@@ -912,7 +1123,7 @@ async def search_kik_v2_decisions(
                 "error_message": f"Invalid decision type: {decision_type}. Valid options: uyusmazlik, duzenleyici, mahkeme"
             }
         
-        api_response = await kik_v2_client_instance.search_decisions(
+        api_response = await clients.get("kik_v2").search_decisions(
             decision_type=kik_decision_type,
             karar_metni=karar_metni,
             karar_no=karar_no,
@@ -932,7 +1143,7 @@ async def search_kik_v2_decisions(
         }
         
         logger.info(f"KİK v2 {decision_type} search completed. Found {len(api_response.decisions)} decisions")
-        return result
+        return await rerank_decisions(result, rerank_query)
         
     except Exception as e:
         logger.exception(f"Error in KİK v2 {decision_type} search tool 'search_kik_v2_decisions'.")
@@ -952,7 +1163,8 @@ async def search_kik_v2_decisions(
     }
 )
 async def get_kik_v2_document_markdown(
-    gundemMaddesiId: str = Field(..., description="gundemMaddesiId from search_kik_v2_decisions results")
+    gundemMaddesiId: str = Field(..., description="gundemMaddesiId from search_kik_v2_decisions results"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> dict:
     """Get KİK decision document in Markdown format."""
 
@@ -968,7 +1180,7 @@ async def get_kik_v2_document_markdown(
         }
 
     try:
-        api_response = await kik_v2_client_instance.get_document_markdown(gundemMaddesiId)
+        api_response = await clients.get("kik_v2").get_document_markdown(gundemMaddesiId)
 
         return {
             "document_id": api_response.document_id,
@@ -1012,7 +1224,9 @@ async def search_rekabet_kurumu_decisions(
     ] = Field("ALL", description="Parameter description"),
     KararSayisi: str = Field("", description="Decision number (Karar Sayısı)."),
     KararTarihi: str = Field("", description="Decision date (Karar Tarihi), e.g., DD.MM.YYYY."),
-    page: int = Field(1, ge=1, description="Page number to fetch for the results list.")
+    page: int = Field(1, ge=1, description="Page number to fetch for the results list."),
+    rerank_query: str = Field("", description="Optional question in natural language; returns the results of this page and the next few that are most relevant to it (best first)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Search Competition Authority decisions."""
     
@@ -1038,8 +1252,15 @@ async def search_rekabet_kurumu_decisions(
     logger.info(f"Tool 'search_rekabet_kurumu_decisions' called. Query: {search_query.model_dump_json(exclude_none=True, indent=2)}")
     try:
        
-        result = await rekabet_client_instance.search_decisions(search_query)
-        return result.model_dump()
+        result = await clients.get("rekabet").search_decisions(search_query)
+
+        async def fetch_page(offset: int) -> List[Any]:
+            if page + offset > result.total_pages:
+                return []
+            following = search_query.model_copy(update={"page": page + offset})
+            return (await clients.get("rekabet").search_decisions(following)).model_dump()["decisions"]
+
+        return await rerank_decisions(result.model_dump(), rerank_query, fetch_page=fetch_page)
     except Exception:
         logger.exception("Error in tool 'search_rekabet_kurumu_decisions'.")
         return RekabetSearchResult(decisions=[], retrieved_page_number=page, total_records_found=0, total_pages=0).model_dump()
@@ -1053,7 +1274,8 @@ async def search_rekabet_kurumu_decisions(
 )
 async def get_rekabet_kurumu_document(
     karar_id: str = Field(..., description="GUID (kararId) of the Rekabet Kurumu decision. This ID is obtained from search results."),
-    page_number: int = Field(1, ge=1, description="Requested page number for the Markdown content converted from PDF (1-indexed, accepts int). Default is 1.")
+    page_number: int = Field(1, ge=1, description="Requested page number for the Markdown content converted from PDF (1-indexed, accepts int). Default is 1."),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Get Competition Authority decision as paginated Markdown."""
     logger.info(f"Tool 'get_rekabet_kurumu_document' called. Karar ID: {karar_id}, Markdown Page: {page_number}")
@@ -1061,13 +1283,34 @@ async def get_rekabet_kurumu_document(
     current_page_to_fetch = page_number if page_number >= 1 else 1
     
     try:
-        result = await rekabet_client_instance.get_decision_document(karar_id, page_number=current_page_to_fetch)
+        result = await clients.get("rekabet").get_decision_document(karar_id, page_number=current_page_to_fetch)
         return result.model_dump()
     except Exception:
         logger.exception(f"Error in tool 'get_rekabet_kurumu_document'. Karar ID: {karar_id}")
         raise 
 
 # --- MCP Tools for Bedesten (Unified Search Across All Courts) ---
+def to_bedesten_date(value: str, field_name: str, end_of_day: bool = False) -> str:
+    """
+    Normalize a date filter to the ISO 8601 timestamp Bedesten expects.
+
+    Accepts YYYY-MM-DD (expanded to the start or end of that day) or a full
+    ISO 8601 timestamp, which is passed through. Empty input stays empty.
+    """
+    if not value:
+        return value
+    value = value.strip()
+    try:
+        if 'T' not in value:
+            datetime.strptime(value, "%Y-%m-%d")
+            return f"{value}T23:59:59.999Z" if end_of_day else f"{value}T00:00:00.000Z"
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid {field_name} '{value}': expected YYYY-MM-DD or an ISO 8601 timestamp such as 2024-01-31T00:00:00.000Z"
+        ) from None
+    return value
+
 @app.tool(
     description="Use this when searching across multiple Turkish courts in a single query. Supports Yargıtay, Danıştay, Local Courts, Appeals Courts, and KYB.",
     annotations={
@@ -1100,7 +1343,9 @@ For best results, use exact phrases with quotes for legal terms."""),
         • Danıştay: D1-D17 (1-17. Daire), DBGK (Büyük Gen.Kur.), IDDK (İdare Dava Daireleri Kurulu), VDDK (Vergi Dava Daireleri Kurulu), IBK (İçtihatları Birleştirme Kurulu), IIK (İdari İşler Kurulu), DBK (Başkanlar Kurulu), AYIM (Askeri Yüksek İdare Mahkemesi), AYIM1-3 (Askeri Yüksek İdare Mahkemesi 1-3. Daire)
         """),
     kararTarihiStart: str = Field("", description="Start date (ISO 8601 format)"),
-    kararTarihiEnd: str = Field("", description="End date (ISO 8601 format)")
+    kararTarihiEnd: str = Field("", description="End date (ISO 8601 format)"),
+    collapse_duplicates: bool = Field(False, description="Hide decisions whose text is a near-duplicate of a higher-ranked decision in the page instead of only marking them with duplicate_of (only for decisions already retrieved once)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> dict:
     """Search Turkish legal databases via unified Bedesten API."""
     
@@ -1126,15 +1371,8 @@ For best results, use exact phrases with quotes for legal terms."""),
     
     # Convert date formats if provided
     # Accept formats: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS.000Z
-    if kararTarihiStart and not kararTarihiStart.endswith('Z'):
-        # Convert simple date format to ISO 8601 with timezone
-        if 'T' not in kararTarihiStart:
-            kararTarihiStart = f"{kararTarihiStart}T00:00:00.000Z"
-    
-    if kararTarihiEnd and not kararTarihiEnd.endswith('Z'):
-        # Convert simple date format to ISO 8601 with timezone
-        if 'T' not in kararTarihiEnd:
-            kararTarihiEnd = f"{kararTarihiEnd}T23:59:59.999Z"
+    kararTarihiStart = to_bedesten_date(kararTarihiStart, "kararTarihiStart")
+    kararTarihiEnd = to_bedesten_date(kararTarihiEnd, "kararTarihiEnd", end_of_day=True)
     
     search_data = BedestenSearchData(
         pageSize=pageSize,
@@ -1151,7 +1389,7 @@ For best results, use exact phrases with quotes for legal terms."""),
     logger.info(f"User '{user_id}' searching bedesten: phrase='{phrase}', court_types={court_types}, birimAdi='{birimAdi}', page={pageNumber}")
     
     try:
-        response = await bedesten_client_instance.search_documents(search_request)
+        response = await clients.get("bedesten").search_documents(search_request)
         
         if response.data is None:
             return {
@@ -1167,12 +1405,31 @@ For best results, use exact phrases with quotes for legal terms."""),
         emsal_karar_list = response.data.emsalKararList if hasattr(response.data, 'emsalKararList') and response.data.emsalKararList is not None else []
         total_records = response.data.total if hasattr(response.data, 'total') and response.data.total is not None else 0
         
+        remember_bedesten_metadata(emsal_karar_list)
+        decisions = [d.model_dump() for d in emsal_karar_list]
+        collapsed_count = 0
+        if decisions:
+            # Near-duplicates of a higher-ranked decision are marked, and removed
+            # only on request: identical texts from different chambers can matter
+            kept_ids, collapsed = get_bedesten_duplicate_index().collapse([d["documentId"] for d in decisions])
+            duplicate_of = {doc_id: original for original, ids in collapsed.items() for doc_id in ids}
+            for d in decisions:
+                if d["documentId"] in collapsed:
+                    d["near_duplicate_ids"] = collapsed[d["documentId"]]
+                if d["documentId"] in duplicate_of:
+                    d["duplicate_of"] = duplicate_of[d["documentId"]]
+            if collapse_duplicates:
+                kept = set(kept_ids)
+                decisions = [d for d in decisions if d["documentId"] in kept]
+                collapsed_count = len(duplicate_of)
+        
         return {
-            "decisions": [d.model_dump() for d in emsal_karar_list],
+            "decisions": decisions,
             "total_records": total_records,
             "requested_page": pageNumber,
             "page_size": pageSize,
-            "searched_courts": court_types
+            "searched_courts": court_types,
+            "duplicates_collapsed": collapsed_count
         }
     except Exception:
         logger.exception("Error in tool 'search_bedesten_unified'")
@@ -1186,7 +1443,8 @@ For best results, use exact phrases with quotes for legal terms."""),
     }
 )
 async def get_bedesten_document_markdown(
-    documentId: str = Field(..., description="Document ID from Bedesten search results")
+    documentId: str = Field(..., description="Document ID from Bedesten search results"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> BedestenDocumentMarkdown:
     """Get legal decision document as Markdown from Bedesten API."""
     logger.info(f"Tool 'get_bedesten_document_markdown' called for ID: {documentId}")
@@ -1195,14 +1453,159 @@ async def get_bedesten_document_markdown(
         raise ValueError("Document ID must be a non-empty string.")
     
     try:
-        return await bedesten_client_instance.get_document_as_markdown(documentId)
+        doc = await clients.get("bedesten").get_document_as_markdown(documentId)
+        get_bedesten_duplicate_index().add(documentId, doc.markdown_content)
+        ingest_bedesten_document(documentId, doc.markdown_content)
+        return doc
     except Exception:
         logger.exception("Error in tool 'get_kyb_bedesten_document_markdown'")
         raise
 
 
 # --- Semantic Search Tool (Conditional - requires OPENROUTER_API_KEY) ---
+# Candidates fetched in full after shortlisting (at least top_k); 0 fetches every
+# candidate. Compare settings with python -m semantic_search.benchmark run.
+SEMANTIC_SHORTLIST_MIN = int(os.getenv("SEMANTIC_SHORTLIST_MIN", "20"))
+# Concurrent document fetches and documents per embedding call in the semantic pipeline
+SEMANTIC_FETCH_CONCURRENCY = 5
+SEMANTIC_EMBED_BATCH_SIZE = 8
+# Cross-request embedding batching: texts per API call and collection window
+SEMANTIC_DISPATCH_BATCH_SIZE = 100
+SEMANTIC_DISPATCH_WAIT_MS = 5.0
+# Upper bound on documents kept in the process-wide semantic index
+SEMANTIC_INDEX_MAX_DOCUMENTS = int(os.getenv("SEMANTIC_INDEX_MAX_DOCUMENTS", "20000"))
+# Opt-in: search the process-wide index with this many worker processes, each
+# owning a memory-mapped shard, once it holds SEMANTIC_SHARD_MIN_DOCUMENTS (0 disables)
+SEMANTIC_SHARD_WORKERS = int(os.getenv("SEMANTIC_SHARD_WORKERS", "0"))
+SEMANTIC_SHARD_MIN_DOCUMENTS = int(os.getenv("SEMANTIC_SHARD_MIN_DOCUMENTS", "100000"))
+# Opt-in: add up to this many of the process-wide index's best matches for each
+# query to the keyword search's candidates (0 disables)
+SEMANTIC_INDEX_CANDIDATES = int(os.getenv("SEMANTIC_INDEX_CANDIDATES", "0"))
+# How long final semantic rankings are served from cache for repeated queries
+SEMANTIC_RESULT_CACHE_TTL = float(os.getenv("SEMANTIC_RESULT_CACHE_TTL", "600"))
+# Identifies the embedding model and ranking settings behind cached rankings;
+# bump when either changes so stale rankings are never served. Cached rankings
+# are also keyed by the process-wide index's version, so they are not reused
+# once decisions are added to it or it is restored from a snapshot.
+SEMANTIC_RANKING_VERSION = "gemini-embedding-001:3072:t0.3:v2"
+# Embedding space of the semantic index; snapshots built for another one are refused
+SEMANTIC_EMBEDDING_MODEL = "google/gemini-embedding-001"
+SEMANTIC_EMBEDDING_DIMENSION = 3072
+# Extra questions that can be ranked over one candidate pool in a single call
+SEMANTIC_MAX_ADDITIONAL_QUERIES = 5
+# Budget the semantic tool keeps for embedding and ranking under a deadline: fetching
+# stops when less than this remains and the documents embedded so far are ranked
+SEMANTIC_DEADLINE_RESERVE_SECONDS = float(os.getenv("SEMANTIC_DEADLINE_RESERVE_SECONDS", "5"))
+# Opt-in: embed every Bedesten decision fetched by any tool into the semantic index
+SEMANTIC_BACKGROUND_INGEST = os.getenv("SEMANTIC_BACKGROUND_INGEST", "false").lower() in ("1", "true", "yes")
+
+# Process-wide semantic state, created by ensure_semantic_state() on first use
+# (semantic tool call, snapshot restore or background ingestion)
+semantic_preview_cache: Optional["semantic_search.PreviewCache"] = None
+semantic_index: Optional["semantic_search.VectorStore"] = None
+semantic_query_cache: Optional["semantic_search.EmbeddingCache"] = None
+semantic_result_cache: Optional["semantic_search.ResultCache"] = None
+# Embedded decisions not added to the index because it was full
+semantic_index_overflow = 0
+
+
+clients.register("semantic_shard_pool", lambda: semantic_search.ShardPool(SEMANTIC_SHARD_WORKERS), close="close")
+
+
+def attach_semantic_shards(store: "semantic_search.VectorStore"):
+    """Let the process-wide index switch to shard workers once it is large, if enabled."""
+    if SEMANTIC_SHARD_WORKERS > 0:
+        store.attach_shard_pool(clients.get("semantic_shard_pool"), SEMANTIC_SHARD_MIN_DOCUMENTS)
+
+
+def ensure_semantic_state():
+    """Create the semantic index and caches if they do not exist yet."""
+    global semantic_preview_cache, semantic_index, semantic_query_cache, semantic_result_cache
+    if semantic_index is not None:
+        return
+
+    # Previews of previously fetched decisions, reused for first-stage ranking
+    semantic_preview_cache = semantic_search.PreviewCache(max_entries=5000)
+
+    # Index of every decision embedded so far; shortlisted decisions found
+    # here are reused instead of being fetched and embedded again
+    semantic_index = semantic_search.VectorStore(
+        dimension=SEMANTIC_EMBEDDING_DIMENSION, max_documents=SEMANTIC_INDEX_MAX_DOCUMENTS
+    )
+    attach_semantic_shards(semantic_index)
+
+    # Query and shortlist candidate embeddings keyed by prompt text
+    semantic_query_cache = semantic_search.EmbeddingCache(max_entries=10000)
+
+    # Final ranked responses keyed by normalized tool inputs
+    semantic_result_cache = semantic_search.ResultCache(max_entries=1000, ttl_seconds=SEMANTIC_RESULT_CACHE_TTL)
+
+
 if SEMANTIC_SEARCH_AVAILABLE:
+    # Shared embedding dispatcher, batching embedding calls across concurrent tool calls
+    _semantic_dispatcher: Optional["semantic_search.EmbeddingDispatcher"] = None
+
+    def get_semantic_dispatcher() -> "semantic_search.EmbeddingDispatcher":
+        """Get or create the shared embedding dispatcher."""
+        global _semantic_dispatcher
+        if _semantic_dispatcher is None:
+            _semantic_dispatcher = semantic_search.EmbeddingDispatcher(
+                semantic_search.OpenRouterEmbedder(),
+                max_batch_size=SEMANTIC_DISPATCH_BATCH_SIZE,
+                max_wait_ms=SEMANTIC_DISPATCH_WAIT_MS
+            )
+        return _semantic_dispatcher
+
+    def add_to_semantic_index(ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]], embeddings: "np.ndarray"):
+        """Append embedded decisions to the process-wide index, skipping known ones and filling it up to its size cap."""
+        global semantic_index_overflow
+        new_rows = [i for i, document_id in enumerate(ids) if not semantic_index.contains(document_id)]
+        room = max(0, SEMANTIC_INDEX_MAX_DOCUMENTS - semantic_index.size())
+        if len(new_rows) > room:
+            overflow = len(new_rows) - room
+            if semantic_index_overflow == 0:
+                logger.warning(f"Semantic index is full ({SEMANTIC_INDEX_MAX_DOCUMENTS} documents); "
+                               f"further decisions are ranked but not indexed")
+            semantic_index_overflow += overflow
+            logger.debug(f"Semantic index full: {overflow} decisions not indexed ({semantic_index_overflow} so far)")
+            new_rows = new_rows[:room]
+        if not new_rows:
+            return
+        semantic_index.add_documents(
+            ids=[ids[i] for i in new_rows],
+            texts=[texts[i] for i in new_rows],
+            embeddings=embeddings[new_rows],
+            metadata=[metadatas[i] for i in new_rows]
+        )
+
+    def ingest_embedded_documents(ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]], embeddings: "np.ndarray"):
+        """Sink for background ingestion: index the batch and keep previews for first-stage ranking."""
+        add_to_semantic_index(ids, texts, metadatas, embeddings)
+        for document_id, text in zip(ids, texts):
+            semantic_preview_cache.put(document_id, text)
+
+    def create_semantic_ingestor() -> "semantic_search.BackgroundIngestor":
+        ensure_semantic_state()
+        return semantic_search.BackgroundIngestor(
+            embed=get_semantic_dispatcher().encode_documents,
+            on_embedded=ingest_embedded_documents,
+            contains=lambda document_id: semantic_index.contains(document_id)
+        )
+
+    clients.register("semantic_ingestor", create_semantic_ingestor, close="close")
+
+    def get_semantic_ingestor() -> "semantic_search.BackgroundIngestor":
+        """Get or create the background ingestor feeding the semantic index."""
+        return clients.get("semantic_ingestor")
+
+    async def report_semantic_progress(ctx: Context, progress: float, total: Optional[float], message: str):
+        """Send a progress notification and log message to the client (best effort)."""
+        try:
+            await ctx.report_progress(progress, total)
+            await ctx.info(message)
+        except Exception as e:
+            logger.debug(f"Could not send progress notification: {e}")
+
     @app.tool(
         description="Use this when you need intelligent semantic search on Turkish legal decisions. Uses AI embeddings for relevance re-ranking.",
         annotations={
@@ -1212,6 +1615,7 @@ if SEMANTIC_SEARCH_AVAILABLE:
         }
     )
     async def search_bedesten_semantic(
+        ctx: Context,
         initial_keyword: str = Field(..., description="""Bedesten API'den ilk sonuçları çekmek için anahtar kelime veya arama ifadesi.
 Bu terim ile API'den 100 karar çekilir, sonra semantik sıralama yapılır.
 
@@ -1249,17 +1653,33 @@ YANLIŞ KULLANIM:
             default=["YARGITAYKARARI", "DANISTAYKARAR", "YERELHUKUK", "ISTINAFHUKUK", "KYB"],
             description="Court types to search: YARGITAYKARARI, DANISTAYKARAR, YERELHUKUK, ISTINAFHUKUK, KYB (default: all)"
         ),
-        top_k: int = Field(10, ge=1, le=50, description="Number of top results to return (1-50)")
+        top_k: int = Field(10, ge=1, le=50, description="Number of top results to return (1-50)"),
+        birimAdi: BirimAdiEnum = Field("ALL", description="Chamber filter (optional), same abbreviations as search_bedesten_unified (e.g. HGK, H1, D5)"),
+        kararTarihiStart: str = Field("", description="Only rank decisions on or after this date (YYYY-MM-DD)"),
+        kararTarihiEnd: str = Field("", description="Only rank decisions on or before this date (YYYY-MM-DD)"),
+        additional_queries: List[str] = Field(
+            default_factory=list,
+            max_length=SEMANTIC_MAX_ADDITIONAL_QUERIES,
+            description="Further related questions (sentences) ranked over the same candidate pool; each gets its own ranking in 'additional_results'"
+        ),
+        timeout_seconds: Optional[float] = Field(None, description="Overall time budget in seconds; when it runs low, no more documents are fetched and those embedded so far are ranked (default: server setting)")
     ) -> Dict[str, Any]:
         """
         Perform semantic search on Turkish legal decisions using OpenRouter API.
 
         This tool:
         1. Searches Bedesten API with initial keyword (retrieves 100 results)
-        2. Fetches full document content for each result
-        3. Generates embeddings using Google's Gemini Embedding model via OpenRouter
-        4. Performs semantic similarity search with the query
-        5. Returns re-ranked results based on semantic relevance
+        2. Shortlists candidates by embedding their headers (and cached previews), blended with Bedesten's order
+        3. Fetches full document content for the (shortlisted) candidates
+        4. Generates embeddings using Google's Gemini Embedding model via OpenRouter
+        5. Performs semantic similarity search with the query
+        6. Returns re-ranked results based on semantic relevance
+
+        Progress and provisional top-k rankings are sent as MCP progress/log
+        notifications while documents are embedded; the final ranking is returned.
+
+        Related questions passed in additional_queries share the candidate pool
+        and fetches, and are ranked together with the main query in one batch.
 
         Benefits over keyword search:
         - Better understanding of context and meaning
@@ -1271,40 +1691,77 @@ YANLIŞ KULLANIM:
         """
         logger.info(f"Semantic search tool called with initial_keyword: {initial_keyword}, query: {query}")
 
+        ensure_semantic_state()
+
+        def result_cache_key() -> str:
+            return semantic_search.ResultCache.make_key(
+                SEMANTIC_RANKING_VERSION, semantic_index.version,
+                initial_keyword, query, list(court_types), top_k, birimAdi, kararTarihiStart, kararTarihiEnd,
+                tuple(q for q in additional_queries if q.strip())
+            )
+
+        cached_response = semantic_result_cache.get(result_cache_key())
+        if cached_response is not None:
+            logger.info("Returning cached semantic ranking")
+            return {**cached_response, "stats": {**cached_response["stats"], "cache_hit": True}}
+
+        search_date_start = to_bedesten_date(kararTarihiStart, "kararTarihiStart")
+        search_date_end = to_bedesten_date(kararTarihiEnd, "kararTarihiEnd", end_of_day=True)
+
         try:
             # Initialize components
-            embedder = OpenRouterEmbedder()
-            vector_store = VectorStore(dimension=3072)  # Gemini embedding dimension
-            processor = DocumentProcessor(chunk_size=1500, chunk_overlap=300)
+            embedder = get_semantic_dispatcher()
+            vector_store = semantic_search.VectorStore(dimension=SEMANTIC_EMBEDDING_DIMENSION)
+            processor = semantic_search.DocumentProcessor(chunk_size=1500, chunk_overlap=300)
+
+            # Metadata prefilter applied inside the vector store before scoring.
+            # The chamber is filtered upstream only: the birimAdi reported in
+            # search results is not guaranteed to match the mapped filter name.
+            metadata_filter = semantic_search.MetadataFilter(
+                court_types=list(court_types),
+                date_from=search_date_start or None,
+                date_to=search_date_end or None
+            )
 
             # Step 1: Initial keyword search to get document IDs
             logger.info(f"Step 1: Searching Bedesten API with keyword: {initial_keyword}")
+            await report_semantic_progress(ctx, 0, None, f"Searching Bedesten for '{initial_keyword}' in {len(court_types)} court types")
 
-            all_decisions = []
+            per_court_decisions = []
 
             # Search each court type
             for court_type in court_types:
                 try:
                     per_court_limit = max(20, 100 // len(court_types))
 
-                    search_results = await bedesten_client_instance.search_documents(
+                    search_results = await clients.get("bedesten").search_documents(
                         BedestenSearchRequest(
                             data=BedestenSearchData(
                                 phrase=initial_keyword,
                                 itemTypeList=[court_type],
                                 pageSize=per_court_limit,
-                                pageNumber=1
+                                pageNumber=1,
+                                birimAdi=birimAdi,
+                                kararTarihiStart=search_date_start or None,
+                                kararTarihiEnd=search_date_end or None
                             )
                         )
                     )
 
                     if search_results.data and search_results.data.emsalKararList:
-                        all_decisions.extend(search_results.data.emsalKararList)
+                        per_court_decisions.append(search_results.data.emsalKararList)
                         logger.info(f"Found {len(search_results.data.emsalKararList)} results from {court_type}")
 
                 except Exception as e:
                     logger.warning(f"Error searching {court_type}: {e}")
 
+            # Interleave by rank so Bedesten's relevance order holds across court types
+            all_decisions = [
+                decisions[rank]
+                for rank in range(max(map(len, per_court_decisions), default=0))
+                for decisions in per_court_decisions if rank < len(decisions)
+            ]
+
             if not all_decisions:
                 logger.warning("No documents found from initial search")
                 return {
@@ -1315,49 +1772,193 @@ YANLIŞ KULLANIM:
 
             logger.info(f"Total documents found: {len(all_decisions)}")
 
-            # Step 2: Fetch document content and process
-            logger.info("Step 2: Fetching and processing document content...")
-
-            documents_data = []
-            failed_fetches = 0
-            decisions_to_process = all_decisions[:100]
-
-            for i, decision in enumerate(decisions_to_process):
-                try:
-                    doc = await bedesten_client_instance.get_document_as_markdown(decision.documentId)
-
-                    if doc.markdown_content:
-                        metadata = {
-                            "document_id": decision.documentId,
-                            "birim_adi": decision.birimAdi,
-                            "esas_no": decision.esasNo,
-                            "karar_no": decision.kararNo,
-                            "karar_tarihi": decision.kararTarihiStr,
-                            "court_type": decision.itemType.name if decision.itemType else None
-                        }
-
-                        chunks = processor.process_document(
-                            document_id=decision.documentId,
-                            text=doc.markdown_content,
-                            metadata=metadata
-                        )
-
-                        if chunks:
-                            full_text = " ".join([chunk.text for chunk in chunks])
-                            documents_data.append({
-                                "id": decision.documentId,
-                                "text": full_text[:3000],
-                                "metadata": metadata
-                            })
+            async def embed_query(text: str) -> np.ndarray:
+                query_cache_key = f"search result|{text}"
+                cached = semantic_query_cache.get(query_cache_key)
+                if cached is None:
+                    cached = await embedder.encode_query(text, task="search result")
+                    semantic_query_cache.put(query_cache_key, cached)
+                return cached
+
+            async def embed_candidates(texts: List[str]) -> np.ndarray:
+                # Candidate texts repeat across searches; embed only the unseen ones
+                keys = [f"candidate|{text}" for text in texts]
+                vectors = [semantic_query_cache.get(key) for key in keys]
+                missing = [i for i, vector in enumerate(vectors) if vector is None]
+                if missing:
+                    embedded = await embedder.encode_documents([texts[i] for i in missing])
+                    for i, vector in zip(missing, embedded):
+                        semantic_query_cache.put(keys[i], vector)
+                        vectors[i] = vector
+                return np.vstack(vectors)
+
+            # The primary query first; all queries are ranked together as one Q x d matrix
+            queries = [query] + [q for q in additional_queries if q.strip()]
+            query_embeddings = np.vstack(await asyncio.gather(*(embed_query(q) for q in queries)))
+            query_embedding = query_embeddings[0]
+
+            # Step 2: Shortlist candidates from their headers, cached previews and Bedesten's order
+            logger.info("Step 2: Shortlisting candidates...")
+
+            candidates = all_decisions[:100]
+            candidate_metadatas = [bedesten_decision_metadata(decision) for decision in candidates]
+            remember_bedesten_metadata(candidates)
+
+            # Decisions in the process-wide index that match a query but were not
+            # in the keyword results; they are reused below without a fetch
+            index_candidates = 0
+            if SEMANTIC_INDEX_CANDIDATES and semantic_index.size():
+                known_ids = {metadata["document_id"] for metadata in candidate_metadatas}
+                for ranked in semantic_index.search_batch(
+                    query_embeddings=query_embeddings,
+                    top_k=SEMANTIC_INDEX_CANDIDATES,
+                    threshold=0.3,
+                    filters=metadata_filter
+                ):
+                    for doc, _ in ranked:
+                        if doc.id not in known_ids and doc.metadata.get("court_type"):
+                            known_ids.add(doc.id)
+                            candidate_metadatas.append(dict(doc.metadata))
+                            index_candidates += 1
+
+            shortlist_size = max(top_k, SEMANTIC_SHORTLIST_MIN)
+
+            if SEMANTIC_SHORTLIST_MIN and len(candidate_metadatas) > shortlist_size:
+                # Every candidate is scored on its header (chamber, esas/karar
+                # numbers, date, decision type), plus its preview when one is cached
+                upstream_ids = [metadata["document_id"] for metadata in candidate_metadatas]
+                metadata_by_id = {metadata["document_id"]: metadata for metadata in candidate_metadatas}
+                candidate_texts = [
+                    processor.build_candidate_text(metadata, semantic_preview_cache.get(metadata["document_id"]))
+                    for metadata in candidate_metadatas
+                ]
+                candidate_store = semantic_search.VectorStore(dimension=SEMANTIC_EMBEDDING_DIMENSION)
+                candidate_store.add_documents(
+                    ids=upstream_ids,
+                    texts=candidate_texts,
+                    embeddings=await embed_candidates(candidate_texts),
+                    metadata=candidate_metadatas
+                )
+                scored_per_query = [
+                    [doc.id for doc, _ in ranked]
+                    for ranked in candidate_store.search_batch(
+                        query_embeddings=query_embeddings,
+                        top_k=len(upstream_ids),
+                        filters=metadata_filter
+                    )
+                ]
 
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"Processed {i + 1}/{len(decisions_to_process)} documents")
+                # Blend Bedesten's order with each query's candidate ranking;
+                # candidates rejected by the metadata filter are dropped
+                shortlisted_per_query = []
+                for scored_ids in scored_per_query:
+                    scored = set(scored_ids)
+                    eligible_ids = [document_id for document_id in upstream_ids if document_id in scored]
+                    shortlisted_per_query.append(
+                        semantic_rerank.fuse_with_upstream_order(eligible_ids, scored_ids)[:shortlist_size]
+                    )
+                # Union of every query's shortlist, interleaved by rank
+                shortlisted_metadatas = []
+                seen_ids = set()
+                for rank in range(shortlist_size):
+                    for shortlisted in shortlisted_per_query:
+                        if rank < len(shortlisted) and shortlisted[rank] not in seen_ids:
+                            seen_ids.add(shortlisted[rank])
+                            shortlisted_metadatas.append(metadata_by_id[shortlisted[rank]])
+            else:
+                shortlisted_metadatas = candidate_metadatas
+
+            # Skip candidates already known to duplicate a better-ranked one
+            kept_ids, _ = get_bedesten_duplicate_index().collapse([metadata["document_id"] for metadata in shortlisted_metadatas])
+            kept = set(kept_ids)
+            skipped_duplicates = len(shortlisted_metadatas) - len(kept)
+            shortlisted_metadatas = [metadata for metadata in shortlisted_metadatas if metadata["document_id"] in kept]
+
+            logger.info(f"Shortlisted {len(shortlisted_metadatas)} of {len(candidate_metadatas)} candidates "
+                        f"({index_candidates} from the index) for full retrieval ({skipped_duplicates} known duplicates skipped)")
+
+            # Steps 3-4: Fetch, convert and embed shortlisted documents as a pipeline
+            logger.info("Step 3: Fetching, converting and embedding shortlisted documents...")
+
+            # Reuse decisions already embedded in the process-wide index; entries
+            # without search metadata would fail the court-type filter, so they
+            # are fetched again
+            indexed_docs = [semantic_index.get_by_id(metadata["document_id"]) for metadata in shortlisted_metadatas]
+            indexed_docs = [doc if doc is not None and doc.metadata.get("court_type") else None for doc in indexed_docs]
+            reused_docs = [doc for doc in indexed_docs if doc is not None]
+            decisions_to_process = [
+                metadata for metadata, doc in zip(shortlisted_metadatas, indexed_docs) if doc is None
+            ]
+            if reused_docs:
+                vector_store.add_documents(
+                    ids=[doc.id for doc in reused_docs],
+                    texts=[doc.text for doc in reused_docs],
+                    embeddings=semantic_index.get_embeddings(reused_docs),
+                    metadata=[doc.metadata for doc in reused_docs]
+                )
+                logger.info(f"Reused {len(reused_docs)} documents from the semantic index")
+
+            def budget_running_out() -> bool:
+                budget = remaining()
+                return budget is not None and budget < SEMANTIC_DEADLINE_RESERVE_SECONDS
+
+            async def fetch_content(metadata: Dict[str, Any]):
+                return await clients.get("bedesten").get_document_content(metadata["document_id"])
+
+            def convert_content(metadata: Dict[str, Any], document_data) -> Optional[str]:
+                document_id = metadata["document_id"]
+                doc = clients.get("bedesten").convert_document_to_markdown(document_id, document_data)
+                if not doc.markdown_content:
+                    return None
+                get_bedesten_duplicate_index().add(document_id, doc.markdown_content)
+                chunks = processor.process_document(
+                    document_id=document_id,
+                    text=doc.markdown_content,
+                    metadata=metadata
+                )
+                if not chunks:
+                    return None
+                full_text = " ".join([chunk.text for chunk in chunks])
+                semantic_preview_cache.put(document_id, full_text)
+                return full_text[:3000]
+
+            async def add_batch(ids, texts, metadatas, embeddings):
+                # Index each batch as it arrives and report a provisional ranking
+                vector_store.add_documents(ids=ids, texts=texts, embeddings=embeddings, metadata=metadatas)
+                add_to_semantic_index(ids, texts, metadatas, embeddings)
+                provisional = vector_store.search(
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    threshold=0.3,
+                    filters=metadata_filter
+                )
+                ranking = ", ".join(f"{doc.id} ({score:.3f})" for doc, score in provisional)
+                await report_semantic_progress(
+                    ctx,
+                    vector_store.size(),
+                    len(shortlisted_metadatas),
+                    f"Embedded {vector_store.size()}/{len(shortlisted_metadatas)} documents. Provisional top results: {ranking or 'none above threshold'}"
+                )
 
-                except Exception as e:
-                    logger.warning(f"Failed to fetch document {decision.documentId}: {e}")
-                    failed_fetches += 1
+            pipeline = semantic_search.EmbeddingPipeline(
+                fetch=fetch_content,
+                convert=convert_content,
+                embed=embedder.encode_documents,
+                fetch_concurrency=SEMANTIC_FETCH_CONCURRENCY,
+                batch_size=SEMANTIC_EMBED_BATCH_SIZE,
+                on_batch=add_batch,
+                stop_fetching=budget_running_out
+            )
+            await report_semantic_progress(
+                ctx, vector_store.size(), len(shortlisted_metadatas),
+                f"Shortlisted {len(shortlisted_metadatas)} of {len(candidate_metadatas)} decisions; fetching full text for {len(decisions_to_process)}"
+            )
+            pipeline_result = await pipeline.run(decisions_to_process)
+            failed_fetches = pipeline_result.failed
+            if pipeline_result.skipped:
+                logger.warning(f"Semantic search running out of time; ranking without {pipeline_result.skipped} unfetched documents")
 
-            if not documents_data:
+            if vector_store.size() == 0:
                 logger.warning("No documents could be processed")
                 return {
                     "status": "processing_error",
@@ -1365,79 +1966,90 @@ YANLIŞ KULLANIM:
                     "results": []
                 }
 
-            logger.info(f"Successfully processed {len(documents_data)} documents, {failed_fetches} failed")
-
-            # Step 3: Generate embeddings
-            logger.info("Step 3: Generating embeddings...")
-
-            query_embedding = embedder.encode_query(query, task="search result")
-
-            doc_texts = [doc["text"] for doc in documents_data]
-            doc_titles = [doc["metadata"].get("birim_adi", "none") for doc in documents_data]
-            doc_embeddings = embedder.encode_documents(doc_texts, titles=doc_titles)
+            logger.info(f"Successfully processed {vector_store.size()} documents ({len(reused_docs)} from index), {failed_fetches} failed")
 
             # No dimension reduction - using full 3072 dimensions
 
-            # Step 4: Add to vector store and search
-            logger.info("Step 4: Performing semantic search...")
-
-            doc_ids = [doc["id"] for doc in documents_data]
-            doc_metadatas = [doc["metadata"] for doc in documents_data]
+            # Step 5: Final search over the store filled batch by batch by the pipeline
+            logger.info("Step 5: Performing semantic search...")
 
-            vector_store.add_documents(
-                ids=doc_ids,
-                texts=doc_texts,
-                embeddings=doc_embeddings,
-                metadata=doc_metadatas
+            ranked_per_query = vector_store.search_batch(
+                query_embeddings=query_embeddings,
+                top_k=vector_store.size(),
+                threshold=0.3,
+                filters=metadata_filter
             )
 
-            search_results = vector_store.search(
-                query_embedding=query_embedding,
-                top_k=top_k,
-                threshold=0.3
-            )
-
-            # Step 5: Format results
-            logger.info(f"Step 5: Formatting {len(search_results)} results")
-
-            formatted_results = []
-            for doc, score in search_results:
-                title_parts = []
-                if doc.metadata.get("birim_adi"):
-                    title_parts.append(doc.metadata["birim_adi"])
-                if doc.metadata.get("esas_no"):
-                    title_parts.append(f"Esas: {doc.metadata['esas_no']}")
-                if doc.metadata.get("karar_no"):
-                    title_parts.append(f"Karar: {doc.metadata['karar_no']}")
-                if doc.metadata.get("karar_tarihi"):
-                    title_parts.append(f"Tarih: {doc.metadata['karar_tarihi']}")
-
-                title = " - ".join(title_parts) if title_parts else f"Document {doc.id}"
-
-                formatted_results.append({
-                    "document_id": doc.id,
-                    "title": title,
-                    "similarity_score": float(score),
-                    "preview": doc.text[:500] + "..." if len(doc.text) > 500 else doc.text,
-                    "metadata": doc.metadata,
-                    "source_url": f"https://mevzuat.adalet.gov.tr/ictihat/{doc.id}"
-                })
+            def format_ranking(ranked):
+                # Collapse near-duplicate texts, keeping the best-scoring copy
+                kept_ids, collapsed = get_bedesten_duplicate_index().collapse([doc.id for doc, _ in ranked])
+                kept = set(kept_ids)
+                formatted_results = []
+                for doc, score in [(doc, score) for doc, score in ranked if doc.id in kept][:top_k]:
+                    title_parts = []
+                    if doc.metadata.get("birim_adi"):
+                        title_parts.append(doc.metadata["birim_adi"])
+                    if doc.metadata.get("esas_no"):
+                        title_parts.append(f"Esas: {doc.metadata['esas_no']}")
+                    if doc.metadata.get("karar_no"):
+                        title_parts.append(f"Karar: {doc.metadata['karar_no']}")
+                    if doc.metadata.get("karar_tarihi"):
+                        title_parts.append(f"Tarih: {doc.metadata['karar_tarihi']}")
+
+                    title = " - ".join(title_parts) if title_parts else f"Document {doc.id}"
+
+                    formatted_results.append({
+                        "document_id": doc.id,
+                        "title": title,
+                        "similarity_score": float(score),
+                        "preview": doc.text[:500] + "..." if len(doc.text) > 500 else doc.text,
+                        "metadata": doc.metadata,
+                        "source_url": f"https://mevzuat.adalet.gov.tr/ictihat/{doc.id}",
+                        "near_duplicate_ids": collapsed.get(doc.id, [])
+                    })
+                return formatted_results, sum(len(ids) for ids in collapsed.values())
+
+            # Step 6: Format results
+            logger.info(f"Step 6: Formatting results for {len(queries)} queries")
+
+            formatted_results, duplicates_collapsed = format_ranking(ranked_per_query[0])
+            additional_results = []
+            for extra_query, ranked in zip(queries[1:], ranked_per_query[1:]):
+                extra_results, _ = format_ranking(ranked)
+                additional_results.append({"query": extra_query, "results": extra_results})
 
             stats = vector_store.get_stats()
 
-            return {
+            response = {
                 "status": "success",
                 "query": query,
                 "initial_keyword": initial_keyword,
-                "total_documents_processed": len(documents_data),
+                "total_documents_processed": vector_store.size(),
                 "embedding_dimension": 3072,
                 "results": formatted_results,
+                "additional_results": additional_results,
                 "stats": {
                     "documents_in_store": stats["num_documents"],
+                    "index_overflow": semantic_index_overflow,
                     "memory_usage_mb": round(stats["memory_usage_mb"], 2),
-                    "failed_fetches": failed_fetches
+                    "candidates_found": len(candidates),
+                    "index_candidates": index_candidates,
+                    "documents_fetched": len(decisions_to_process),
+                    "documents_reused": len(reused_docs),
+                    "duplicates_skipped": skipped_duplicates,
+                    "duplicates_collapsed": duplicates_collapsed,
+                    "failed_fetches": failed_fetches,
+                    "skipped_at_deadline": pipeline_result.skipped,
+                    "stage_timings_ms": pipeline_result.get_timings_ms(),
+                    "cache_hit": False
                 }
             }
+            # Stored under the index version after this call's own additions, so
+            # repeating the query hits unless other decisions were indexed since.
+            # A ranking cut short by the deadline is not reused for later calls.
+            if not pipeline_result.skipped:
+                semantic_result_cache.put(result_cache_key(), response)
+            return response
 
         except Exception as e:
             logger.exception(f"Error in semantic search: {e}")
@@ -1448,6 +2060,116 @@ YANLIŞ KULLANIM:
             }
 
 
+# Search-result metadata of recently listed Bedesten decisions, so documents
+# fetched later by ID are ingested with the metadata the semantic filters need
+BEDESTEN_METADATA_MAX_ENTRIES = 20000
+_bedesten_metadata: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def bedesten_decision_metadata(decision) -> Dict[str, Any]:
+    """Semantic index metadata of a Bedesten search result."""
+    return {
+        "document_id": decision.documentId,
+        "birim_adi": decision.birimAdi,
+        "esas_no": decision.esasNo,
+        "karar_no": decision.kararNo,
+        "karar_tarihi": decision.kararTarihiStr,
+        "karar_turu": decision.kararTuru,
+        "court_type": decision.itemType.name if decision.itemType else None
+    }
+
+
+def remember_bedesten_metadata(decisions) -> None:
+    """Record search results' metadata for later ingestion of the same decisions."""
+    if not (SEMANTIC_SEARCH_AVAILABLE and SEMANTIC_BACKGROUND_INGEST):
+        return
+    for decision in decisions:
+        _bedesten_metadata[decision.documentId] = bedesten_decision_metadata(decision)
+        _bedesten_metadata.move_to_end(decision.documentId)
+    while len(_bedesten_metadata) > BEDESTEN_METADATA_MAX_ENTRIES:
+        _bedesten_metadata.popitem(last=False)
+
+
+def ingest_bedesten_document(document_id: str, markdown: Optional[str], metadata: Optional[Dict[str, Any]] = None):
+    """
+    Hand a fetched decision to background semantic ingestion, if enabled (never raises).
+
+    Without metadata, the decision's search-result metadata is looked up; a
+    decision never seen in search results is not ingested, since the index
+    could not filter it by court type or date.
+    """
+    if not (SEMANTIC_SEARCH_AVAILABLE and SEMANTIC_BACKGROUND_INGEST):
+        return
+    metadata = metadata or _bedesten_metadata.get(document_id)
+    if not metadata or not metadata.get("court_type"):
+        logger.debug(f"Not ingesting document {document_id}: no search metadata")
+        return
+    try:
+        get_semantic_ingestor().submit(document_id, markdown, metadata)
+    except Exception as e:
+        logger.debug(f"Could not queue document {document_id} for ingestion: {e}")
+
+
+# --- Semantic Index Snapshots ---
+async def restore_semantic_snapshot() -> bool:
+    """
+    Load the semantic index and caches from SEMANTIC_SNAPSHOT_PATH (local dir or HTTP(S) prefix).
+
+    Returns:
+        True if a snapshot was loaded
+    """
+    global semantic_index
+    location = os.getenv("SEMANTIC_SNAPSHOT_PATH")
+    if not SEMANTIC_SEARCH_AVAILABLE or not location:
+        return False
+
+    ensure_semantic_state()
+    try:
+        snapshot = await semantic_search.load_snapshot(
+            location,
+            model=SEMANTIC_EMBEDDING_MODEL,
+            dimension=SEMANTIC_EMBEDDING_DIMENSION,
+            max_documents=SEMANTIC_INDEX_MAX_DOCUMENTS
+        )
+    except Exception:
+        logger.exception(f"Failed to load semantic snapshot from {location}; starting with an empty index")
+        return False
+
+    semantic_index = snapshot.vector_store
+    attach_semantic_shards(semantic_index)
+    semantic_preview_cache.load_items(snapshot.previews)
+    if snapshot.query_embeddings is not None:
+        semantic_query_cache.load_items(snapshot.query_embedding_keys, snapshot.query_embeddings)
+    logger.info(f"Semantic index warm: {semantic_index.size()} documents, "
+                f"{len(semantic_preview_cache)} previews, {len(semantic_query_cache)} query embeddings")
+    return True
+
+
+def persist_semantic_snapshot() -> bool:
+    """
+    Write the semantic index and caches to SEMANTIC_SNAPSHOT_SAVE_PATH, if set.
+
+    Returns:
+        True if a snapshot was written
+    """
+    directory = os.getenv("SEMANTIC_SNAPSHOT_SAVE_PATH")
+    if not SEMANTIC_SEARCH_AVAILABLE or not directory or semantic_index is None or semantic_index.size() == 0:
+        return False
+
+    try:
+        semantic_search.save_snapshot(
+            directory,
+            semantic_index,
+            preview_cache=semantic_preview_cache,
+            embedding_cache=semantic_query_cache,
+            model=SEMANTIC_EMBEDDING_MODEL
+        )
+        return True
+    except Exception:
+        logger.exception(f"Failed to save semantic snapshot to {directory}")
+        return False
+
+
 # --- MCP Tools for Sayıştay (Turkish Court of Accounts) ---
 
 # DEACTIVATED TOOL - Use search_sayistay_unified instead
@@ -1605,7 +2327,9 @@ async def search_sayistay_unified(
     # Daire specific parameters (ignored for other types)
     yargilama_dairesi: Literal["ALL", "1", "2", "3", "4", "5", "6", "7", "8"] = Field("ALL", description="Chamber selection (daire only)"),
     hesap_yili: str = Field("", description="Account year (daire only)"),
-    web_karar_metni: str = Field("", description="Decision text search (daire only)")
+    web_karar_metni: str = Field("", description="Decision text search (daire only)"),
+    rerank_query: str = Field("", description="Optional question in natural language; returns the results of this page and the next few that are most relevant to it (best first)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Search Sayıştay decisions across all three decision types with unified interface."""
     logger.info(f"Tool 'search_sayistay_unified' called with decision_type={decision_type}")
@@ -1632,8 +2356,15 @@ async def search_sayistay_unified(
             hesap_yili=hesap_yili,
             web_karar_metni=web_karar_metni
         )
-        result = await sayistay_unified_client_instance.search_unified(search_request)
-        return result.model_dump()
+        result = await clients.get("sayistay").search_unified(search_request)
+
+        async def fetch_page(offset: int) -> List[Any]:
+            following = search_request.model_copy(update={"start": start + offset * length})
+            if following.start >= result.total_filtered:
+                return []
+            return (await clients.get("sayistay").search_unified(following)).model_dump()["decisions"]
+
+        return await rerank_decisions(result.model_dump(), rerank_query, fetch_page=fetch_page)
     except Exception:
         logger.exception("Error in tool 'search_sayistay_unified'")
         raise
@@ -1648,7 +2379,8 @@ async def search_sayistay_unified(
 )
 async def get_sayistay_document_unified(
     decision_id: str = Field(..., description="Decision ID from search_sayistay_unified results"),
-    decision_type: Literal["genel_kurul", "temyiz_kurulu", "daire"] = Field(..., description="Decision type: genel_kurul, temyiz_kurulu, or daire")
+    decision_type: Literal["genel_kurul", "temyiz_kurulu", "daire"] = Field(..., description="Decision type: genel_kurul, temyiz_kurulu, or daire"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Get Sayıştay decision document as Markdown for any decision type."""
     logger.info(f"Tool 'get_sayistay_document_unified' called for ID: {decision_id}, type: {decision_type}")
@@ -1657,82 +2389,115 @@ async def get_sayistay_document_unified(
         raise ValueError("Decision ID must be a non-empty string.")
 
     try:
-        result = await sayistay_unified_client_instance.get_document_unified(decision_id, decision_type)
+        result = await clients.get("sayistay").get_document_unified(decision_id, decision_type)
         return result.model_dump()
     except Exception:
         logger.exception("Error in tool 'get_sayistay_document_unified'")
         raise
 
-# --- Application Shutdown Handling ---
-def perform_cleanup():
-    logger.info("MCP Server performing cleanup...")
-    try:
-        loop = asyncio.get_event_loop_policy().get_event_loop()
-        if loop.is_closed(): 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-    except RuntimeError: 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    clients_to_close = [
-        globals().get('yargitay_client_instance'),
-        globals().get('danistay_client_instance'),
-        globals().get('emsal_client_instance'),
-        globals().get('uyusmazlik_client_instance'),
-        globals().get('anayasa_norm_client_instance'),
-        globals().get('anayasa_bireysel_client_instance'),
-        globals().get('anayasa_unified_client_instance'),
-        globals().get('kik_v2_client_instance'),
-        globals().get('rekabet_client_instance'),
-        globals().get('bedesten_client_instance'),
-        globals().get('sayistay_client_instance'),
-        globals().get('sayistay_unified_client_instance'),
-        globals().get('kvkk_client_instance'),
-        globals().get('bddk_client_instance')
-    ]
-    async def close_all_clients_async():
-        tasks = []
-        for client_instance in clients_to_close:
-            if client_instance and hasattr(client_instance, 'close_client_session') and callable(client_instance.close_client_session):
-                logger.info(f"Scheduling close for client session: {client_instance.__class__.__name__}")
-                tasks.append(client_instance.close_client_session())
-        # Close health check client if it was created
-        global _health_check_client
-        if _health_check_client is not None:
-            logger.info("Closing health check HTTP client")
-            tasks.append(_health_check_client.aclose())
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    client_name = "Unknown Client"
-                    if i < len(clients_to_close) and clients_to_close[i] is not None:
-                        client_name = clients_to_close[i].__class__.__name__
-                    logger.error(f"Error closing client {client_name}: {result}")
-    try:
-        if loop.is_running(): 
-            asyncio.ensure_future(close_all_clients_async(), loop=loop)
-            logger.info("Client cleanup tasks scheduled on running event loop.")
-        else:
-            loop.run_until_complete(close_all_clients_async())
-            logger.info("Client cleanup tasks completed via run_until_complete.")
-    except Exception as e: 
-        logger.error(f"Error during atexit cleanup execution: {e}", exc_info=True)
-    logger.info("MCP Server atexit cleanup process finished.")
 
-atexit.register(perform_cleanup)
+
+# --- Startup Warmup ---
+# Optional warmup run by the ASGI lifespan: pre-opens pooled connections to the
+# backends, bootstraps the Sayıştay CSRF tokens and preloads converters and the
+# tiktoken encoder so the first tool calls after a deploy do not pay for them.
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+WARMUP_BACKENDS = [
+    name.strip() for name in os.getenv(
+        "WARMUP_BACKENDS",
+        "yargitay,danistay,emsal,uyusmazlik,anayasa,kik_v2,rekabet,bedesten,sayistay,kvkk,bddk"
+    ).split(",") if name.strip()
+]
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "2"))
+# Readiness never waits longer than this for slow or unreachable backends
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "30"))
+
+# Hosts to warm for clients that are not bound to a base URL
+WARMUP_FALLBACK_URLS = {
+    "kik_v2": "https://ekap.kik.gov.tr",
+    "kvkk": KvkkApiClient.KVKK_BASE_URL,
+    "bddk": BddkApiClient.BDDK_BASE_URL,
+}
+
+warmup_status: Dict[str, Any] = {"state": "pending" if WARMUP_ENABLED else "disabled", "steps": {}}
+
+
+def is_warm() -> bool:
+    """Whether the server is ready for traffic (warmup finished, timed out or disabled)."""
+    return warmup_status["state"] in ("ready", "disabled")
+
+
+def _http_clients_of(resource: Any) -> List[httpx.AsyncClient]:
+    """HTTP clients held by an API client, including those of the clients a unified client wraps."""
+    found = []
+    for value in vars(resource).values():
+        if isinstance(value, httpx.AsyncClient):
+            found.append(value)
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            found.extend(v for v in vars(value).values() if isinstance(v, httpx.AsyncClient))
+    return found
+
+
+async def _warm_backend(name: str) -> str:
+    resource = clients.get(name)
+    if name == "sayistay":
+        # Sayıştay searches need a session cookie and CSRF token per endpoint
+        endpoints = ("genel_kurul", "temyiz_kurulu", "daire")
+        results = await asyncio.gather(*(resource.client._initialize_session_for_endpoint(e) for e in endpoints))
+        if not all(results):
+            raise RuntimeError("CSRF token bootstrap failed for some endpoints")
+    opened = 0
+    for http_client in _http_clients_of(resource):
+        url = str(http_client.base_url) if http_client.base_url.host else WARMUP_FALLBACK_URLS.get(name)
+        if url:
+            opened += await prewarm_connections(http_client, url, WARMUP_CONNECTIONS)
+    return f"{opened} connections opened"
+
+
+def _preload_converters() -> str:
+    """Import the document converters (and semantic search modules) and load the tiktoken encoder (blocking)."""
+    lazy_import("markitdown").MarkItDown()
+    lazy_import("bs4").BeautifulSoup("<p></p>", "html.parser")
+    lazy_import("pypdf").PdfReader
+    if token_counter is not None:
+        token_counter.encoder
+    if SEMANTIC_SEARCH_AVAILABLE:
+        for name in semantic_search.__all__:
+            getattr(semantic_search, name)
+    return ("markitdown, bs4, pypdf" + (", tiktoken" if token_counter is not None else "")
+            + (", semantic_search" if SEMANTIC_SEARCH_AVAILABLE else ""))
+
+
+async def run_warmup():
+    """Run all warmup steps concurrently; the server reports ready when they finish or WARMUP_TIMEOUT passes."""
+    warmup_status.update(state="running", started_at=datetime.now().isoformat())
+    start = time.perf_counter()
+    steps = warmup_status["steps"]
+
+    async def run_step(name: str, awaitable):
+        steps[name] = {"status": "running"}
+        try:
+            steps[name] = {"status": "ok", "detail": await awaitable}
+        except Exception as e:
+            steps[name] = {"status": "error", "detail": str(e)}
+
+    step_tasks = [run_step("converters", asyncio.to_thread(_preload_converters))]
+    step_tasks += [run_step(name, _warm_backend(name)) for name in WARMUP_BACKENDS]
+    try:
+        await asyncio.wait_for(asyncio.gather(*step_tasks), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        for step in steps.values():
+            if step["status"] == "running":
+                step["status"] = "timeout"
+    duration = round(time.perf_counter() - start, 2)
+    warmup_status.update(state="ready", duration_s=duration)
+    failed = [name for name, step in steps.items() if step["status"] != "ok"]
+    logger.info(f"Warmup finished in {duration}s" + (f" (incomplete: {', '.join(failed)})" if failed else ""))
 
 
 def get_or_create_health_check_client() -> httpx.AsyncClient:
     """Get or create a reusable HTTP client for health checks."""
-    global _health_check_client
-    if _health_check_client is None:
-        _health_check_client = httpx.AsyncClient(
-            timeout=10.0,
-            verify=False,
-            follow_redirects=True
-        )
-    return _health_check_client
+    return clients.get("health_check")
 
 
 # --- Health Check Tools ---
@@ -1743,7 +2508,9 @@ def get_or_create_health_check_client() -> httpx.AsyncClient:
         "idempotentHint": True
     }
 )
-async def check_government_servers_health() -> Dict[str, Any]:
+async def check_government_servers_health(
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
+) -> Dict[str, Any]:
     """Check health status of Turkish government legal database servers."""
     logger.info("Health check tool called for government servers")
     
@@ -1760,7 +2527,7 @@ async def check_government_servers_health() -> Dict[str, Any]:
             }
         }
         
-        async with httpx.AsyncClient(
+        async with create_http_client(
             headers={
                 "Accept": "*/*",
                 "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -1775,7 +2542,7 @@ async def check_government_servers_health() -> Dict[str, Any]:
                 "X-Requested-With": "XMLHttpRequest"
             },
             timeout=30.0,
-            verify=False
+            tls_profile="insecure"
         ) as client:
             response = await client.post(
                 "https://karararama.yargitay.gov.tr/aramalist",
@@ -1885,6 +2652,10 @@ async def check_government_servers_health() -> Dict[str, Any]:
         "healthy_servers": healthy_servers,
         "total_servers": total_servers,
         "servers": health_results,
+        "connection_pools": get_pool_stats(),
+        "circuit_breakers": get_breaker_states(),
+        "http_cache": http_cache.get_stats(),
+        "clients_created": clients.created(),
         "check_timestamp": f"{__import__('datetime').datetime.now().isoformat()}"
     }
 
@@ -1901,6 +2672,7 @@ async def search_kvkk_decisions(
     keywords: str = Field(..., description="Turkish keywords. Supports +required -excluded \"exact phrase\" operators"),
     page: int = Field(1, ge=1, le=50, description="Page number for results (1-50)."),
     # pageSize: int = Field(10, ge=1, le=20, description="Number of results per page (1-20).")
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Search function for legal decisions."""
     logger.info(f"KVKK search tool called with keywords: {keywords}")
@@ -1914,7 +2686,7 @@ async def search_kvkk_decisions(
     )
 
     try:
-        result = await kvkk_client_instance.search_decisions(search_request)
+        result = await clients.get("kvkk").search_decisions(search_request)
         logger.info(f"KVKK search completed. Found {len(result.decisions)} decisions on page {page}")
         return result.model_dump()
     except Exception as e:
@@ -1938,7 +2710,8 @@ async def search_kvkk_decisions(
 )
 async def get_kvkk_document_markdown(
     decision_url: str = Field(..., description="KVKK decision URL from search results"),
-    page_number: int = Field(1, ge=1, description="Page number for paginated Markdown content (1-indexed, accepts int). Default is 1 (first 5,000 characters).")
+    page_number: int = Field(1, ge=1, description="Page number for paginated Markdown content (1-indexed, accepts int). Default is 1 (first 5,000 characters)."),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """Get KVKK decision as paginated Markdown."""
     logger.info(f"KVKK document retrieval tool called for URL: {decision_url}")
@@ -1973,7 +2746,7 @@ async def get_kvkk_document_markdown(
                 error_message="Invalid KVKK decision URL format. URL must start with https://www.kvkk.gov.tr/"
             ).model_dump()
 
-        result = await kvkk_client_instance.get_decision_document(decision_url, page_number or 1)
+        result = await clients.get("kvkk").get_decision_document(decision_url, page_number or 1)
         logger.info(f"KVKK document retrieved successfully. Page {result.current_page}/{result.total_pages}, Content length: {len(result.markdown_chunk) if result.markdown_chunk else 0}")
         return result.model_dump()
         
@@ -2003,8 +2776,9 @@ async def get_kvkk_document_markdown(
 )
 async def search_bddk_decisions(
     keywords: str = Field(..., description="Search keywords in Turkish"),
-    page: int = Field(1, ge=1, description="Page number")
+    page: int = Field(1, ge=1, description="Page number"),
     # pageSize: int = Field(10, ge=1, le=50, description="Results per page")
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> dict:
     """Search BDDK banking regulation and supervision decisions."""
     logger.info(f"BDDK search tool called with keywords: {keywords}, page: {page}")
@@ -2018,7 +2792,7 @@ async def search_bddk_decisions(
             pageSize=pageSize
         )
         
-        result = await bddk_client_instance.search_decisions(search_request)
+        result = await clients.get("bddk").search_decisions(search_request)
         logger.info(f"BDDK search completed. Found {len(result.decisions)} decisions on page {page}")
         
         return {
@@ -2055,7 +2829,8 @@ async def search_bddk_decisions(
 )
 async def get_bddk_document_markdown(
     document_id: str = Field(..., description="BDDK document ID (e.g., '310')"),
-    page_number: int = Field(1, ge=1, description="Page number")
+    page_number: int = Field(1, ge=1, description="Page number"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> dict:
     """Retrieve BDDK decision document in Markdown format."""
     logger.info(f"BDDK document retrieval tool called for ID: {document_id}, page: {page_number}")
@@ -2070,7 +2845,7 @@ async def get_bddk_document_markdown(
         }
     
     try:
-        result = await bddk_client_instance.get_document_markdown(document_id, page_number)
+        result = await clients.get("bddk").get_document_markdown(document_id, page_number)
         logger.info(f"BDDK document retrieved successfully. Page {result.page_number}/{result.total_pages}")
         
         return {
@@ -2147,7 +2922,8 @@ def get_preview_text(markdown_content: str, skip_chars: int = 100, preview_chars
     }
 )
 async def search(
-    query: str = Field(..., description="Turkish search query")
+    query: str = Field(..., description="Turkish search query"),
+    timeout_seconds: Optional[float] = Field(None, description="Overall time budget in seconds; results found so far are returned when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """
     Bedesten API search tool for ChatGPT Deep Research compatibility.
@@ -2176,75 +2952,97 @@ async def search(
             ("KYB", "Kanun Yararına Bozma", "kyb_bedesten")
         ]
         
-        for item_type, court_name, id_prefix in court_types:
-            try:
-                search_results = await bedesten_client_instance.search_documents(
-                    BedestenSearchRequest(
-                        data=BedestenSearchData(
-                            phrase=query,  # Use query as-is to support both regular and exact phrase searches
-                            itemTypeList=[item_type],
-                            pageSize=10,
-                            pageNumber=1
+        # Stop at the call's deadline and return what was collected so far
+        try:
+            async with asyncio.timeout(remaining()):
+                for item_type, court_name, id_prefix in court_types:
+                    if deadline_expired():
+                        break
+                    try:
+                        search_results = await clients.get("bedesten").search_documents(
+                            BedestenSearchRequest(
+                                data=BedestenSearchData(
+                                    phrase=query,  # Use query as-is to support both regular and exact phrase searches
+                                    itemTypeList=[item_type],
+                                    pageSize=10,
+                                    pageNumber=1
+                                )
+                            )
                         )
-                    )
-                )
                 
-                # Handle potential None data
-                if search_results.data is None:
-                    logger.warning(f"No data returned from Bedesten API for {court_name}")
-                    continue
+                        # Handle potential None data
+                        if search_results.data is None:
+                            logger.warning(f"No data returned from Bedesten API for {court_name}")
+                            continue
                 
-                # Add results from this court type (limit to top 5 per court)
-                for decision in search_results.data.emsalKararList[:5]:
-                    # For ChatGPT Deep Research, fetch document content for preview
-                    try:
-                        # Fetch document content for preview
-                        doc = await bedesten_client_instance.get_document_as_markdown(decision.documentId)
+                        # Add results from this court type (limit to top 5 per court)
+                        for decision in search_results.data.emsalKararList[:5]:
+                            if deadline_expired():
+                                break
+                            # Same matter already returned from another court: skip the redundant fetch
+                            if get_bedesten_duplicate_index().find_duplicate(decision.documentId, [item["id"] for item in results]):
+                                continue
+                            # For ChatGPT Deep Research, fetch document content for preview
+                            try:
+                                # Fetch document content for preview
+                                doc = await clients.get("bedesten").get_document_as_markdown(decision.documentId)
+                                get_bedesten_duplicate_index().add(decision.documentId, doc.markdown_content)
+                                ingest_bedesten_document(decision.documentId, doc.markdown_content, {
+                                    **bedesten_decision_metadata(decision),
+                                    "court_type": item_type
+                                })
+                                if get_bedesten_duplicate_index().find_duplicate(decision.documentId, [item["id"] for item in results]):
+                                    continue
                         
-                        # Generate preview text (skip first 100 chars, show next 200)
-                        preview_text = get_preview_text(doc.markdown_content, skip_chars=100, preview_chars=200)
+                                # Generate preview text (skip first 100 chars, show next 200)
+                                preview_text = get_preview_text(doc.markdown_content, skip_chars=100, preview_chars=200)
                         
-                        # Build title from metadata
-                        title_parts = []
-                        if decision.birimAdi:
-                            title_parts.append(decision.birimAdi)
-                        if decision.esasNo:
-                            title_parts.append(f"Esas: {decision.esasNo}")
-                        if decision.kararNo:
-                            title_parts.append(f"Karar: {decision.kararNo}")
-                        if decision.kararTarihiStr:
-                            title_parts.append(f"Tarih: {decision.kararTarihiStr}")
+                                # Build title from metadata
+                                title_parts = []
+                                if decision.birimAdi:
+                                    title_parts.append(decision.birimAdi)
+                                if decision.esasNo:
+                                    title_parts.append(f"Esas: {decision.esasNo}")
+                                if decision.kararNo:
+                                    title_parts.append(f"Karar: {decision.kararNo}")
+                                if decision.kararTarihiStr:
+                                    title_parts.append(f"Tarih: {decision.kararTarihiStr}")
                         
-                        if title_parts:
-                            title = " - ".join(title_parts)
-                        else:
-                            title = f"{court_name} - Document {decision.documentId}"
+                                if title_parts:
+                                    title = " - ".join(title_parts)
+                                else:
+                                    title = f"{court_name} - Document {decision.documentId}"
                         
-                        # Add to results in OpenAI format
-                        results.append({
-                            "id": decision.documentId,
-                            "title": title,
-                            "text": preview_text,
-                            "url": f"https://mevzuat.adalet.gov.tr/ictihat/{decision.documentId}"
-                        })
+                                # Add to results in OpenAI format
+                                results.append({
+                                    "id": decision.documentId,
+                                    "title": title,
+                                    "text": preview_text,
+                                    "url": f"https://mevzuat.adalet.gov.tr/ictihat/{decision.documentId}"
+                                })
                         
-                    except Exception as e:
-                        logger.warning(f"Could not fetch preview for document {decision.documentId}: {e}")
-                        # Add minimal result without preview
-                        results.append({
-                            "id": decision.documentId,
-                            "title": f"{court_name} - Document {decision.documentId}",
-                            "text": "Document preview not available",
-                            "url": f"https://mevzuat.adalet.gov.tr/ictihat/{decision.documentId}"
-                        })
+                            except Exception as e:
+                                logger.warning(f"Could not fetch preview for document {decision.documentId}: {e}")
+                                # Add minimal result without preview
+                                results.append({
+                                    "id": decision.documentId,
+                                    "title": f"{court_name} - Document {decision.documentId}",
+                                    "text": "Document preview not available",
+                                    "url": f"https://mevzuat.adalet.gov.tr/ictihat/{decision.documentId}"
+                                })
                     
-                if search_results.data:
-                    logger.info(f"Found {len(search_results.data.emsalKararList)} results from {court_name}")
-                else:
-                    logger.info(f"Found 0 results from {court_name} (no data returned)")
+                        if search_results.data:
+                            logger.info(f"Found {len(search_results.data.emsalKararList)} results from {court_name}")
+                        else:
+                            logger.info(f"Found 0 results from {court_name} (no data returned)")
                 
-            except Exception as e:
-                logger.warning(f"Bedesten API search error for {court_name}: {e}")
+                    except Exception as e:
+                        logger.warning(f"Bedesten API search error for {court_name}: {e}")
+        
+        except TimeoutError:
+            pass
+        if deadline_expired():
+            logger.warning(f"ChatGPT Deep Research search hit its deadline; returning {len(results)} partial results")
         
         # Comment out other API implementations for ChatGPT Deep Research
         """
@@ -2300,7 +3098,8 @@ async def search(
     }
 )
 async def fetch(
-    id: str = Field(..., description="Document identifier from search results (numeric only)")
+    id: str = Field(..., description="Document identifier from search results (numeric only)"),
+    timeout_seconds: Optional[float] = Field(None, description="Time budget in seconds; the call fails with a timeout error when it runs out (default: server setting)")
 ) -> Dict[str, Any]:
     """
     Bedesten API fetch tool for ChatGPT Deep Research compatibility.
@@ -2325,13 +3124,15 @@ async def fetch(
     
     try:
         # Use the numeric ID directly with Bedesten API
-        doc = await bedesten_client_instance.get_document_as_markdown(id)
+        doc = await clients.get("bedesten").get_document_as_markdown(id)
+        get_bedesten_duplicate_index().add(id, doc.markdown_content)
+        ingest_bedesten_document(id, doc.markdown_content)
         
         # Try to get additional metadata by searching for this specific document
         title = f"Turkish Legal Document {id}"
         try:
             # Quick search to get metadata for better title
-            search_results = await bedesten_client_instance.search_documents(
+            search_results = await clients.get("bedesten").search_documents(
                 BedestenSearchRequest(
                     data=BedestenSearchData(
                         phrase=id,  # Search by document ID
@@ -2385,12 +3186,12 @@ async def fetch(
         elif id.startswith("yargitay_"):
             # Yargıtay Official API - use get_yargitay_document_markdown instead
             doc_id = id.replace("yargitay_", "")
-            doc = await yargitay_client_instance.get_decision_document_as_markdown(doc_id)
+            doc = await clients.get("yargitay").get_decision_document_as_markdown(doc_id)
             
         elif id.startswith("danistay_"):
             # Danıştay Official API - use get_danistay_document_markdown instead
             doc_id = id.replace("danistay_", "")
-            doc = await danistay_client_instance.get_decision_document_as_markdown(doc_id)
+            doc = await clients.get("danistay").get_decision_document_as_markdown(doc_id)
             
         elif id.startswith("anayasa_"):
             # Constitutional Court - use get_anayasa_norm_denetimi_document_markdown instead
@@ -2400,7 +3201,7 @@ async def fetch(
         elif id.startswith("rekabet_"):
             # Competition Authority - use get_rekabet_kurumu_document instead
             doc_id = id.replace("rekabet_", "")
-            doc = await rekabet_client_instance.get_decision_document(...)
+            doc = await clients.get("rekabet").get_decision_document(...)
             
         elif id.startswith("kik_"):
             # Public Procurement Authority - use get_kik_decision_document_as_markdown instead
@@ -2410,7 +3211,7 @@ async def fetch(
         elif id.startswith("local_"):
             # This was already using Bedesten API, but deprecated for ChatGPT Deep Research
             doc_id = id.replace("local_", "")
-            doc = await bedesten_client_instance.get_document_as_markdown(doc_id)
+            doc = await clients.get("bedesten").get_document_as_markdown(doc_id)
         """
         
     except Exception:
@@ -2420,6 +3221,12 @@ async def fetch(
 # --- Token Metrics Tool Removed for Optimization ---
 
 def main():
+    if "--bench-startup" in sys.argv[1:]:
+        # Measure cold start of the stdio and ASGI entry points instead of serving
+        import startup_benchmark
+        startup_benchmark.main(sys.argv[1:])
+        return
+
     # Initialize the app properly with create_app()
     global app
     app = create_app()
@@ -2427,6 +3234,8 @@ def main():
     logger.info(f"Starting {app.name} server via main() function...")
     # logger.info(f"Logs will be written to: {LOG_FILE_PATH}")  # File logging disabled
 
+    asyncio.run(restore_semantic_snapshot())
+
     try:
         app.run()
     except KeyboardInterrupt: 
@@ -2434,6 +3243,7 @@ def main():
     except Exception: 
         logger.exception("Server failed to start or crashed.")
     finally:
+        persist_semantic_snapshot()
         logger.info(f"{app.name} server has shut down.")
 
 if __name__ == "__main__": 
@@ -10,6 +10,7 @@ Uses Upstash Redis via REST API for serverless-friendly operation.
 import os
 import json
 import time
+import asyncio
 import logging
 from typing import Optional, Dict, Any, Union
 from datetime import datetime, timedelta
@@ -18,14 +19,23 @@ logger = logging.getLogger(__name__)
 
 try:
     from upstash_redis import Redis
+    from upstash_redis.asyncio import Redis as AsyncRedis
     UPSTASH_AVAILABLE = True
 except ImportError:
     UPSTASH_AVAILABLE = False
     Redis = None
+    AsyncRedis = None
 
-# Use standard Python exceptions for Redis connection errors
-import socket
-from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
+# Upstash's REST client sends its requests with httpx
+import httpx
+
+from http_transport.retry import DEFAULT_RETRY_POLICY
+
+# Same attempt count and full-jitter backoff as the upstream HTTP clients.
+# Upstash reports errors in the JSON body without response headers, so there
+# is no Retry-After to honour here.
+RETRY_POLICY = DEFAULT_RETRY_POLICY
+REDIS_CONNECTION_ERRORS = (httpx.TransportError, OSError)
 
 class RedisSessionStore:
     """
@@ -56,6 +66,13 @@ class RedisSessionStore:
                 url=redis_url,
                 token=redis_token
             )
+            # OAuth code operations run on the event loop; the client's own
+            # fixed-interval retries are disabled in favour of RETRY_POLICY
+            self.async_redis = AsyncRedis(
+                url=redis_url,
+                token=redis_token,
+                rest_retries=0
+            )
             
             logger.info("Upstash Redis client created")
             
@@ -128,7 +145,7 @@ class RedisSessionStore:
     
     # OAuth Authorization Code Methods
     
-    def set_oauth_code(self, code: str, data: Dict[str, Any]) -> bool:
+    async def set_oauth_code(self, code: str, data: Dict[str, Any]) -> bool:
         """
         Store OAuth authorization code with automatic expiration.
         
@@ -153,33 +170,33 @@ class RedisSessionStore:
             serialized_data = self._serialize_data(data_with_timestamp)
             
             # Use individual hset calls for each field with retry logic
-            max_retries = 3
+            max_retries = RETRY_POLICY.max_attempts
             for attempt in range(max_retries):
                 try:
                     # Clear any existing data first
-                    self.redis.delete(key)
+                    await self.async_redis.delete(key)
                     
                     # Set all fields in a pipeline-like manner
                     for field, value in serialized_data.items():
-                        self.redis.hset(key, field, value)
+                        await self.async_redis.hset(key, field, value)
                     
                     # Set expiration
-                    self.redis.expire(key, self.oauth_code_ttl)
+                    await self.async_redis.expire(key, self.oauth_code_ttl)
                     
                     logger.info(f"Stored OAuth code {code[:10]}... with TTL {self.oauth_code_ttl}s (attempt {attempt + 1})")
                     return True
                     
-                except (RequestsConnectionError, RequestsTimeout, OSError, socket.error) as e:
+                except REDIS_CONNECTION_ERRORS as e:
                     logger.warning(f"Redis connection error on attempt {attempt + 1}: {e}")
                     if attempt == max_retries - 1:
                         raise  # Re-raise on final attempt
-                    time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+                    await asyncio.sleep(RETRY_POLICY.backoff(attempt + 1))
                     
         except Exception as e:
             logger.error(f"Failed to store OAuth code {code[:10]}... after {max_retries} attempts: {e}")
             return False
     
-    def get_oauth_code(self, code: str, delete_after_use: bool = True) -> Optional[Dict[str, Any]]:
+    async def get_oauth_code(self, code: str, delete_after_use: bool = True) -> Optional[Dict[str, Any]]:
         """
         Retrieve OAuth authorization code data.
         
@@ -190,13 +207,13 @@ class RedisSessionStore:
         Returns:
             Code data dictionary or None if not found/expired
         """
-        max_retries = 3
+        max_retries = RETRY_POLICY.max_attempts
         for attempt in range(max_retries):
             try:
                 key = f"oauth:code:{code}"
                 
                 # Get all hash fields with retry
-                data = self.redis.hgetall(key)
+                data = await self.async_redis.hgetall(key)
                 
                 if not data:
                     logger.warning(f"OAuth code {code[:10]}... not found or expired (attempt {attempt + 1})")
@@ -210,7 +227,7 @@ class RedisSessionStore:
                 if expires_at and time.time() > expires_at:
                     logger.warning(f"OAuth code {code[:10]}... manually expired")
                     try:
-                        self.redis.delete(key)
+                        await self.async_redis.delete(key)
                     except Exception as del_error:
                         logger.warning(f"Failed to delete expired code: {del_error}")
                     return None
@@ -218,7 +235,7 @@ class RedisSessionStore:
                 # Delete after use for security (one-time use)
                 if delete_after_use:
                     try:
-                        self.redis.delete(key)
+                        await self.async_redis.delete(key)
                         logger.info(f"Retrieved and deleted OAuth code {code[:10]}... (attempt {attempt + 1})")
                     except Exception as del_error:
                         logger.warning(f"Failed to delete code after use: {del_error}")
@@ -228,18 +245,18 @@ class RedisSessionStore:
                 
                 return deserialized_data
                 
-            except (RequestsConnectionError, RequestsTimeout, OSError, socket.error) as e:
+            except REDIS_CONNECTION_ERRORS as e:
                 logger.warning(f"Redis connection error on retrieval attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     logger.error(f"Failed to retrieve OAuth code {code[:10]}... after {max_retries} attempts: {e}")
                     return None
-                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+                await asyncio.sleep(RETRY_POLICY.backoff(attempt + 1))
                 
             except Exception as e:
                 logger.error(f"Failed to retrieve OAuth code {code[:10]}... on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     return None
-                time.sleep(0.5 * (attempt + 1))
+                await asyncio.sleep(RETRY_POLICY.backoff(attempt + 1))
         
         return None
     
@@ -1,19 +1,16 @@
 # rekabet_mcp_module/client.py
 
 import httpx
-from bs4 import BeautifulSoup
 from typing import List, Optional, Tuple, Dict, Any
 import logging
 import html
 import re
 import io # For io.BytesIO
 from urllib.parse import urlencode, urljoin, quote, parse_qs, urlparse
-from markitdown import MarkItDown
 import math
 
-# pypdf for PDF processing (lighter alternative to PyMuPDF)
-from pypdf import PdfReader, PdfWriter # PyPDF2'nin devamı niteliğindeki pypdf
-
+from http_transport import create_http_client, CACHE_IMMUTABLE
+from lazy_imports import lazy_import
 from .models import (
     RekabetKurumuSearchRequest,
     RekabetDecisionSummary,
@@ -23,6 +20,11 @@ from .models import (
 )
 from pydantic import HttpUrl # Ensure HttpUrl is imported from pydantic
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+# pypdf for PDF processing (lighter alternative to PyMuPDF)
+pypdf = lazy_import("pypdf")  # PyPDF2'nin devamı niteliğindeki pypdf
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers(): # Pragma: no cover
     logging.basicConfig(
@@ -39,7 +41,7 @@ class RekabetKurumuApiClient:
     # DOCUMENT_MARKDOWN_CHUNK_SIZE = 5000 
 
     def __init__(self, request_timeout: float = 60.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
             headers={
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -47,7 +49,6 @@ class RekabetKurumuApiClient:
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             },
             timeout=request_timeout,
-            verify=True,
             follow_redirects=True
         )
 
@@ -83,7 +84,7 @@ class RekabetKurumuApiClient:
             logger.error(f"RekabetKurumuApiClient: HTTP request error during search: {e}")
             raise
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = bs4.BeautifulSoup(html_content, 'html.parser')
         processed_decisions: List[RekabetDecisionSummary] = []
         total_records: Optional[int] = None
         total_pages: Optional[int] = None
@@ -208,7 +209,7 @@ class RekabetKurumuApiClient:
         )
 
     async def _extract_pdf_url_and_landing_page_metadata(self, karar_id: str, landing_page_html: str, landing_page_url: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(landing_page_html, 'html.parser')
+        soup = bs4.BeautifulSoup(landing_page_html, 'html.parser')
         data: Dict[str, Any] = {
             "pdf_url": None,
             "title_on_landing_page": soup.title.string.strip() if soup.title and soup.title.string else f"Rekabet Kurumu Kararı {karar_id}",
@@ -244,7 +245,7 @@ class RekabetKurumuApiClient:
         try:
             url_to_fetch = pdf_url if pdf_url.startswith(('http://', 'https://')) else urljoin(self.BASE_URL, pdf_url)
             logger.info(f"Downloading PDF from: {url_to_fetch}")
-            response = await self.http_client.get(url_to_fetch)
+            response = await self.http_client.get(url_to_fetch, extensions=CACHE_IMMUTABLE)
             response.raise_for_status()
             pdf_bytes = await response.aread()
             logger.info(f"PDF content downloaded ({len(pdf_bytes)} bytes) from: {url_to_fetch}")
@@ -265,14 +266,14 @@ class RekabetKurumuApiClient:
 
         try:
             pdf_stream = io.BytesIO(original_pdf_bytes)
-            reader = PdfReader(pdf_stream)
+            reader = pypdf.PdfReader(pdf_stream)
             total_pages_in_original_pdf = len(reader.pages)
             
             if not (0 < page_number_to_extract <= total_pages_in_original_pdf):
                 logger.warning(f"Requested page number ({page_number_to_extract}) is out of PDF page range (1-{total_pages_in_original_pdf}).")
                 return None, total_pages_in_original_pdf
 
-            writer = PdfWriter()
+            writer = pypdf.PdfWriter()
             writer.add_page(reader.pages[page_number_to_extract - 1]) # pypdf is 0-indexed
             
             output_pdf_stream = io.BytesIO()
@@ -293,7 +294,7 @@ class RekabetKurumuApiClient:
         
         pdf_stream = io.BytesIO(pdf_bytes)
         try:
-            md_converter = MarkItDown(enable_plugins=False) 
+            md_converter = markitdown.MarkItDown(enable_plugins=False) 
             conversion_result = md_converter.convert(pdf_stream) 
             markdown_text = conversion_result.text_content
             
@@ -324,7 +325,7 @@ class RekabetKurumuApiClient:
         total_pdf_pages: int = 0
         
         try:
-            async with self.http_client.stream("GET", full_landing_page_url) as response:
+            async with self.http_client.stream("GET", full_landing_page_url, extensions=CACHE_IMMUTABLE) as response:
                 response.raise_for_status()
                 content_type = response.headers.get("content-type", "").lower()
                 final_url_of_response = HttpUrl(str(response.url))
@@ -2,14 +2,14 @@
 
 import httpx
 import re
-from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional, Tuple
 import logging
 import html
 import io
 from urllib.parse import urlencode, urljoin
-from markitdown import MarkItDown
 
+from http_transport import create_http_client
+from lazy_imports import lazy_import
 from .models import (
     GenelKurulSearchRequest, GenelKurulSearchResponse, GenelKurulDecision,
     TemyizKuruluSearchRequest, TemyizKuruluSearchResponse, TemyizKuruluDecision,
@@ -17,6 +17,9 @@ from .models import (
     SayistayDocumentMarkdown
 )
 from .enums import DaireEnum, KamuIdaresiTuruEnum, WebKararKonusuEnum, WEB_KARAR_KONUSU_MAPPING
+from .session import SayistaySessionManager
+
+markitdown = lazy_import("markitdown")
 
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
@@ -35,9 +38,9 @@ class SayistayApiClient:
     - Daire (Chamber): First-instance audit findings and sanctions
     
     Features:
-    - ASP.NET WebForms session management with CSRF tokens
+    - ASP.NET WebForms session management with CSRF tokens (SayistaySessionManager)
     - DataTables-based pagination and filtering
-    - Automatic session refresh on expiration
+    - Proactive session refresh, and re-initialization and retry on expired sessions
     - Document retrieval with Markdown conversion
     """
     
@@ -55,10 +58,9 @@ class SayistayApiClient:
     
     def __init__(self, request_timeout: float = 60.0):
         self.request_timeout = request_timeout
-        self.session_cookies: Dict[str, str] = {}
-        self.csrf_tokens: Dict[str, str] = {}  # Store tokens for each endpoint
         
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
+            idempotent_post=True,  # Search POSTs are read-only
             base_url=self.BASE_URL,
             headers={
                 "Accept": "application/json, text/javascript, */*; q=0.01",
@@ -73,6 +75,12 @@ class SayistayApiClient:
             timeout=request_timeout,
             follow_redirects=True
         )
+        # Session cookies live in the client's cookie jar; CSRF tokens in the manager
+        self.session = SayistaySessionManager(self.http_client, {
+            'genel_kurul': self.GENEL_KURUL_PAGE,
+            'temyiz_kurulu': self.TEMYIZ_KURULU_PAGE,
+            'daire': self.DAIRE_PAGE
+        })
 
     async def _initialize_session_for_endpoint(self, endpoint_type: str) -> bool:
         """
@@ -84,47 +92,64 @@ class SayistayApiClient:
         Returns:
             True if session initialized successfully, False otherwise
         """
-        page_mapping = {
-            'genel_kurul': self.GENEL_KURUL_PAGE,
-            'temyiz_kurulu': self.TEMYIZ_KURULU_PAGE,
-            'daire': self.DAIRE_PAGE
-        }
-        
-        if endpoint_type not in page_mapping:
-            logger.error(f"Invalid endpoint type: {endpoint_type}")
-            return False
-            
-        page_url = page_mapping[endpoint_type]
-        logger.info(f"Initializing session for {endpoint_type} endpoint: {page_url}")
-        
         try:
-            response = await self.http_client.get(page_url)
-            response.raise_for_status()
-            
-            # Extract session cookies
-            for cookie_name, cookie_value in response.cookies.items():
-                self.session_cookies[cookie_name] = cookie_value
-                logger.debug(f"Stored session cookie: {cookie_name}")
-            
-            # Extract CSRF token from form
-            soup = BeautifulSoup(response.text, 'html.parser')
-            csrf_input = soup.find('input', {'name': '__RequestVerificationToken'})
-            
-            if csrf_input and csrf_input.get('value'):
-                self.csrf_tokens[endpoint_type] = csrf_input['value']
-                logger.info(f"Extracted CSRF token for {endpoint_type}")
-                return True
-            else:
-                logger.warning(f"CSRF token not found in {endpoint_type} page")
-                return False
-                
-        except httpx.RequestError as e:
-            logger.error(f"HTTP error during session initialization for {endpoint_type}: {e}")
-            return False
+            await self.session.get_token(endpoint_type)
+            return True
         except Exception as e:
             logger.error(f"Error initializing session for {endpoint_type}: {e}")
             return False
 
+    # Markers of the HTML pages served instead of JSON when the session has expired:
+    # the search page (which issues a new token) or the login page
+    EXPIRED_SESSION_MARKERS = ("__RequestVerificationToken", "/Account/Login")
+
+    @classmethod
+    def _is_session_expired(cls, response: httpx.Response) -> bool:
+        """
+        Whether a search was rejected because of an expired session or CSRF token.
+
+        That is a 403, or a 400 or HTML page that mentions the anti-forgery
+        token or the login page. Other 400s are invalid searches, and server
+        errors were already retried by the shared transport and count towards
+        its circuit breaker; re-initializing the session would only add
+        requests to a failing server.
+        """
+        if response.status_code == 403:
+            return True
+        if response.status_code == 400:
+            return any(marker in response.text for marker in cls.EXPIRED_SESSION_MARKERS)
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", ""):
+            return False
+        return any(marker in response.text for marker in cls.EXPIRED_SESSION_MARKERS)
+
+    async def _post_search(self, endpoint_type: str, endpoint: str, build_form_data, params) -> Dict[str, Any]:
+        """
+        Post a DataTables search, re-initializing the session once if it has expired.
+        
+        Args:
+            endpoint_type: One of 'genel_kurul', 'temyiz_kurulu', 'daire'
+            endpoint: DataTables endpoint path
+            build_form_data: Form builder taking (params, csrf_token)
+            params: Search request
+            
+        Returns:
+            Parsed JSON response
+        """
+        for attempt in range(2):
+            try:
+                csrf_token = await self.session.get_token(endpoint_type)
+            except Exception as e:
+                raise Exception(f"Failed to initialize session for {endpoint_type} endpoint: {e}") from e
+            
+            encoded_data = urlencode(build_form_data(params, csrf_token), encoding='utf-8')
+            response = await self.http_client.post(endpoint, data=encoded_data)
+            if attempt == 0 and self._is_session_expired(response):
+                logger.warning(f"Sayıştay {endpoint_type} search rejected (HTTP {response.status_code}); refreshing session and retrying")
+                self.session.invalidate(endpoint_type, csrf_token)
+                continue
+            response.raise_for_status()
+            return response.json()
+
     def _enum_to_form_value(self, enum_value: str, enum_type: str) -> str:
         """Convert enum values to form values expected by the API."""
         if enum_value == "ALL":
@@ -152,7 +177,7 @@ class SayistayApiClient:
         ]
         return params
 
-    def _build_genel_kurul_form_data(self, params: GenelKurulSearchRequest, draw: int = 1) -> List[Tuple[str, str]]:
+    def _build_genel_kurul_form_data(self, params: GenelKurulSearchRequest, csrf_token: str, draw: int = 1) -> List[Tuple[str, str]]:
         """Build form data for Genel Kurul search request."""
         form_data = self._build_datatables_params(params.start, params.length, draw)
         
@@ -207,12 +232,12 @@ class SayistayApiClient:
             ("KararlarGenelKurulAra.KARARTARIHBaslangic", params.karar_tarih_baslangic or "Başlangıç Tarihi"),
             ("KararlarGenelKurulAra.KARARTARIHBitis", params.karar_tarih_bitis or "Bitiş Tarihi"), 
             ("KararlarGenelKurulAra.KARARTAMAMI", params.karar_tamami or ""),
-            ("__RequestVerificationToken", self.csrf_tokens.get('genel_kurul', ''))
+            ("__RequestVerificationToken", csrf_token)
         ])
         
         return form_data
 
-    def _build_temyiz_kurulu_form_data(self, params: TemyizKuruluSearchRequest, draw: int = 1) -> List[Tuple[str, str]]:
+    def _build_temyiz_kurulu_form_data(self, params: TemyizKuruluSearchRequest, csrf_token: str, draw: int = 1) -> List[Tuple[str, str]]:
         """Build form data for Temyiz Kurulu search request."""
         form_data = self._build_datatables_params(params.start, params.length, draw)
         
@@ -275,12 +300,12 @@ class SayistayApiClient:
             ("__Invariant", "KararlarTemyizAra.TEMYIZTUTANAKNO"),
             ("KararlarTemyizAra.TEMYIZKARAR", params.temyiz_karar or ""),
             ("KararlarTemyizAra.WEBKARARKONUSU", web_karar_konusu_value if web_karar_konusu_value != "Tüm Konular" else ""),
-            ("__RequestVerificationToken", self.csrf_tokens.get('temyiz_kurulu', ''))
+            ("__RequestVerificationToken", csrf_token)
         ])
         
         return form_data
 
-    def _build_daire_form_data(self, params: DaireSearchRequest, draw: int = 1) -> List[Tuple[str, str]]:
+    def _build_daire_form_data(self, params: DaireSearchRequest, csrf_token: str, draw: int = 1) -> List[Tuple[str, str]]:
         """Build form data for Daire search request."""
         form_data = self._build_datatables_params(params.start, params.length, draw)
         
@@ -347,7 +372,7 @@ class SayistayApiClient:
             ("KararlarDaireAra.HESAPYILI", params.hesap_yili or ""),
             ("KararlarDaireAra.WEBKARARKONUSU", web_karar_konusu_value if web_karar_konusu_value != "Tüm Konular" else ""),
             ("KararlarDaireAra.WEBKARARMETNI", params.web_karar_metni or ""),
-            ("__RequestVerificationToken", self.csrf_tokens.get('daire', ''))
+            ("__RequestVerificationToken", csrf_token)
         ])
         
         return form_data
@@ -362,30 +387,12 @@ class SayistayApiClient:
         Returns:
             GenelKurulSearchResponse with matching decisions
         """
-        # Initialize session if needed
-        if 'genel_kurul' not in self.csrf_tokens:
-            if not await self._initialize_session_for_endpoint('genel_kurul'):
-                raise Exception("Failed to initialize session for Genel Kurul endpoint")
-        
-        form_data = self._build_genel_kurul_form_data(params)
-        encoded_data = urlencode(form_data, encoding='utf-8')
-        
         logger.info(f"Searching Genel Kurul decisions with parameters: {params.model_dump(exclude_none=True)}")
         
         try:
-            # Update headers with cookies
-            headers = self.http_client.headers.copy()
-            if self.session_cookies:
-                cookie_header = "; ".join([f"{k}={v}" for k, v in self.session_cookies.items()])
-                headers["Cookie"] = cookie_header
-            
-            response = await self.http_client.post(
-                self.GENEL_KURUL_ENDPOINT,
-                data=encoded_data,
-                headers=headers
+            response_json = await self._post_search(
+                'genel_kurul', self.GENEL_KURUL_ENDPOINT, self._build_genel_kurul_form_data, params
             )
-            response.raise_for_status()
-            response_json = response.json()
             
             # Parse response
             decisions = []
@@ -421,30 +428,12 @@ class SayistayApiClient:
         Returns:
             TemyizKuruluSearchResponse with matching decisions
         """
-        # Initialize session if needed
-        if 'temyiz_kurulu' not in self.csrf_tokens:
-            if not await self._initialize_session_for_endpoint('temyiz_kurulu'):
-                raise Exception("Failed to initialize session for Temyiz Kurulu endpoint")
-        
-        form_data = self._build_temyiz_kurulu_form_data(params)
-        encoded_data = urlencode(form_data, encoding='utf-8')
-        
         logger.info(f"Searching Temyiz Kurulu decisions with parameters: {params.model_dump(exclude_none=True)}")
         
         try:
-            # Update headers with cookies
-            headers = self.http_client.headers.copy()
-            if self.session_cookies:
-                cookie_header = "; ".join([f"{k}={v}" for k, v in self.session_cookies.items()])
-                headers["Cookie"] = cookie_header
-            
-            response = await self.http_client.post(
-                self.TEMYIZ_KURULU_ENDPOINT,
-                data=encoded_data,
-                headers=headers
+            response_json = await self._post_search(
+                'temyiz_kurulu', self.TEMYIZ_KURULU_ENDPOINT, self._build_temyiz_kurulu_form_data, params
             )
-            response.raise_for_status()
-            response_json = response.json()
             
             # Parse response
             decisions = []
@@ -480,30 +469,12 @@ class SayistayApiClient:
         Returns:
             DaireSearchResponse with matching decisions
         """
-        # Initialize session if needed
-        if 'daire' not in self.csrf_tokens:
-            if not await self._initialize_session_for_endpoint('daire'):
-                raise Exception("Failed to initialize session for Daire endpoint")
-        
-        form_data = self._build_daire_form_data(params)
-        encoded_data = urlencode(form_data, encoding='utf-8')
-        
         logger.info(f"Searching Daire decisions with parameters: {params.model_dump(exclude_none=True)}")
         
         try:
-            # Update headers with cookies
-            headers = self.http_client.headers.copy()
-            if self.session_cookies:
-                cookie_header = "; ".join([f"{k}={v}" for k, v in self.session_cookies.items()])
-                headers["Cookie"] = cookie_header
-            
-            response = await self.http_client.post(
-                self.DAIRE_ENDPOINT,
-                data=encoded_data,
-                headers=headers
+            response_json = await self._post_search(
+                'daire', self.DAIRE_ENDPOINT, self._build_daire_form_data, params
             )
-            response.raise_for_status()
-            response_json = response.json()
             
             # Parse response
             decisions = []
@@ -546,7 +517,7 @@ class SayistayApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             result = md_converter.convert(html_stream)
             markdown_content = result.text_content
             
@@ -611,11 +582,6 @@ class SayistayApiClient:
                 "Sec-Fetch-Site": "same-origin"
             }
             
-            # Include session cookies if available
-            if self.session_cookies:
-                cookie_header = "; ".join([f"{k}={v}" for k, v in self.session_cookies.items()])
-                headers["Cookie"] = cookie_header
-            
             response = await self.http_client.get(document_url, headers=headers)
             response.raise_for_status()
             html_content = response.text
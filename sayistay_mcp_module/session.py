@@ -0,0 +1,137 @@
+# sayistay_mcp_module/session.py
+
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+
+from lazy_imports import lazy_import
+
+bs4 = lazy_import("bs4")
+
+logger = logging.getLogger(__name__)
+
+# ASP.NET sessions expire after 20 minutes of inactivity by default
+SESSION_MAX_AGE = float(os.getenv("SAYISTAY_SESSION_MAX_AGE", "900"))
+# Fraction of the max age after which the token is refreshed in the background
+SESSION_REFRESH_AHEAD = 0.8
+
+
+class SessionInitError(Exception):
+    """Raised when a search page does not yield a CSRF token."""
+
+
+class SayistaySessionManager:
+    """
+    CSRF tokens of the Sayıştay search pages, one per endpoint.
+
+    Each endpoint is initialized by a single request even when many searches
+    start at once: concurrent callers await the same in-flight
+    initialization. Tokens older than SESSION_REFRESH_AHEAD * max_age are
+    refreshed in the background while the current one is still used, and
+    tokens older than max_age are refreshed before use. The session cookie
+    lives in the httpx client's cookie jar, which sends it automatically.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, pages: Dict[str, str], max_age: float = SESSION_MAX_AGE):
+        """
+        Initialize session manager.
+
+        Args:
+            http_client: Client whose cookie jar holds the session cookie
+            pages: Endpoint type -> search page path that issues the CSRF token
+            max_age: Seconds after which a token is no longer used without refreshing
+        """
+        self.http_client = http_client
+        self.pages = pages
+        self.max_age = max_age
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+        self.initializations = 0
+        self.background_refreshes = 0
+        self.invalidations = 0
+
+    def _age(self, endpoint_type: str) -> Optional[float]:
+        entry = self._tokens.get(endpoint_type)
+        return None if entry is None else time.monotonic() - entry[1]
+
+    async def get_token(self, endpoint_type: str) -> str:
+        """
+        Get a valid CSRF token for an endpoint, initializing the session if needed.
+
+        Raises:
+            ValueError: If the endpoint type is unknown
+            SessionInitError: If the search page did not contain a token
+            httpx.HTTPError: If the search page could not be fetched
+        """
+        if endpoint_type not in self.pages:
+            raise ValueError(f"Invalid endpoint type: {endpoint_type}. Must be one of: {list(self.pages)}")
+        age = self._age(endpoint_type)
+        if age is not None and age < self.max_age:
+            if age >= self.max_age * SESSION_REFRESH_AHEAD and not self._is_pending(endpoint_type):
+                self.background_refreshes += 1
+                self._start_initialization(endpoint_type)
+            return self._tokens[endpoint_type][0]
+        # Shield so one caller's cancellation does not fail the others waiting on it
+        return await asyncio.shield(self._start_initialization(endpoint_type))
+
+    def invalidate(self, endpoint_type: str, token: str):
+        """
+        Drop a token the server rejected.
+
+        Only the token the caller actually used is dropped, so when several
+        searches fail on the same expired session it is re-initialized once.
+        """
+        entry = self._tokens.get(endpoint_type)
+        if entry is not None and entry[0] == token:
+            del self._tokens[endpoint_type]
+            self.invalidations += 1
+            logger.info(f"Sayıştay session for {endpoint_type} expired; re-initializing")
+
+    def _is_pending(self, endpoint_type: str) -> bool:
+        task = self._pending.get(endpoint_type)
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    def _start_initialization(self, endpoint_type: str) -> asyncio.Task:
+        if self._is_pending(endpoint_type):
+            return self._pending[endpoint_type]
+        # Run in an empty context: the task is shared by every caller and may
+        # outlive the one that started it, so it must not inherit its deadline
+        task = asyncio.get_running_loop().create_task(self._initialize(endpoint_type), context=contextvars.Context())
+        # Retrieve the exception of background refreshes nobody awaits
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._pending[endpoint_type] = task
+        return task
+
+    async def _initialize(self, endpoint_type: str) -> str:
+        page_url = self.pages[endpoint_type]
+        logger.info(f"Initializing session for {endpoint_type} endpoint: {page_url}")
+        response = await self.http_client.get(page_url)
+        response.raise_for_status()
+
+        soup = bs4.BeautifulSoup(response.text, 'html.parser')
+        csrf_input = soup.find('input', {'name': '__RequestVerificationToken'})
+        if not csrf_input or not csrf_input.get('value'):
+            raise SessionInitError(f"CSRF token not found in {endpoint_type} page")
+
+        self._tokens[endpoint_type] = (csrf_input['value'], time.monotonic())
+        self.initializations += 1
+        logger.info(f"Extracted CSRF token for {endpoint_type}")
+        return csrf_input['value']
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "endpoints": {
+                endpoint_type: {"age_s": round(self._age(endpoint_type), 1)}
+                for endpoint_type in self._tokens
+            },
+            "max_age_s": self.max_age,
+            "initializations": self.initializations,
+            "background_refreshes": self.background_refreshes,
+            "invalidations": self.invalidations,
+        }
@@ -1,7 +1,38 @@
 # semantic_search/__init__.py
 
-from .embedder import OpenRouterEmbedder, is_openrouter_available
-from .vector_store import VectorStore
-from .processor import DocumentProcessor
+import importlib
+import os
 
-__all__ = ['OpenRouterEmbedder', 'is_openrouter_available', 'VectorStore', 'DocumentProcessor']
+
+def is_openrouter_available() -> bool:
+    """Check if OpenRouter API key is available."""
+    return bool(os.getenv("OPENROUTER_API_KEY"))
+
+
+# The submodules import numpy; resolve exported classes on first access so that
+# checking availability does not load them
+_LAZY_EXPORTS = {
+    'OpenRouterEmbedder': '.embedder',
+    'VectorStore': '.vector_store',
+    'MetadataFilter': '.vector_store',
+    'DocumentProcessor': '.processor',
+    'PreviewCache': '.cache',
+    'EmbeddingCache': '.cache',
+    'ResultCache': '.cache',
+    'load_snapshot': '.snapshot',
+    'save_snapshot': '.snapshot',
+    'EmbeddingPipeline': '.pipeline',
+    'EmbeddingDispatcher': '.dispatcher',
+    'BackgroundIngestor': '.ingest',
+    'ShardPool': '.sharding',
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
+
+
+__all__ = ['is_openrouter_available'] + list(_LAZY_EXPORTS)
@@ -0,0 +1,463 @@
+# semantic_search/benchmark.py
+"""
+Offline retrieval-quality vs latency benchmark for semantic search.
+
+Runs a fixed set of Turkish legal queries with judged relevant documentIds
+against a recorded corpus and reports recall@k, nDCG@k, p50/p95 latency,
+embedding count and vector store memory for each configuration.
+
+Usage:
+    # 1. Record candidate decisions from Bedesten for every benchmark query
+    python -m semantic_search.benchmark record --out corpus.json
+
+    # 2. Review relevance: "relevant" is pre-filled from each query's
+    #    relevant_terms; edit the documentId lists in corpus.json by hand
+
+    # 3. Compare configurations (requires OPENROUTER_API_KEY)
+    python -m semantic_search.benchmark run --corpus corpus.json --top-k 10 \
+        --embedding-cache embeddings.npz
+
+Queries without relevance judgments are still timed but excluded from
+recall/nDCG averages. Embeddings are cached per prompt text across
+configurations (and across runs with --embedding-cache), so latency
+includes API time only for texts that were not embedded before.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+from .cache import EmbeddingCache, PreviewCache
+from .processor import DocumentProcessor
+from .rerank import fuse_with_upstream_order, turkish_lower
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERIES_PATH = Path(__file__).with_name("benchmark_queries.json")
+
+
+@dataclass
+class BenchmarkConfig:
+    """One retrieval configuration to evaluate."""
+    name: str
+    chunk_size: int = 1500
+    chunk_overlap: int = 300
+    threshold: Optional[float] = 0.3
+    dimension: int = 3072
+    max_chars: int = 3000
+    # Fetch and embed in full only the top N of the first stage, which scores
+    # candidate headers (plus cached previews) and blends them with the
+    # upstream order (search_bedesten_semantic's shortlist); None ranks every candidate
+    shortlist: Optional[int] = None
+    # Fraction of candidates with a cached preview in the first stage
+    preview_coverage: float = 0.0
+
+
+# Production settings first, then single-parameter variations
+DEFAULT_CONFIGS = [
+    BenchmarkConfig(name="baseline"),
+    BenchmarkConfig(name="shortlist-cold", shortlist=20),
+    BenchmarkConfig(name="shortlist-half-warm", shortlist=20, preview_coverage=0.5),
+    BenchmarkConfig(name="shortlist-warm", shortlist=20, preview_coverage=1.0),
+    BenchmarkConfig(name="shortlist-10-cold", shortlist=10),
+    BenchmarkConfig(name="no-threshold", threshold=None),
+    BenchmarkConfig(name="chunk-1000", chunk_size=1000, chunk_overlap=200),
+    BenchmarkConfig(name="no-overlap", chunk_overlap=0),
+    BenchmarkConfig(name="dim-1536", dimension=1536),
+    BenchmarkConfig(name="dim-768", dimension=768),
+    BenchmarkConfig(name="chars-6000", max_chars=6000),
+]
+
+
+def recall_at_k(ranked_ids: List[str], relevant: List[str], k: int) -> float:
+    """Fraction of relevant documents found in the top k."""
+    if not relevant:
+        return 0.0
+    return len(set(ranked_ids[:k]) & set(relevant)) / len(relevant)
+
+
+def ndcg_at_k(ranked_ids: List[str], relevant: List[str], k: int) -> float:
+    """Binary-gain normalized discounted cumulative gain at k."""
+    if not relevant:
+        return 0.0
+    relevant_set = set(relevant)
+    dcg = sum(
+        1.0 / math.log2(rank + 2)
+        for rank, doc_id in enumerate(ranked_ids[:k])
+        if doc_id in relevant_set
+    )
+    ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant_set), k)))
+    return dcg / ideal if ideal > 0 else 0.0
+
+
+def truncate_embeddings(embeddings: np.ndarray, dimension: int) -> np.ndarray:
+    """Truncate Matryoshka-style embeddings to a smaller dimension and re-normalize."""
+    if embeddings.shape[-1] <= dimension:
+        return embeddings
+    truncated = embeddings[..., :dimension]
+    norms = np.linalg.norm(truncated, axis=-1, keepdims=True)
+    return truncated / (norms + 1e-8)
+
+
+def judge_by_terms(markdown: str, relevant_terms: List[List[str]]) -> bool:
+    """
+    Rule-based relevance: a decision is relevant if it contains every term
+    of at least one group in relevant_terms.
+    """
+    text = turkish_lower(" ".join(markdown.split()))
+    return any(all(turkish_lower(term) in text for term in group) for group in relevant_terms)
+
+
+class CachingEmbedder:
+    """
+    Embedder wrapper that caches vectors per prompt text.
+
+    Every configuration embeds the same texts many times over (only the
+    threshold, dimension or shortlist differs), so each prompt is sent to
+    the API once. The cache can be saved to and loaded from an .npz file.
+    """
+
+    def __init__(self, embedder, cache_path: Optional[str] = None):
+        """
+        Initialize the wrapper.
+
+        Args:
+            embedder: Object with format_query / format_document / embed_texts (e.g. OpenRouterEmbedder)
+            cache_path: Optional .npz file the cache is loaded from and saved to
+        """
+        self.embedder = embedder
+        self.cache_path = cache_path
+        self.cache = EmbeddingCache(max_entries=10_000_000)
+        self.api_embeddings = 0
+        if cache_path and Path(cache_path).exists():
+            with np.load(cache_path) as data:
+                self.cache.load_items([str(k) for k in data["keys"]], data["vectors"])
+            logger.info(f"Loaded {len(self.cache)} cached embeddings from {cache_path}")
+
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def _embed(self, prompts: List[str]) -> np.ndarray:
+        keys = [self._key(prompt) for prompt in prompts]
+        missing = {key: prompt for key, prompt in zip(keys, prompts) if key not in self.cache}
+        if missing:
+            vectors = self.embedder.embed_texts(list(missing.values()))
+            for key, vector in zip(missing, vectors):
+                self.cache.put(key, vector)
+            self.api_embeddings += len(missing)
+        return np.vstack([self.cache.get(key) for key in keys])
+
+    def encode_query(self, query: str, task: str = "search result") -> np.ndarray:
+        return self._embed([self.embedder.format_query(query, task)])[0]
+
+    def encode_documents(self, documents: List[str], titles: Optional[List[str]] = None) -> np.ndarray:
+        if not documents:
+            return np.empty((0, self.embedder.dimension), dtype=np.float32)
+        return self._embed([
+            self.embedder.format_document(doc, titles[i] if titles and i < len(titles) else None)
+            for i, doc in enumerate(documents)
+        ])
+
+    def save(self):
+        """Write the cache to cache_path, if one was given."""
+        if not self.cache_path:
+            return
+        keys, vectors = self.cache.export_items()
+        np.savez(self.cache_path, keys=np.asarray(keys), vectors=vectors)
+        logger.info(f"Saved {len(keys)} cached embeddings to {self.cache_path}")
+
+
+def has_preview(doc_id: str, coverage: float) -> bool:
+    """Deterministically pick the candidates that have a cached preview."""
+    if coverage <= 0:
+        return False
+    bucket = int(hashlib.md5(doc_id.encode("utf-8")).hexdigest()[:8], 16) / 0xFFFFFFFF
+    return bucket < coverage
+
+
+def load_corpus(path: str) -> Dict[str, Any]:
+    """Load a recorded corpus file."""
+    with open(path, encoding="utf-8") as f:
+        corpus = json.load(f)
+    if "queries" not in corpus or "documents" not in corpus:
+        raise ValueError(f"{path} is not a benchmark corpus (missing 'queries' or 'documents')")
+    return corpus
+
+
+def run_config(config: BenchmarkConfig,
+               corpus: Dict[str, Any],
+               embedder,
+               top_k: int = 10) -> Dict[str, Any]:
+    """
+    Evaluate one configuration over every query in the corpus.
+
+    Args:
+        config: Configuration to evaluate
+        corpus: Recorded corpus (see load_corpus)
+        embedder: Object with encode_query / encode_documents (e.g. CachingEmbedder)
+        top_k: Cutoff for ranking metrics
+
+    Returns:
+        Aggregated metrics for the configuration
+    """
+    processor = DocumentProcessor(chunk_size=config.chunk_size, chunk_overlap=config.chunk_overlap)
+    documents = corpus["documents"]
+
+    latencies = []
+    recalls = []
+    ndcgs = []
+    embedding_count = 0
+    fetched = []
+    memory_mb = []
+    preview_chars = PreviewCache().preview_chars
+
+    for query in corpus["queries"]:
+        start = time.perf_counter()
+        query_embedding = truncate_embeddings(embedder.encode_query(query["query"]), config.dimension)
+        embedding_count += 1
+
+        candidate_ids = [doc_id for doc_id in query.get("candidates", []) if documents.get(doc_id, {}).get("markdown")]
+        if config.shortlist and len(candidate_ids) > config.shortlist:
+            # First stage as in search_bedesten_semantic: every candidate is scored
+            # on its header plus cached preview, blended with the upstream order
+            candidate_texts = []
+            for doc_id in candidate_ids:
+                record = documents[doc_id]
+                preview = None
+                if has_preview(doc_id, config.preview_coverage):
+                    chunks = processor.process_document(doc_id, record["markdown"], dict(record.get("metadata", {})))
+                    preview = " ".join(chunk.text for chunk in chunks)[:preview_chars]
+                candidate_texts.append(processor.build_candidate_text(record.get("metadata", {}), preview))
+
+            candidate_embeddings = truncate_embeddings(embedder.encode_documents(candidate_texts), config.dimension)
+            embedding_count += len(candidate_texts)
+            candidate_store = VectorStore(dimension=config.dimension)
+            candidate_store.add_documents(
+                ids=candidate_ids,
+                texts=candidate_texts,
+                embeddings=candidate_embeddings,
+                metadata=[documents[doc_id].get("metadata", {}) for doc_id in candidate_ids]
+            )
+            scored_ids = [doc.id for doc, _ in candidate_store.search(query_embedding, top_k=len(candidate_ids))]
+            candidate_ids = fuse_with_upstream_order(candidate_ids, scored_ids)[:config.shortlist]
+
+        ids, texts, metadatas = [], [], []
+        for doc_id in candidate_ids:
+            record = documents[doc_id]
+            chunks = processor.process_document(doc_id, record["markdown"], dict(record.get("metadata", {})))
+            if not chunks:
+                continue
+            ids.append(doc_id)
+            texts.append(" ".join(chunk.text for chunk in chunks)[:config.max_chars])
+            metadatas.append(record.get("metadata", {}))
+        fetched.append(len(candidate_ids))
+
+        ranked_ids: List[str] = []
+        if ids:
+            titles = [m.get("birim_adi") or "none" for m in metadatas]
+            doc_embeddings = truncate_embeddings(embedder.encode_documents(texts, titles=titles), config.dimension)
+            embedding_count += len(texts)
+
+            store = VectorStore(dimension=config.dimension)
+            store.add_documents(ids=ids, texts=texts, embeddings=doc_embeddings, metadata=metadatas)
+            results = store.search(query_embedding, top_k=top_k, threshold=config.threshold)
+            ranked_ids = [doc.id for doc, _ in results]
+            memory_mb.append(store.get_stats()["memory_usage_mb"])
+
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        relevant = query.get("relevant", [])
+        if relevant:
+            recalls.append(recall_at_k(ranked_ids, relevant, top_k))
+            ndcgs.append(ndcg_at_k(ranked_ids, relevant, top_k))
+
+    return {
+        "config": asdict(config),
+        "queries": len(corpus["queries"]),
+        "judged_queries": len(recalls),
+        f"recall@{top_k}": round(float(np.mean(recalls)), 4) if recalls else None,
+        f"ndcg@{top_k}": round(float(np.mean(ndcgs)), 4) if ndcgs else None,
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 1) if latencies else None,
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 1) if latencies else None,
+        "embedding_count": embedding_count,
+        "avg_documents_fetched": round(float(np.mean(fetched)), 1) if fetched else 0.0,
+        "avg_store_memory_mb": round(float(np.mean(memory_mb)), 3) if memory_mb else 0.0,
+    }
+
+
+async def record_corpus(queries_path: str, out_path: str, per_query: int = 100) -> Dict[str, Any]:
+    """
+    Record candidate decisions for every benchmark query from Bedesten.
+
+    Candidates are interleaved by rank across court types, which is the
+    upstream order search_bedesten_semantic sees. Existing relevance
+    judgments in out_path are preserved; unjudged queries get "relevant"
+    filled from their relevant_terms.
+
+    Args:
+        queries_path: Benchmark queries file
+        out_path: Corpus file to write
+        per_query: Maximum candidates recorded per query
+
+    Returns:
+        The recorded corpus
+    """
+    from bedesten_mcp_module.client import BedestenApiClient
+    from bedesten_mcp_module.models import BedestenSearchRequest, BedestenSearchData
+
+    with open(queries_path, encoding="utf-8") as f:
+        queries = json.load(f)["queries"]
+
+    corpus: Dict[str, Any] = {"queries": [], "documents": {}}
+    if Path(out_path).exists():
+        corpus = load_corpus(out_path)
+    judged = {q["id"]: q.get("relevant", []) for q in corpus["queries"]}
+    corpus["queries"] = []
+
+    client = BedestenApiClient()
+    try:
+        for query in queries:
+            court_types = query.get("court_types") or ["YARGITAYKARARI", "DANISTAYKARAR", "YERELHUKUK", "ISTINAFHUKUK", "KYB"]
+            per_court: List[List[str]] = []
+            for court_type in court_types:
+                try:
+                    response = await client.search_documents(
+                        BedestenSearchRequest(
+                            data=BedestenSearchData(
+                                phrase=query["initial_keyword"],
+                                itemTypeList=[court_type],
+                                pageSize=max(20, per_query // len(court_types)),
+                                pageNumber=1
+                            )
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(f"Search failed for {query['id']} / {court_type}: {e}")
+                    continue
+                if not response.data:
+                    continue
+                per_court.append([decision.documentId for decision in response.data.emsalKararList])
+                for decision in response.data.emsalKararList:
+                    corpus["documents"].setdefault(decision.documentId, {}).update({
+                        "metadata": {
+                            "document_id": decision.documentId,
+                            "birim_adi": decision.birimAdi,
+                            "esas_no": decision.esasNo,
+                            "karar_no": decision.kararNo,
+                            "karar_tarihi": decision.kararTarihiStr,
+                            "karar_turu": decision.kararTuru,
+                            "court_type": decision.itemType.name if decision.itemType else None
+                        }
+                    })
+
+            candidates = [
+                ids[rank] for rank in range(max(map(len, per_court), default=0))
+                for ids in per_court if rank < len(ids)
+            ][:per_query]
+            for doc_id in candidates:
+                record = corpus["documents"][doc_id]
+                if record.get("markdown"):
+                    continue
+                try:
+                    doc = await client.get_document_as_markdown(doc_id)
+                    record["markdown"] = doc.markdown_content
+                except Exception as e:
+                    logger.warning(f"Failed to record document {doc_id}: {e}")
+
+            relevant = judged.get(query["id"]) or query.get("relevant") or [
+                doc_id for doc_id in candidates
+                if corpus["documents"][doc_id].get("markdown")
+                and judge_by_terms(corpus["documents"][doc_id]["markdown"], query.get("relevant_terms", []))
+            ]
+            corpus["queries"].append({
+                **query,
+                "relevant": relevant,
+                "candidates": candidates
+            })
+            logger.info(f"Recorded {len(candidates)} candidates for query {query['id']}")
+    finally:
+        await client.close_client_session()
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=1)
+    return corpus
+
+
+def format_report(results: List[Dict[str, Any]], top_k: int) -> str:
+    """Format benchmark results as a plain-text table."""
+    headers = ["config", f"recall@{top_k}", f"ndcg@{top_k}", "p50_ms", "p95_ms", "embeddings", "fetched", "mem_mb"]
+    rows = [
+        [
+            r["config"]["name"],
+            "-" if r[f"recall@{top_k}"] is None else f"{r[f'recall@{top_k}']:.4f}",
+            "-" if r[f"ndcg@{top_k}"] is None else f"{r[f'ndcg@{top_k}']:.4f}",
+            f"{r['latency_p50_ms']}",
+            f"{r['latency_p95_ms']}",
+            f"{r['embedding_count']}",
+            f"{r['avg_documents_fetched']}",
+            f"{r['avg_store_memory_mb']}",
+        ]
+        for r in results
+    ]
+    widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)) for row in [headers] + rows]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Semantic search retrieval-quality vs latency benchmark")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record a corpus from Bedesten")
+    record_parser.add_argument("--queries", default=str(DEFAULT_QUERIES_PATH), help="Benchmark queries file")
+    record_parser.add_argument("--out", required=True, help="Corpus file to write")
+    record_parser.add_argument("--per-query", type=int, default=100, help="Candidates recorded per query")
+
+    run_parser = subparsers.add_parser("run", help="Evaluate configurations against a recorded corpus")
+    run_parser.add_argument("--corpus", required=True, help="Recorded corpus file")
+    run_parser.add_argument("--top-k", type=int, default=10, help="Ranking cutoff")
+    run_parser.add_argument("--configs", help="JSON file with a list of BenchmarkConfig fields (default: built-in grid)")
+    run_parser.add_argument("--json", help="Also write results as JSON to this path")
+    run_parser.add_argument("--embedding-cache", help=".npz file caching embeddings across runs")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == "record":
+        asyncio.run(record_corpus(args.queries, args.out, per_query=args.per_query))
+        return
+
+    from .embedder import OpenRouterEmbedder
+
+    corpus = load_corpus(args.corpus)
+    if args.configs:
+        with open(args.configs, encoding="utf-8") as f:
+            configs = [BenchmarkConfig(**c) for c in json.load(f)]
+    else:
+        configs = DEFAULT_CONFIGS
+
+    embedder = CachingEmbedder(OpenRouterEmbedder(), cache_path=args.embedding_cache)
+    try:
+        results = [run_config(config, corpus, embedder, top_k=args.top_k) for config in configs]
+    finally:
+        embedder.save()
+    logger.info(f"Embedded {embedder.api_embeddings} new texts through the API")
+
+    print(format_report(results, args.top_k))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
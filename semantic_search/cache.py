@@ -0,0 +1,232 @@
+# semantic_search/cache.py
+
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewCache:
+    """
+    Bounded LRU cache of short document previews keyed by document ID.
+
+    Previews are cheap, already-cleaned snippets of decisions that were fetched
+    in full at some point. They let later queries score a candidate without
+    downloading the whole document again.
+    """
+
+    def __init__(self, max_entries: int = 5000, preview_chars: int = 500):
+        """
+        Initialize preview cache.
+
+        Args:
+            max_entries: Maximum number of previews kept before evicting the oldest
+            preview_chars: Number of characters stored per preview
+        """
+        self.max_entries = max_entries
+        self.preview_chars = preview_chars
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, document_id: str) -> Optional[str]:
+        """Get the cached preview for a document, if any."""
+        preview = self._entries.get(document_id)
+        if preview is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(document_id)
+        self.hits += 1
+        return preview
+
+    def put(self, document_id: str, text: str):
+        """Store a preview built from the given document text."""
+        if not document_id or not text:
+            return
+        self._entries[document_id] = text[:self.preview_chars]
+        self._entries.move_to_end(document_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def export_items(self) -> Dict[str, str]:
+        """Export cached previews, oldest first."""
+        return dict(self._entries)
+
+    def load_items(self, items: Dict[str, str]):
+        """Load previews (e.g. from a snapshot) on top of the current entries."""
+        for document_id, preview in items.items():
+            self.put(document_id, preview)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the cache."""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of embedding vectors keyed by the exact prompt text.
+
+    Used for query embeddings, which repeat often (agents retry and rephrase
+    around the same questions) and are cheap to keep.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize embedding cache.
+
+        Args:
+            max_entries: Maximum number of vectors kept before evicting the oldest
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a cached embedding, if any."""
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        """Store an embedding."""
+        self._entries[key] = np.asarray(vector, dtype=np.float32)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def export_items(self) -> Tuple[List[str], np.ndarray]:
+        """Export cached keys and a stacked vector matrix, oldest first."""
+        keys = list(self._entries.keys())
+        if not keys:
+            return keys, np.empty((0, 0), dtype=np.float32)
+        return keys, np.vstack([self._entries[k] for k in keys])
+
+    def load_items(self, keys: List[str], vectors: np.ndarray):
+        """Load embeddings (e.g. from a snapshot) on top of the current entries."""
+        for key, vector in zip(keys, vectors):
+            self.put(key, vector)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the cache."""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of final semantic search responses with a TTL.
+
+    Agents retry after tool timeouts with the same arguments; a repeat query
+    is answered from here instead of re-running the fetch/embed pipeline.
+    Keys are built from normalized tool inputs plus a ranking version, so
+    entries produced by an older model or ranking configuration never match.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 600.0):
+        """
+        Initialize result cache.
+
+        Args:
+            max_entries: Maximum number of responses kept before evicting the oldest
+            ttl_seconds: Seconds a response stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(version: str, *parts: Any) -> str:
+        """
+        Build a cache key from a version string and tool inputs.
+
+        Strings are whitespace-collapsed, lists and sets are de-duplicated and
+        sorted, so trivially different spellings of the same request share an
+        entry. Tuples are order-sensitive sequences: their items are
+        whitespace-collapsed but keep their order and boundaries.
+        """
+        normalized = [version]
+        for part in parts:
+            if isinstance(part, tuple):
+                normalized.append(json.dumps([" ".join(str(p).split()) for p in part], ensure_ascii=False))
+            elif isinstance(part, (list, set)):
+                normalized.append(json.dumps(sorted({str(p).strip() for p in part}), ensure_ascii=False))
+            elif isinstance(part, str):
+                normalized.append(" ".join(part.split()))
+            else:
+                normalized.append(str(part))
+        return "|".join(normalized)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached response, if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(response)
+
+    def put(self, key: str, response: Dict[str, Any]):
+        """Store a copy of a response, so later changes by the caller do not leak in."""
+        self._entries[key] = (time.monotonic(), copy.deepcopy(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the cache."""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired
+        }
@@ -0,0 +1,187 @@
+# semantic_search/dedup.py
+
+import logging
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Set
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime used for the universal hash permutations
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index for spotting near-identical decision texts.
+
+    The same matter is often published by several courts (YERELHUKUK,
+    ISTINAFHUKUK, YARGITAYKARARI) with nearly identical text. Each document's
+    MinHash signature is computed once, when its markdown is first seen, and
+    banded into LSH buckets so duplicate checks are a few dictionary lookups
+    instead of text comparisons.
+    """
+
+    def __init__(self,
+                 num_perm: int = 128,
+                 bands: int = 16,
+                 shingle_size: int = 5,
+                 threshold: float = 0.8,
+                 max_entries: int = 20000,
+                 seed: int = 1):
+        """
+        Initialize near-duplicate index.
+
+        Args:
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; num_perm must be divisible by it
+            shingle_size: Words per shingle
+            threshold: Estimated Jaccard similarity at which two texts count as duplicates
+            max_entries: Maximum number of signatures kept before evicting the oldest
+            seed: Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.max_entries = max_entries
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+        self._signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        # Documents are added from conversion worker threads as well as the event loop
+        self._lock = threading.Lock()
+
+    def _shingles(self, text: str) -> Set[str]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if len(tokens) < self.shingle_size:
+            return set(tokens)
+        return {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text.
+
+        Returns:
+            uint32 signature of length num_perm, or None for texts without words
+        """
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def add(self, doc_id: str, text: Optional[str]) -> bool:
+        """
+        Index a document's text. Documents already indexed are not re-hashed.
+
+        Returns:
+            True if the document was newly indexed
+        """
+        if not doc_id or not text or doc_id in self._signatures:
+            return False
+        signature = self.signature(text)
+        if signature is None:
+            return False
+
+        with self._lock:
+            if doc_id in self._signatures:
+                return False
+            self._signatures[doc_id] = signature
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(doc_id)
+
+            while len(self._signatures) > self.max_entries:
+                evicted_id, evicted = self._signatures.popitem(last=False)
+                for key in self._band_keys(evicted):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(evicted_id)
+                        if not bucket:
+                            del self._buckets[key]
+        return True
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def similarity(self, first_id: str, second_id: str) -> Optional[float]:
+        """Estimated Jaccard similarity of two indexed documents, or None if either is unknown."""
+        first = self._signatures.get(first_id)
+        second = self._signatures.get(second_id)
+        if first is None or second is None:
+            return None
+        return float(np.mean(first == second))
+
+    def duplicates_of(self, doc_id: str) -> List[str]:
+        """Indexed documents that are near-duplicates of the given document."""
+        with self._lock:
+            signature = self._signatures.get(doc_id)
+            if signature is None:
+                return []
+            candidates: Set[str] = set()
+            for key in self._band_keys(signature):
+                candidates |= self._buckets.get(key, set())
+            candidates.discard(doc_id)
+            return [
+                candidate for candidate in candidates
+                if np.mean(self._signatures[candidate] == signature) >= self.threshold
+            ]
+
+    def find_duplicate(self, doc_id: str, among: Iterable[str]) -> Optional[str]:
+        """Return the first document in `among` that is a near-duplicate of doc_id, if any."""
+        duplicates = set(self.duplicates_of(doc_id))
+        if not duplicates:
+            return None
+        for other_id in among:
+            if other_id in duplicates:
+                return other_id
+        return None
+
+    def collapse(self, ranked_ids: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Collapse near-duplicates in a ranked list, keeping the best-ranked copy.
+
+        Documents that were never indexed are always kept.
+
+        Returns:
+            (kept ids in rank order, kept id -> ids of collapsed duplicates)
+        """
+        kept: List[str] = []
+        collapsed: Dict[str, List[str]] = {}
+        for doc_id in ranked_ids:
+            original = self.find_duplicate(doc_id, kept)
+            if original is None:
+                kept.append(doc_id)
+            else:
+                collapsed.setdefault(original, []).append(doc_id)
+        return kept, collapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the index."""
+        return {
+            'documents': len(self._signatures),
+            'max_entries': self.max_entries,
+            'buckets': len(self._buckets),
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'threshold': self.threshold
+        }
@@ -0,0 +1,167 @@
+# semantic_search/dispatcher.py
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Set, Tuple
+import numpy as np
+
+from .embedder import OpenRouterEmbedder
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingDispatcher:
+    """
+    Shared micro-batcher for embedding calls.
+
+    Concurrent callers (queries and document batches from different tool
+    invocations) are collected for a few milliseconds, up to a size cap, and
+    sent to the provider as one batched request. The resulting vectors are
+    fanned back out to each caller; if a combined call fails, each caller's
+    texts are retried on their own so one bad input fails only its caller.
+    A semaphore bounds in-flight API calls to stay under provider rate
+    limits at peak.
+    """
+
+    def __init__(self,
+                 embedder: OpenRouterEmbedder,
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0,
+                 max_concurrent_calls: int = 4):
+        """
+        Initialize dispatcher.
+
+        Args:
+            embedder: Embedder used for the actual API calls
+            max_batch_size: Maximum texts per API call
+            max_wait_ms: How long to wait for more requests before sending a partial batch
+            max_concurrent_calls: Maximum embedding API calls in flight
+        """
+        self.embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_texts = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Strong references to in-flight send tasks; the loop only keeps weak ones
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.api_calls = 0
+        self.texts_sent = 0
+        self.split_retries = 0
+
+    @property
+    def dimension(self) -> int:
+        return self.embedder.dimension
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed prompt-formatted texts, batched together with concurrent callers.
+
+        Args:
+            texts: Prompt-formatted texts
+
+        Returns:
+            L2-normalized embeddings (N x dimension)
+        """
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+        self.requests += 1
+
+        if self._pending_texts >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def encode_query(self, query: str, task: str = "search result") -> np.ndarray:
+        """Encode a search query (see OpenRouterEmbedder.encode_query)."""
+        embeddings = await self.embed_texts([self.embedder.format_query(query, task)])
+        return embeddings[0]
+
+    async def encode_documents(self, documents: List[str], titles: Optional[List[str]] = None) -> np.ndarray:
+        """Encode documents (see OpenRouterEmbedder.encode_documents)."""
+        if not documents:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        texts = [
+            self.embedder.format_document(doc, titles[i] if titles and i < len(titles) else None)
+            for i, doc in enumerate(documents)
+        ]
+        return await self.embed_texts(texts)
+
+    def _flush(self):
+        """Hand all pending requests to a background send task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = []
+        self._pending_texts = 0
+        task = asyncio.get_running_loop().create_task(self._send(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in API calls of at most max_batch_size texts."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+
+        batches = []
+        for start in range(0, len(texts), self.max_batch_size):
+            chunk = texts[start:start + self.max_batch_size]
+            async with self._semaphore:
+                batches.append(await asyncio.to_thread(self.embedder.embed_texts, chunk))
+            self.api_calls += 1
+            self.texts_sent += len(chunk)
+        return np.vstack(batches)
+
+    async def _send(self, pending: List[Tuple[List[str], asyncio.Future]]):
+        """Embed the combined texts of pending requests and resolve their futures."""
+        texts = [text for request_texts, _ in pending for text in request_texts]
+
+        try:
+            embeddings = await self._embed(texts)
+        except Exception as e:
+            if len(pending) == 1:
+                _, future = pending[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            # One caller's bad input must not fail the others: retry each request on its own
+            logger.warning(f"Batched embedding of {len(pending)} requests failed ({e}); retrying them separately")
+            self.split_retries += 1
+            await asyncio.gather(*(self._send([request]) for request in pending))
+            return
+
+        logger.debug(f"Dispatched {len(texts)} texts from {len(pending)} requests")
+
+        offset = 0
+        for request_texts, future in pending:
+            count = len(request_texts)
+            if not future.done():
+                future.set_result(embeddings[offset:offset + count])
+            offset += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            'requests': self.requests,
+            'api_calls': self.api_calls,
+            'texts_sent': self.texts_sent,
+            'avg_texts_per_call': round(self.texts_sent / self.api_calls, 2) if self.api_calls else 0.0,
+            'split_retries': self.split_retries,
+            'pending_texts': self._pending_texts
+        }
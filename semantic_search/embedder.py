@@ -5,12 +5,9 @@ import os
 from typing import List, Optional
 import numpy as np
 
-logger = logging.getLogger(__name__)
-
+from . import is_openrouter_available  # Defined in the package so it can be checked without numpy
 
-def is_openrouter_available() -> bool:
-    """Check if OpenRouter API key is available."""
-    return bool(os.getenv("OPENROUTER_API_KEY"))
+logger = logging.getLogger(__name__)
 
 
 class OpenRouterEmbedder:
@@ -45,24 +42,31 @@ class OpenRouterEmbedder:
 
         logger.info(f"OpenRouter Embedder initialized with model: {self.model}")
 
-    def encode_query(self, query: str, task: str = "search result") -> np.ndarray:
+    def format_query(self, query: str, task: str = "search result") -> str:
+        """Apply the query prompt template."""
+        return f"task: {task} | query: {query}"
+
+    def format_document(self, document: str, title: Optional[str] = None) -> str:
+        """Apply the document prompt template."""
+        return f"title: {title or 'none'} | text: {document}"
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
         """
-        Encode a search query.
+        Embed already-formatted texts with a single API call.
 
         Args:
-            query: The search query text
-            task: Task type for prompt template
+            texts: Prompt-formatted texts (see format_query / format_document)
 
         Returns:
-            Numpy array of embeddings (3072 dimensions)
+            L2-normalized numpy array of embeddings (N x 3072 dimensions)
         """
-        # Apply query prompt template
-        text = f"task: {task} | query: {query}"
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
 
         try:
             response = self.client.embeddings.create(
                 model=self.model,
-                input=text,
+                input=texts,
                 encoding_format="float",
                 extra_headers={
                     "HTTP-Referer": "https://yargimcp.com",
@@ -70,20 +74,38 @@ class OpenRouterEmbedder:
                 }
             )
 
-            embedding = np.array(response.data[0].embedding, dtype=np.float32)
+            # Extract embeddings in order
+            embeddings = np.array(
+                [d.embedding for d in sorted(response.data, key=lambda x: x.index)],
+                dtype=np.float32
+            )
 
-            # L2 normalize for cosine similarity
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+            # L2 normalize each embedding for cosine similarity
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / (norms + 1e-8)
 
-            logger.debug(f"Encoded query: {query[:50]}... -> shape: {embedding.shape}")
-            return embedding
+            logger.debug(f"Embedded {len(texts)} texts -> shape: {embeddings.shape}")
+            return embeddings
 
         except Exception as e:
-            logger.error(f"Failed to encode query: {e}")
+            logger.error(f"Failed to embed texts: {e}")
             raise
 
+    def encode_query(self, query: str, task: str = "search result") -> np.ndarray:
+        """
+        Encode a search query.
+
+        Args:
+            query: The search query text
+            task: Task type for prompt template
+
+        Returns:
+            Numpy array of embeddings (3072 dimensions)
+        """
+        embedding = self.embed_texts([self.format_query(query, task)])[0]
+        logger.debug(f"Encoded query: {query[:50]}... -> shape: {embedding.shape}")
+        return embedding
+
     def encode_documents(self, documents: List[str], titles: Optional[List[str]] = None) -> np.ndarray:
         """
         Encode multiple documents with batch API call.
@@ -96,42 +118,17 @@ class OpenRouterEmbedder:
             Numpy array of embeddings (N x 3072 dimensions)
         """
         if not documents:
-            return np.array([])
+            return np.empty((0, self.dimension), dtype=np.float32)
 
         # Apply document prompt template
         texts = []
         for i, doc in enumerate(documents):
             title = titles[i] if titles and i < len(titles) else "none"
-            text = f"title: {title} | text: {doc}"
-            texts.append(text)
-
-        try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=texts,
-                encoding_format="float",
-                extra_headers={
-                    "HTTP-Referer": "https://yargimcp.com",
-                    "X-Title": "Yargi MCP Server",
-                }
-            )
+            texts.append(self.format_document(doc, title))
 
-            # Extract embeddings in order
-            embeddings = np.array(
-                [d.embedding for d in sorted(response.data, key=lambda x: x.index)],
-                dtype=np.float32
-            )
-
-            # L2 normalize each embedding for cosine similarity
-            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-            embeddings = embeddings / (norms + 1e-8)
-
-            logger.info(f"Encoded {len(documents)} documents -> shape: {embeddings.shape}")
-            return embeddings
-
-        except Exception as e:
-            logger.error(f"Failed to encode documents: {e}")
-            raise
+        embeddings = self.embed_texts(texts)
+        logger.info(f"Encoded {len(documents)} documents -> shape: {embeddings.shape}")
+        return embeddings
 
     def compute_similarity(self, query_embedding: np.ndarray, document_embeddings: np.ndarray) -> np.ndarray:
         """
@@ -0,0 +1,165 @@
+# semantic_search/ingest.py
+
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+import numpy as np
+
+from .processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundIngestor:
+    """
+    Low-priority write-through ingestion of fetched documents.
+
+    Tools that already fetched and converted a decision hand its markdown
+    to submit(), which only enqueues it. A single background task chunks the
+    queued documents off the event loop, embeds them in batches after an
+    idle delay, and passes the vectors to on_embedded (typically appending
+    to the persistent semantic index). Foreground requests are never
+    delayed: the queue is bounded and drops documents when full, and at most
+    one embedding call is in flight for ingestion.
+    """
+
+    def __init__(self,
+                 embed: Callable[[List[str], List[str]], Awaitable[np.ndarray]],
+                 on_embedded: Callable[[List[str], List[str], List[Dict[str, Any]], np.ndarray], None],
+                 processor: Optional[DocumentProcessor] = None,
+                 contains: Optional[Callable[[str], bool]] = None,
+                 batch_size: int = 16,
+                 flush_interval: float = 5.0,
+                 max_queue: int = 500,
+                 max_chars: int = 3000):
+        """
+        Initialize ingestor.
+
+        Args:
+            embed: Async callable embedding (texts, titles) into an N x dimension array
+            on_embedded: Callable receiving (ids, texts, metadata, embeddings) of each embedded batch
+            processor: Processor used to clean and chunk markdown
+            contains: Optional callable telling whether a document is already indexed
+            batch_size: Documents per embedding call
+            flush_interval: Seconds to wait for a full batch before embedding a partial one
+            max_queue: Maximum queued documents; further submissions are dropped
+            max_chars: Characters of cleaned text embedded per document (matches semantic search)
+        """
+        self.embed = embed
+        self.on_embedded = on_embedded
+        self.processor = processor or DocumentProcessor(chunk_size=1500, chunk_overlap=300)
+        self.contains = contains
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_chars = max_chars
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._queued_ids: set = set()
+
+        self.submitted = 0
+        self.ingested = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, document_id: str, markdown: Optional[str], metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Queue a fetched document for ingestion without waiting.
+
+        Must be called from the event loop thread.
+
+        Returns:
+            True if the document was queued
+        """
+        if not document_id or not markdown or document_id in self._queued_ids:
+            return False
+        if self.contains is not None and self.contains(document_id):
+            return False
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        try:
+            self._queue.put_nowait((document_id, markdown, dict(metadata or {}, document_id=document_id)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._queued_ids.add(document_id)
+        self.submitted += 1
+        return True
+
+    def _prepare(self, document_id: str, markdown: str, metadata: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Clean and chunk one document (blocking; runs in a worker thread)."""
+        chunks = self.processor.process_document(document_id=document_id, text=markdown, metadata=metadata)
+        if not chunks:
+            return None
+        return " ".join(chunk.text for chunk in chunks)[:self.max_chars], metadata
+
+    async def _next_batch(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Wait for a full batch, or whatever arrived within flush_interval."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                ids, texts, metadatas = [], [], []
+                for document_id, markdown, metadata in batch:
+                    if self.contains is not None and self.contains(document_id):
+                        continue
+                    prepared = await asyncio.to_thread(self._prepare, document_id, markdown, metadata)
+                    if prepared is None:
+                        continue
+                    ids.append(document_id)
+                    texts.append(prepared[0])
+                    metadatas.append(prepared[1])
+                if not ids:
+                    continue
+
+                titles = [m.get("birim_adi") or "none" for m in metadatas]
+                embeddings = await self.embed(texts, titles)
+                self.on_embedded(ids, texts, metadatas, embeddings)
+                self.ingested += len(ids)
+                logger.info(f"Background ingestion embedded {len(ids)} documents ({self.ingested} total)")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += len(batch)
+                logger.warning(f"Background ingestion batch of {len(batch)} documents failed: {e}")
+            finally:
+                for document_id, _, _ in batch:
+                    self._queued_ids.discard(document_id)
+
+    async def close(self):
+        """Stop the background task; queued documents are discarded."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics."""
+        return {
+            'submitted': self.submitted,
+            'ingested': self.ingested,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'queued': self._queue.qsize() if self._queue is not None else 0
+        }
@@ -0,0 +1,200 @@
+# semantic_search/pipeline.py
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class PipelineResult:
+    """Documents that made it through every pipeline stage, in embedding order."""
+    ids: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+    embeddings: Optional[np.ndarray] = None
+    failed: int = 0
+    skipped: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def get_timings_ms(self) -> Dict[str, float]:
+        """Per-stage timings rounded to milliseconds."""
+        return {stage: round(seconds * 1000, 1) for stage, seconds in self.timings.items()}
+
+
+class EmbeddingPipeline:
+    """
+    Producer/consumer pipeline of fetch -> convert -> embed stages.
+
+    Stages are connected by bounded asyncio queues so documents are converted
+    as soon as they arrive and embedded in micro-batches while later fetches
+    are still in flight. The blocking convert callable runs in worker threads.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[Dict[str, Any]], Awaitable[Any]],
+                 convert: Callable[[Dict[str, Any], Any], Optional[str]],
+                 embed: Callable[[List[str], List[str]], Awaitable[np.ndarray]],
+                 fetch_concurrency: int = 5,
+                 convert_workers: int = 2,
+                 batch_size: int = 8,
+                 batch_timeout: float = 0.25,
+                 queue_size: int = 16,
+                 on_batch: Optional[Callable[[List[str], List[str], List[Dict[str, Any]], np.ndarray], Awaitable[None]]] = None,
+                 stop_fetching: Optional[Callable[[], bool]] = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            fetch: Async callable returning raw content for an item's metadata
+            convert: Blocking callable turning raw content into text to embed (None skips the item)
+            embed: Async callable embedding (texts, titles) into an N x dimension array
+            fetch_concurrency: Number of concurrent fetches
+            convert_workers: Number of concurrent conversions
+            batch_size: Maximum documents per embedding call
+            batch_timeout: Seconds to wait for more documents before flushing a partial batch
+            queue_size: Capacity of each inter-stage buffer
+            on_batch: Optional async callback receiving (ids, texts, metadata, embeddings) of each embedded batch
+            stop_fetching: Optional predicate; once true, items not yet fetched are skipped
+                and the documents already fetched are still converted and embedded
+        """
+        self.fetch = fetch
+        self.convert = convert
+        self.embed = embed
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.convert_workers = max(1, convert_workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
+        self.queue_size = queue_size
+        self.on_batch = on_batch
+        self.stop_fetching = stop_fetching
+
+    async def run(self, items: List[Dict[str, Any]]) -> PipelineResult:
+        """
+        Push items through the pipeline.
+
+        Args:
+            items: Metadata dicts; each must contain a 'document_id' key
+
+        Returns:
+            PipelineResult with embedded documents and per-stage timings
+        """
+        result = PipelineResult(timings={'fetch': 0.0, 'convert': 0.0, 'embed': 0.0, 'wall': 0.0})
+        embedding_batches: List[np.ndarray] = []
+        wall_start = time.perf_counter()
+
+        pending: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            pending.put_nowait(item)
+        convert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def fetch_worker():
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if self.stop_fetching is not None and self.stop_fetching():
+                    result.skipped += 1
+                    continue
+                start = time.perf_counter()
+                try:
+                    raw = await self.fetch(item)
+                except Exception as e:
+                    logger.warning(f"Failed to fetch document {item.get('document_id')}: {e}")
+                    result.failed += 1
+                    continue
+                finally:
+                    result.timings['fetch'] += time.perf_counter() - start
+                await convert_queue.put((item, raw))
+
+        async def convert_worker():
+            while True:
+                entry = await convert_queue.get()
+                if entry is _DONE:
+                    return
+                item, raw = entry
+                start = time.perf_counter()
+                try:
+                    text = await asyncio.to_thread(self.convert, item, raw)
+                except Exception as e:
+                    logger.warning(f"Failed to convert document {item.get('document_id')}: {e}")
+                    result.failed += 1
+                    continue
+                finally:
+                    result.timings['convert'] += time.perf_counter() - start
+                if text:
+                    await embed_queue.put((item, text))
+
+        async def flush(batch):
+            texts = [text for _, text in batch]
+            titles = [item.get('birim_adi') or "none" for item, _ in batch]
+            start = time.perf_counter()
+            embeddings = await self.embed(texts, titles)
+            result.timings['embed'] += time.perf_counter() - start
+            embedding_batches.append(embeddings)
+            batch_ids = [item['document_id'] for item, _ in batch]
+            batch_metadata = [item for item, _ in batch]
+            result.ids.extend(batch_ids)
+            result.texts.extend(texts)
+            result.metadata.extend(batch_metadata)
+            logger.info(f"Embedded batch of {len(batch)} documents ({len(result.ids)} total)")
+            if self.on_batch is not None:
+                await self.on_batch(batch_ids, texts, batch_metadata, embeddings)
+
+        async def embed_worker():
+            batch = []
+            while True:
+                try:
+                    timeout = self.batch_timeout if batch else None
+                    entry = await asyncio.wait_for(embed_queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    # Nothing new arrived in time; embed what we have
+                    await flush(batch)
+                    batch = []
+                    continue
+                if entry is _DONE:
+                    if batch:
+                        await flush(batch)
+                    return
+                batch.append(entry)
+                if len(batch) >= self.batch_size:
+                    await flush(batch)
+                    batch = []
+
+        fetchers = [asyncio.create_task(fetch_worker()) for _ in range(min(self.fetch_concurrency, len(items)) or 1)]
+        converters = [asyncio.create_task(convert_worker()) for _ in range(self.convert_workers)]
+
+        async def drain_upstream():
+            await asyncio.gather(*fetchers)
+            for _ in converters:
+                await convert_queue.put(_DONE)
+            await asyncio.gather(*converters)
+            await embed_queue.put(_DONE)
+
+        upstream = asyncio.create_task(drain_upstream())
+        embedder = asyncio.create_task(embed_worker())
+
+        try:
+            # An embedding failure surfaces here immediately instead of stalling the producers
+            await asyncio.gather(upstream, embedder)
+        finally:
+            for task in [*fetchers, *converters, upstream, embedder]:
+                if not task.done():
+                    task.cancel()
+
+        if embedding_batches:
+            result.embeddings = np.vstack(embedding_batches)
+        result.timings['wall'] = time.perf_counter() - wall_start
+
+        logger.info(f"Pipeline embedded {len(result.ids)} documents, {result.failed} failed, {result.skipped} skipped, "
+                    f"timings(ms)={result.get_timings_ms()}")
+        return result
@@ -97,6 +97,36 @@ class DocumentProcessor:
         logger.info(f"Processed document {document_id} into {len(chunks)} chunks")
         return document_chunks
     
+    def build_candidate_text(self,
+                             metadata: Dict[str, Any],
+                             preview: Optional[str] = None) -> str:
+        """
+        Build a short text from search-result metadata for first-stage ranking.
+
+        Args:
+            metadata: Decision metadata (birim_adi, esas_no, karar_no, karar_tarihi, court_type)
+            preview: Optional cached preview of the decision text
+
+        Returns:
+            Compact candidate description
+        """
+        parts = []
+        if metadata.get('birim_adi'):
+            parts.append(metadata['birim_adi'])
+        if metadata.get('esas_no'):
+            parts.append(f"Esas: {metadata['esas_no']}")
+        if metadata.get('karar_no'):
+            parts.append(f"Karar: {metadata['karar_no']}")
+        if metadata.get('karar_tarihi'):
+            parts.append(f"Tarih: {metadata['karar_tarihi']}")
+        if metadata.get('karar_turu'):
+            parts.append(metadata['karar_turu'])
+
+        text = " - ".join(parts)
+        if preview:
+            text = f"{text}\n{self._clean_text(preview)}" if text else self._clean_text(preview)
+        return text or metadata.get('document_id', '')
+
     def _clean_text(self, text: str) -> str:
         """
         Clean and normalize text for processing.
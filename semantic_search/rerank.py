@@ -0,0 +1,183 @@
+# semantic_search/rerank.py
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional, Callable, Tuple
+import numpy as np
+
+from .cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Fields that never carry relevance signal in search result summaries
+_SKIPPED_KEYS = {"url", "source_url", "document_url", "pdf_url", "link", "id"}
+
+
+def turkish_lower(text: str) -> str:
+    """Lowercase with Turkish dotted/dotless I rules."""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def tokenize(text: str, prefix_length: int = 5) -> List[str]:
+    """
+    Tokenize Turkish text for lexical matching.
+
+    Tokens are truncated to their first prefix_length characters, a cheap
+    stand-in for stemming that works well for agglutinative Turkish
+    (ihale, ihalenin, ihaleye -> ihale).
+    """
+    return [token[:prefix_length] for token in _TOKEN_PATTERN.findall(turkish_lower(text))]
+
+
+def summary_text(item: Any) -> str:
+    """Flatten the text fields of a search result summary (nested dicts/lists included)."""
+    parts: List[str] = []
+
+    def collect(value: Any, key: Optional[str] = None):
+        if key is not None and key.lower() in _SKIPPED_KEYS:
+            return
+        if isinstance(value, dict):
+            for k, v in value.items():
+                collect(v, str(k))
+        elif isinstance(value, (list, tuple)):
+            for v in value:
+                collect(v, key)
+        elif isinstance(value, str) and value and not value.startswith(("http://", "https://")):
+            parts.append(value)
+
+    collect(item)
+    return " ".join(parts)
+
+
+def bm25_scores(query: str, texts: List[str], k1: float = 1.2, b: float = 0.75) -> np.ndarray:
+    """
+    Okapi BM25 scores of each text for the query, using the texts themselves as the corpus.
+
+    Returns:
+        Array of scores, one per text
+    """
+    query_terms = set(tokenize(query))
+    documents = [tokenize(text) for text in texts]
+    if not query_terms or not documents:
+        return np.zeros(len(texts), dtype=np.float32)
+
+    avg_length = sum(len(d) for d in documents) / len(documents) or 1.0
+    document_frequency = Counter(term for d in documents for term in set(d) if term in query_terms)
+    scores = np.zeros(len(documents), dtype=np.float32)
+    for i, document in enumerate(documents):
+        counts = Counter(document)
+        for term in query_terms:
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+            scores[i] += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(document) / avg_length))
+    return scores
+
+
+def fuse_with_upstream_order(upstream_ids: List[str], scored_ids: List[str], k: int = 60) -> List[str]:
+    """
+    Blend an upstream result order with a similarity ranking of some of its items.
+
+    Reciprocal-rank fusion of both orders. Similarity ranks are spread over
+    the whole upstream range and items missing from scored_ids get the middle
+    rank, so unscored items neither win nor lose by default and, with nothing
+    scored, the upstream order is returned unchanged.
+
+    Args:
+        upstream_ids: All item IDs in upstream (search engine) order
+        scored_ids: IDs of the scored subset, best first
+        k: Fusion constant damping the weight of top ranks
+
+    Returns:
+        upstream_ids reordered by fused score
+    """
+    if not scored_ids:
+        return list(upstream_ids)
+    scale = len(upstream_ids) / len(scored_ids)
+    similarity_rank = {doc_id: rank * scale for rank, doc_id in enumerate(scored_ids)}
+    neutral_rank = len(upstream_ids) / 2
+    fused = {
+        doc_id: 1.0 / (k + rank + 1) + 1.0 / (k + similarity_rank.get(doc_id, neutral_rank) + 1)
+        for rank, doc_id in enumerate(upstream_ids)
+    }
+    return sorted(upstream_ids, key=lambda doc_id: -fused[doc_id])
+
+
+class Reranker:
+    """
+    Reorders search result summaries by relevance to a natural-language query.
+
+    Uses embedding similarity when an embedder is configured (with cached
+    summary and query vectors, so re-ranking the same page again is free),
+    and falls back to BM25 over the summaries otherwise or on failure.
+    """
+
+    def __init__(self,
+                 embedder=None,
+                 cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize reranker.
+
+        Args:
+            embedder: Optional object with async encode_query / encode_documents
+                (e.g. EmbeddingDispatcher); None means lexical only
+            cache: Embedding cache for summaries and queries
+        """
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache(max_entries=20000)
+
+    async def _embedding_scores(self, query: str, texts: List[str]) -> np.ndarray:
+        query_key = f"rerank query|{query}"
+        query_embedding = self.cache.get(query_key)
+        if query_embedding is None:
+            query_embedding = await self.embedder.encode_query(query, task="search result")
+            self.cache.put(query_key, query_embedding)
+
+        keys = [f"rerank doc|{text}" for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embeddings = await self.embedder.encode_documents([texts[i] for i in missing])
+            for i, embedding in zip(missing, embeddings):
+                self.cache.put(keys[i], embedding)
+                vectors[i] = embedding
+        return np.vstack(vectors) @ np.asarray(query_embedding)
+
+    async def rerank(self,
+                     query: str,
+                     items: List[Any],
+                     text_fn: Callable[[Any], str] = summary_text) -> Tuple[List[Any], List[float], str]:
+        """
+        Rerank items by relevance to the query (stable for ties).
+
+        Args:
+            query: Natural-language question or keywords
+            items: Result summaries
+            text_fn: Extracts the text to score from an item
+
+        Returns:
+            (reordered items, their scores, method used: "embedding" or "lexical")
+        """
+        if not query or not query.strip() or len(items) < 2:
+            return list(items), [0.0] * len(items), "none"
+
+        texts = [text_fn(item) for item in items]
+        method = "lexical"
+        scores = None
+        if self.embedder is not None:
+            try:
+                scores = await self._embedding_scores(query, texts)
+                method = "embedding"
+            except Exception as e:
+                logger.warning(f"Embedding rerank failed, falling back to lexical: {e}")
+        if scores is None:
+            scores = bm25_scores(query, texts)
+
+        order = np.argsort(-scores, kind="stable")
+        return [items[i] for i in order], [round(float(scores[i]), 4) for i in order], method
@@ -0,0 +1,203 @@
+# semantic_search/sharding.py
+"""
+Multi-process search over a large VectorStore.
+
+The store's embedding matrix and metadata columns are published row-wise
+into shards written as plain .npy files. Each shard is owned by one
+long-lived worker process that memory-maps it and answers batched searches
+with a per-shard top-k; the parent merges the partial results. Workers are
+kept across requests and re-map their shard only when a new generation is
+published, so the per-query cost is one small message per shard and pages
+stay shared in the OS page cache.
+
+Layout of a pool directory:
+
+    gen-000001/shard-000/embeddings.npy     float32 rows of the shard
+    gen-000001/shard-000/court_type_codes.npy, chamber_codes.npy, date_ordinals.npy
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
+
+from .vector_store import MetadataFilter, build_filter_mask, top_k_rows
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("embeddings", "court_type_codes", "chamber_codes", "date_ordinals")
+
+# Shard memory-mapped by the current worker process, keyed by its directory
+_worker_shard: Dict[str, Dict[str, np.ndarray]] = {}
+
+
+def _open_shard(shard_dir: str) -> Dict[str, np.ndarray]:
+    """Memory-map a shard in the worker, dropping the previous generation's maps."""
+    shard = _worker_shard.get(shard_dir)
+    if shard is None:
+        _worker_shard.clear()
+        shard = {column: np.load(os.path.join(shard_dir, f"{column}.npy"), mmap_mode="r") for column in _COLUMNS}
+        _worker_shard[shard_dir] = shard
+    return shard
+
+
+def _search_shard(shard_dir: str,
+                  start: int,
+                  query_embeddings: np.ndarray,
+                  top_k: int,
+                  threshold: Optional[float],
+                  filters: Optional[MetadataFilter],
+                  court_type_vocab: Dict[str, int],
+                  chamber_vocab: Dict[str, int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Worker task: per-query top-k of one shard.
+
+    Returns:
+        One (global row indices, scores) pair per query, best first
+    """
+    shard = _open_shard(shard_dir)
+    mask = build_filter_mask(
+        filters,
+        shard["court_type_codes"],
+        shard["chamber_codes"],
+        shard["date_ordinals"],
+        court_type_vocab,
+        chamber_vocab
+    )
+    return [
+        (rows + start, scores)
+        for rows, scores in top_k_rows(shard["embeddings"], query_embeddings, top_k, threshold, mask)
+    ]
+
+
+def merge_top_k(partials: List[Tuple[np.ndarray, np.ndarray]], top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge per-shard (indices, scores) of one query into a global top-k, best first."""
+    partials = [p for p in partials if len(p[0])]
+    if not partials:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    indices = np.concatenate([p[0] for p in partials])
+    scores = np.concatenate([p[1] for p in partials])
+    k = min(top_k, len(scores))
+    if len(scores) > k:
+        top = np.argpartition(scores, -k)[-k:]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return indices[top], scores[top]
+
+
+class ShardPool:
+    """
+    Worker processes searching memory-mapped shards of a VectorStore.
+
+    Each shard gets a dedicated single-process executor, so a worker owns
+    one shard for its whole lifetime. publish() writes the store's current
+    rows as a new generation; rows added afterwards are searched by the
+    store itself until the next publish. Workers start on first publish and
+    are reused until close().
+    """
+
+    def __init__(self, num_workers: int, directory: Optional[str] = None):
+        """
+        Initialize shard pool.
+
+        Args:
+            num_workers: Number of shards and worker processes
+            directory: Where shard files are written (default: a new temporary directory)
+        """
+        self.num_workers = max(1, num_workers)
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="semantic-shards-")
+        self._executors: List[ProcessPoolExecutor] = []
+        self._shards: List[Tuple[str, int]] = []
+        self._generation = 0
+        self.rows = 0
+        self.publishes = 0
+        self.searches = 0
+
+    def _start(self):
+        if self._executors:
+            return
+        # Spawned rather than forked: the parent runs an event loop and HTTP clients
+        context = multiprocessing.get_context("spawn")
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context)
+            for _ in range(self.num_workers)
+        ]
+        logger.info(f"Started {self.num_workers} shard workers in {self.directory}")
+
+    def publish(self, state: Dict[str, Any], rows: int):
+        """
+        Write the first `rows` rows of a store as a new shard generation.
+
+        Args:
+            state: VectorStore.export_state() output (arrays may be views)
+            rows: Number of leading rows to publish
+        """
+        self._start()
+        self._generation += 1
+        generation_dir = os.path.join(self.directory, f"gen-{self._generation:06d}")
+        bounds = np.linspace(0, rows, self.num_workers + 1).astype(int)
+        shards = []
+        for i in range(self.num_workers):
+            start, end = int(bounds[i]), int(bounds[i + 1])
+            shard_dir = os.path.join(generation_dir, f"shard-{i:03d}")
+            os.makedirs(shard_dir, exist_ok=True)
+            for column in _COLUMNS:
+                np.save(os.path.join(shard_dir, f"{column}.npy"), np.ascontiguousarray(state[column][start:end]))
+            shards.append((shard_dir, start))
+
+        previous = {os.path.dirname(shard_dir) for shard_dir, _ in self._shards}
+        self._shards = shards
+        self.rows = rows
+        self.publishes += 1
+        # Workers switch to the new generation on their next search
+        for directory in previous:
+            shutil.rmtree(directory, ignore_errors=True)
+        logger.info(f"Published {rows} rows to {self.num_workers} shards (generation {self._generation})")
+
+    def search_batch(self,
+                     query_embeddings: np.ndarray,
+                     top_k: int,
+                     threshold: Optional[float],
+                     filters: Optional[MetadataFilter],
+                     court_type_vocab: Dict[str, int],
+                     chamber_vocab: Dict[str, int]) -> List[List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Search every shard in parallel.
+
+        Returns:
+            Per query, the list of per-shard (global row indices, scores) pairs
+        """
+        self.searches += 1
+        query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        futures = [
+            executor.submit(_search_shard, shard_dir, start, query_embeddings, top_k, threshold,
+                            filters, court_type_vocab, chamber_vocab)
+            for executor, (shard_dir, start) in zip(self._executors, self._shards)
+        ]
+        per_shard = [future.result() for future in futures]
+        return [[partials[q] for partials in per_shard] for q in range(len(query_embeddings))]
+
+    def close(self):
+        """Shut down the workers and remove the shard files."""
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._executors = []
+        self._shards = []
+        self.rows = 0
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the pool."""
+        return {
+            'workers': len(self._executors),
+            'rows_published': self.rows,
+            'publishes': self.publishes,
+            'searches': self.searches,
+        }
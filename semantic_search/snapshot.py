@@ -0,0 +1,289 @@
+# semantic_search/snapshot.py
+"""
+Portable snapshots of the semantic index and its caches.
+
+A snapshot location is a directory (local or served over HTTP(S), e.g. an
+object storage bucket or presigned prefix) holding one subdirectory per
+snapshot version and a CURRENT file naming the live version:
+
+    CURRENT                 name of the current version directory
+    <version>/
+        manifest.json           format version, model, dimension, counts, sha256 of every file
+        vectors.npz             document embeddings and columnar metadata (court, chamber, date)
+        documents.json          document ids, texts, metadata and categorical vocabularies
+        previews.json           PreviewCache entries (optional)
+        query_embeddings.npz    EmbeddingCache keys and vectors (optional)
+
+A new version is written in full next to the old ones and published by
+atomically replacing CURRENT, so readers see either the old or the new
+snapshot, never a mix. Locations without CURRENT are read as a single flat
+snapshot directory.
+
+Arrays are stored without pickling so snapshots are safe to load from
+shared storage. Every file is checksum-verified before use.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List
+import numpy as np
+
+from .vector_store import VectorStore
+from .cache import PreviewCache, EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "CURRENT"
+# Versions kept on disk: the current one and its predecessor, which readers
+# that resolved CURRENT just before a switch may still be reading
+KEEP_VERSIONS = 2
+_READ_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class Snapshot:
+    """Contents of a loaded snapshot."""
+    manifest: Dict[str, Any]
+    vector_store: VectorStore
+    previews: Dict[str, str] = field(default_factory=dict)
+    query_embedding_keys: List[str] = field(default_factory=list)
+    query_embeddings: Optional[np.ndarray] = None
+
+
+def _file_sha256(path: str) -> str:
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data: Any):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _prune_versions(directory: str, current: str):
+    """Delete all but the newest KEEP_VERSIONS version directories."""
+    versions = sorted(
+        name for name in os.listdir(directory)
+        if not name.startswith(".") and name != CURRENT_NAME and os.path.isdir(os.path.join(directory, name))
+    )
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != current:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def save_snapshot(directory: str,
+                  vector_store: VectorStore,
+                  preview_cache: Optional[PreviewCache] = None,
+                  embedding_cache: Optional[EmbeddingCache] = None,
+                  model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write a new snapshot version and make it current.
+
+    Files are written straight to a staging directory, which is renamed to
+    its version name once complete; CURRENT is then replaced in one step.
+
+    Args:
+        directory: Snapshot location (created if missing)
+        vector_store: Store to export
+        preview_cache: Optional preview cache to include
+        embedding_cache: Optional query embedding cache to include
+        model: Embedding model name recorded in the manifest
+
+    Returns:
+        The written manifest
+    """
+    state = vector_store.export_state()
+
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=directory)
+    try:
+        np.savez(
+            os.path.join(staging, "vectors.npz"),
+            embeddings=np.asarray(state["embeddings"], dtype=np.float32),
+            court_type_codes=state["court_type_codes"],
+            chamber_codes=state["chamber_codes"],
+            date_ordinals=state["date_ordinals"],
+        )
+        _write_json(os.path.join(staging, "documents.json"), {
+            "ids": state["ids"],
+            "texts": state["texts"],
+            "metadata": state["metadata"],
+            "court_type_vocab": state["court_type_vocab"],
+            "chamber_vocab": state["chamber_vocab"],
+        })
+        if preview_cache is not None:
+            _write_json(os.path.join(staging, "previews.json"), preview_cache.export_items())
+        if embedding_cache is not None and len(embedding_cache):
+            keys, vectors = embedding_cache.export_items()
+            np.savez(os.path.join(staging, "query_embeddings.npz"), keys=np.array(keys), vectors=vectors)
+
+        names = sorted(os.listdir(staging))
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "model": model,
+            "dimension": state["dimension"],
+            "num_documents": len(state["ids"]),
+            "num_previews": len(preview_cache) if preview_cache is not None else 0,
+            "num_query_embeddings": len(embedding_cache) if embedding_cache is not None else 0,
+            "files": {
+                name: {
+                    "sha256": _file_sha256(os.path.join(staging, name)),
+                    "bytes": os.path.getsize(os.path.join(staging, name))
+                }
+                for name in names
+            },
+        }
+        _write_json(os.path.join(staging, MANIFEST_NAME), manifest)
+
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        os.rename(staging, os.path.join(directory, version))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # The single switch readers observe
+    pointer = os.path.join(directory, f".{CURRENT_NAME}.tmp")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(directory, CURRENT_NAME))
+    _prune_versions(directory, version)
+
+    logger.info(f"Saved snapshot version {version} to {directory}: {manifest['num_documents']} documents, "
+                f"{sum(f['bytes'] for f in manifest['files'].values()) / (1024 * 1024):.1f} MB")
+    return manifest
+
+
+async def _download(client, url: str, path: str) -> str:
+    """Stream a remote file to disk and return its sha256."""
+    digest = hashlib.sha256()
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        with open(path, "wb") as f:
+            async for chunk in response.aiter_bytes(_READ_CHUNK_BYTES):
+                digest.update(chunk)
+                f.write(chunk)
+    return digest.hexdigest()
+
+
+def _check_manifest(manifest: Dict[str, Any], model: Optional[str], dimension: Optional[int]):
+    """Refuse snapshots in another format or built for another embedding space."""
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+    if model is not None and manifest.get("model") != model:
+        raise ValueError(f"Snapshot was built with model {manifest.get('model')!r}, expected {model!r}")
+    if dimension is not None and manifest.get("dimension") != dimension:
+        raise ValueError(f"Snapshot has dimension {manifest.get('dimension')}, expected {dimension}")
+
+
+def _load_directory(directory: str,
+                    manifest: Dict[str, Any],
+                    checksums: Dict[str, str],
+                    max_documents: Optional[int]) -> Snapshot:
+    """Build a Snapshot from verified files in a local directory."""
+    for name, info in manifest["files"].items():
+        if checksums[name] != info["sha256"]:
+            raise ValueError(f"Checksum mismatch for snapshot file {name}")
+
+    # np.load reads each array from the file straight into its final buffer
+    with np.load(os.path.join(directory, "vectors.npz"), allow_pickle=False) as vectors:
+        arrays = {name: vectors[name] for name in ("embeddings", "court_type_codes", "chamber_codes", "date_ordinals")}
+    with open(os.path.join(directory, "documents.json"), encoding="utf-8") as f:
+        documents = json.load(f)
+    vector_store = VectorStore.from_state({
+        "dimension": manifest["dimension"],
+        "ids": documents["ids"],
+        "texts": documents["texts"],
+        "metadata": documents["metadata"],
+        "court_type_vocab": documents["court_type_vocab"],
+        "chamber_vocab": documents["chamber_vocab"],
+        **arrays,
+    }, max_documents=max_documents)
+
+    snapshot = Snapshot(manifest=manifest, vector_store=vector_store)
+    if "previews.json" in manifest["files"]:
+        with open(os.path.join(directory, "previews.json"), encoding="utf-8") as f:
+            snapshot.previews = json.load(f)
+    if "query_embeddings.npz" in manifest["files"]:
+        with np.load(os.path.join(directory, "query_embeddings.npz"), allow_pickle=False) as query_embeddings:
+            snapshot.query_embedding_keys = [str(k) for k in query_embeddings["keys"]]
+            snapshot.query_embeddings = query_embeddings["vectors"]
+    return snapshot
+
+
+async def load_snapshot(location: str,
+                        timeout: float = 120.0,
+                        model: Optional[str] = None,
+                        dimension: Optional[int] = None,
+                        max_documents: Optional[int] = None) -> Snapshot:
+    """
+    Load and verify the current snapshot at a location.
+
+    Remote files are streamed to a temporary directory while hashing; no
+    file is ever held in memory as a whole besides the arrays themselves.
+
+    Args:
+        location: Local directory or HTTP(S) URL prefix of a snapshot location
+        timeout: HTTP timeout in seconds for remote snapshots
+        model: Embedding model the snapshot must have been built with
+        dimension: Embedding dimension the snapshot must have
+        max_documents: Document cap passed on to the restored VectorStore
+
+    Returns:
+        Loaded Snapshot
+
+    Raises:
+        ValueError: On unsupported format version, model/dimension mismatch or checksum mismatch
+    """
+    start = time.perf_counter()
+
+    if location.startswith(("http://", "https://")):
+        import httpx
+        base = location.rstrip("/")
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+            response = await client.get(f"{base}/{CURRENT_NAME}")
+            if response.status_code == 404:
+                version_url = base
+            else:
+                response.raise_for_status()
+                version_url = f"{base}/{response.text.strip()}"
+
+            response = await client.get(f"{version_url}/{MANIFEST_NAME}")
+            response.raise_for_status()
+            manifest = response.json()
+            _check_manifest(manifest, model, dimension)
+
+            with tempfile.TemporaryDirectory(prefix="snapshot-") as staging:
+                checksums = {
+                    name: await _download(client, f"{version_url}/{name}", os.path.join(staging, name))
+                    for name in manifest["files"]
+                }
+                snapshot = _load_directory(staging, manifest, checksums, max_documents)
+    else:
+        directory = location
+        current = os.path.join(location, CURRENT_NAME)
+        if os.path.exists(current):
+            with open(current, encoding="utf-8") as f:
+                directory = os.path.join(location, f.read().strip())
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        _check_manifest(manifest, model, dimension)
+        checksums = {name: _file_sha256(os.path.join(directory, name)) for name in manifest["files"]}
+        snapshot = _load_directory(directory, manifest, checksums, max_documents)
+
+    logger.info(f"Loaded snapshot from {location}: {manifest['num_documents']} documents in "
+                f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    return snapshot
@@ -1,20 +1,78 @@
 # semantic_search/vector_store.py
 
+import itertools
 import logging
 import numpy as np
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
+from datetime import date, datetime
 import json
 
 logger = logging.getLogger(__name__)
 
+# Code used in the categorical/date columns when a document has no value
+MISSING_CODE = -1
+
+# Source of VectorStore.version values, unique across all stores in the process
+_versions = itertools.count(1)
+
+# Date formats seen in Bedesten metadata (kararTarihiStr) and extracted metadata
+_DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y")
+
+
+def to_day_ordinal(value: Any) -> int:
+    """
+    Convert a date value to a proleptic Gregorian day ordinal.
+
+    Args:
+        value: date/datetime object or string (DD.MM.YYYY, YYYY-MM-DD, ISO 8601)
+
+    Returns:
+        Day ordinal, or MISSING_CODE if the value cannot be parsed
+    """
+    if value is None or value == "":
+        return MISSING_CODE
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+
+    text = str(value).strip()
+    # Drop time component of ISO 8601 timestamps (2020-01-01T00:00:00.000Z)
+    if "T" in text:
+        text = text.split("T", 1)[0]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().toordinal()
+        except ValueError:
+            continue
+    return MISSING_CODE
+
+
+@dataclass
+class MetadataFilter:
+    """
+    Metadata prefilter applied to the store before similarity scoring.
+
+    Each populated field narrows the candidate rows; empty fields are ignored.
+    Date bounds are inclusive and accept the same formats as to_day_ordinal.
+    """
+    court_types: Optional[List[str]] = None
+    chambers: Optional[List[str]] = None
+    date_from: Optional[Any] = None
+    date_to: Optional[Any] = None
+
+    def is_empty(self) -> bool:
+        """Check whether the filter restricts anything."""
+        return not (self.court_types or self.chambers or self.date_from or self.date_to)
+
 @dataclass
 class Document:
-    """Represents a document with its embedding and metadata."""
+    """Represents a document and its metadata; its embedding is row `row` of the store's matrix."""
     id: str
     text: str
-    embedding: np.ndarray
     metadata: Dict[str, Any]
+    row: int = -1
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary (excluding embedding for serialization)."""
@@ -24,26 +82,167 @@ class Document:
             'metadata': self.metadata
         }
 
+def _category_mask(column: np.ndarray, vocab: Dict[str, int], values: List[str]) -> np.ndarray:
+    """Boolean mask of rows whose categorical code is one of the given values."""
+    codes = [vocab[v] for v in values if v in vocab]
+    if not codes:
+        return np.zeros(len(column), dtype=bool)
+    return np.isin(column, np.asarray(codes, dtype=np.int32))
+
+
+def build_filter_mask(filters: Optional[MetadataFilter],
+                      court_type_codes: np.ndarray,
+                      chamber_codes: np.ndarray,
+                      date_ordinals: np.ndarray,
+                      court_type_vocab: Dict[str, int],
+                      chamber_vocab: Dict[str, int]) -> Optional[np.ndarray]:
+    """
+    Build a boolean row mask from a metadata filter over columnar metadata.
+    
+    Returns:
+        Boolean array over the rows, or None when nothing is filtered
+    """
+    if filters is None or filters.is_empty():
+        return None
+    
+    mask = np.ones(len(date_ordinals), dtype=bool)
+    
+    if filters.court_types:
+        mask &= _category_mask(court_type_codes, court_type_vocab, filters.court_types)
+    
+    if filters.chambers:
+        mask &= _category_mask(chamber_codes, chamber_vocab, filters.chambers)
+    
+    if filters.date_from or filters.date_to:
+        # Documents without a parseable date never match a date range
+        mask &= date_ordinals != MISSING_CODE
+        if filters.date_from:
+            start = to_day_ordinal(filters.date_from)
+            if start == MISSING_CODE:
+                raise ValueError(f"Unrecognized date_from value: {filters.date_from}")
+            mask &= date_ordinals >= start
+        if filters.date_to:
+            end = to_day_ordinal(filters.date_to)
+            if end == MISSING_CODE:
+                raise ValueError(f"Unrecognized date_to value: {filters.date_to}")
+            mask &= date_ordinals <= end
+    
+    return mask
+
+
+def top_k_rows(embeddings: np.ndarray,
+               query_embeddings: np.ndarray,
+               top_k: int,
+               threshold: Optional[float] = None,
+               mask: Optional[np.ndarray] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Per-query top-k rows of an embedding matrix by dot product.
+    
+    All queries are scored with one matrix-matrix product and ranked with a
+    vectorized per-row top-k.
+    
+    Args:
+        embeddings: N x dimension matrix (normalized rows)
+        query_embeddings: Q x dimension matrix
+        top_k: Rows to return per query
+        threshold: Optional minimum similarity
+        mask: Optional boolean row mask; only matching rows are scored
+        
+    Returns:
+        One (row indices, scores) pair per query, best first
+    """
+    num_queries = query_embeddings.shape[0]
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+    rows = np.arange(len(embeddings)) if mask is None else np.flatnonzero(mask)
+    k = min(top_k, len(rows))
+    if k == 0:
+        return [empty] * num_queries
+    candidate_embeddings = embeddings if mask is None else embeddings[rows]
+    
+    # Q x N similarities in one BLAS call (assuming normalized embeddings)
+    similarities = query_embeddings @ candidate_embeddings.T
+    if threshold is not None:
+        similarities = np.where(similarities >= threshold, similarities, -np.inf)
+    
+    if similarities.shape[1] > k:
+        top_indices = np.argpartition(similarities, -k, axis=1)[:, -k:]
+    else:
+        top_indices = np.tile(np.arange(similarities.shape[1]), (num_queries, 1))
+    top_scores = np.take_along_axis(similarities, top_indices, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top_indices = np.take_along_axis(top_indices, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    
+    results = []
+    for row_indices, row_scores in zip(top_indices, top_scores):
+        valid = np.isfinite(row_scores)
+        results.append((rows[row_indices[valid]].astype(np.int64), row_scores[valid].astype(np.float32)))
+    return results
+
+
 class VectorStore:
     """
     In-memory vector storage with similarity search capabilities.
     Future versions can use Faiss, ChromaDB, or other vector databases.
     """
     
-    def __init__(self, dimension: int = 768):
+    def __init__(self, dimension: int = 768, max_documents: Optional[int] = None):
         """
         Initialize vector store.
         
         Args:
             dimension: Embedding dimension size
+            max_documents: Expected document cap; spare rows are never allocated beyond it
         """
         self.dimension = dimension
+        self.max_documents = max_documents
         self.documents: List[Document] = []
-        self.embeddings: Optional[np.ndarray] = None
         self.index_built = False
         
+        # Embedding matrix with spare rows; only the first len(documents) are in use
+        self._matrix = np.empty((0, dimension), dtype=np.float32)
+
+        # Columnar metadata, parallel to self.documents, used for prefiltering
+        self.court_type_vocab: Dict[str, int] = {}
+        self.chamber_vocab: Dict[str, int] = {}
+        self.court_type_codes = np.empty(0, dtype=np.int32)
+        self.chamber_codes = np.empty(0, dtype=np.int32)
+        self.date_ordinals = np.empty(0, dtype=np.int32)
+        
+        # Document ID -> row position
+        self._id_index: Dict[str, int] = {}
+        
+        # Optional worker pool searching the store once it is large (see attach_shard_pool)
+        self._shard_pool = None
+        self._shard_rows = 0
+        self.shard_min_documents = 0
+        self.shard_republish_fraction = 0.25
+        
+        # Changes whenever the contents change, so results computed from the
+        # store can be cached per version
+        self.version = next(_versions)
+        
         logger.info(f"Initialized VectorStore with dimension: {dimension}")
     
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """Embeddings of the stored documents (a view of the matrix), or None when empty."""
+        if not self.documents:
+            return None
+        return self._matrix[:len(self.documents)]
+    
+    def _reserve(self, rows: int):
+        """Grow the matrix geometrically so that it holds at least `rows` rows."""
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, 2 * capacity, 64)
+        if self.max_documents is not None:
+            new_capacity = max(rows, min(new_capacity, self.max_documents))
+        matrix = np.empty((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:len(self.documents)] = self._matrix[:len(self.documents)]
+        self._matrix = matrix
+    
     def add_documents(self, 
                      ids: List[str],
                      texts: List[str],
@@ -67,39 +266,89 @@ class VectorStore:
         if metadata and len(metadata) != len(ids):
             raise ValueError("Metadata length doesn't match document count")
         
-        # Add documents
+        if len(ids) and embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} doesn't match store dimension {self.dimension}")
+        
+        # Copy the new rows into spare capacity; the caller's array is not retained
+        start = len(self.documents)
+        self._reserve(start + len(ids))
+        self._matrix[start:start + len(ids)] = embeddings
+        
         for i in range(len(ids)):
             doc = Document(
                 id=ids[i],
                 text=texts[i],
-                embedding=embeddings[i],
-                metadata=metadata[i] if metadata else {}
+                metadata=metadata[i] if metadata else {},
+                row=start + i
             )
+            self._id_index[doc.id] = doc.row
             self.documents.append(doc)
         
-        # Rebuild index
-        self._build_index()
+        self._append_metadata_columns(metadata if metadata else [{}] * len(ids))
+        self.index_built = bool(self.documents)
+        if len(ids):
+            self.version = next(_versions)
         
         logger.info(f"Added {len(ids)} documents to vector store. Total: {len(self.documents)}")
         return len(ids)
     
-    def _build_index(self):
-        """Build or rebuild the embedding index."""
-        if not self.documents:
-            self.embeddings = None
-            self.index_built = False
-            return
+    @staticmethod
+    def _encode_column(values: List[Optional[str]], vocab: Dict[str, int]) -> np.ndarray:
+        """Map categorical values to integer codes, growing the vocabulary as needed."""
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if not value:
+                codes[i] = MISSING_CODE
+                continue
+            code = vocab.get(value)
+            if code is None:
+                code = len(vocab)
+                vocab[value] = code
+            codes[i] = code
+        return codes
+    
+    def _append_metadata_columns(self, metadata: List[Dict[str, Any]]):
+        """Append columnar metadata for newly added documents."""
+        court_codes = self._encode_column(
+            [m.get('court_type') for m in metadata], self.court_type_vocab
+        )
+        chamber_codes = self._encode_column(
+            [m.get('birim_adi') for m in metadata], self.chamber_vocab
+        )
+        ordinals = np.fromiter(
+            (to_day_ordinal(m.get('karar_tarihi')) for m in metadata),
+            dtype=np.int32,
+            count=len(metadata)
+        )
         
-        # Stack all embeddings into a single array
-        self.embeddings = np.vstack([doc.embedding for doc in self.documents])
-        self.index_built = True
+        self.court_type_codes = np.concatenate([self.court_type_codes, court_codes])
+        self.chamber_codes = np.concatenate([self.chamber_codes, chamber_codes])
+        self.date_ordinals = np.concatenate([self.date_ordinals, ordinals])
+    
+    def build_mask(self, filters: Optional[MetadataFilter]) -> Optional[np.ndarray]:
+        """
+        Build a boolean row mask from a metadata filter.
         
-        logger.debug(f"Built index with shape: {self.embeddings.shape}")
+        Args:
+            filters: Metadata filter, or None
+            
+        Returns:
+            Boolean array over stored documents, or None when nothing is filtered
+        """
+        return build_filter_mask(
+            filters,
+            self.court_type_codes,
+            self.chamber_codes,
+            self.date_ordinals,
+            self.court_type_vocab,
+            self.chamber_vocab
+        )
     
     def search(self, 
               query_embedding: np.ndarray,
               top_k: int = 10,
-              threshold: Optional[float] = None) -> List[Tuple[Document, float]]:
+              threshold: Optional[float] = None,
+              filters: Optional[MetadataFilter] = None) -> List[Tuple[Document, float]]:
         """
         Search for similar documents using cosine similarity.
         
@@ -107,6 +356,7 @@ class VectorStore:
             query_embedding: Query embedding vector
             top_k: Number of results to return
             threshold: Optional similarity threshold (0-1)
+            filters: Optional metadata prefilter; only matching rows are scored
             
         Returns:
             List of (Document, similarity_score) tuples
@@ -115,26 +365,44 @@ class VectorStore:
             logger.warning("No documents in vector store")
             return []
         
+        if self._uses_shards():
+            return self.search_batch(query_embedding, top_k=top_k, threshold=threshold, filters=filters)[0]
+        
         # Ensure query is 2D
         if len(query_embedding.shape) == 1:
             query_embedding = query_embedding.reshape(1, -1)
         
+        # Restrict scoring to rows that pass the metadata prefilter
+        mask = self.build_mask(filters)
+        if mask is None:
+            candidate_indices = None
+            candidate_embeddings = self.embeddings
+        else:
+            candidate_indices = np.flatnonzero(mask)
+            if len(candidate_indices) == 0:
+                logger.info("No documents match the metadata filter")
+                return []
+            candidate_embeddings = self.embeddings[candidate_indices]
+        
         # Compute cosine similarities (assuming normalized embeddings)
-        similarities = np.dot(self.embeddings, query_embedding.T).squeeze()
+        similarities = np.dot(candidate_embeddings, query_embedding.T).reshape(-1)
         
         # Apply threshold if specified
         if threshold is not None:
-            valid_indices = np.where(similarities >= threshold)[0]
+            valid_indices = np.flatnonzero(similarities >= threshold)
             if len(valid_indices) == 0:
                 logger.info(f"No documents above threshold {threshold}")
                 return []
             similarities = similarities[valid_indices]
-            valid_docs = [self.documents[i] for i in valid_indices]
         else:
-            valid_docs = self.documents
+            valid_indices = np.arange(len(similarities))
+        
+        # Map back to positions in self.documents
+        if candidate_indices is not None:
+            valid_indices = candidate_indices[valid_indices]
         
         # Get top-k indices
-        top_k = min(top_k, len(valid_docs))
+        top_k = min(top_k, len(similarities))
         if top_k == 0:
             return []
         
@@ -148,13 +416,113 @@ class VectorStore:
         # Create results
         results = []
         for idx in top_indices:
-            doc = valid_docs[idx] if threshold else self.documents[idx]
+            doc = self.documents[valid_indices[idx]]
             score = float(similarities[idx])
             results.append((doc, score))
         
         logger.info(f"Search returned {len(results)} results (top_k={top_k})")
         return results
     
+    def attach_shard_pool(self, pool, min_documents: int, republish_fraction: float = 0.25):
+        """
+        Search through a ShardPool once the store holds min_documents documents.
+        
+        The pool holds a published copy of the leading rows; rows added later
+        are scored in-process and merged, and the store is published again
+        once they exceed republish_fraction of the published rows.
+        
+        Args:
+            pool: semantic_search.sharding.ShardPool
+            min_documents: Store size from which searches use the pool
+            republish_fraction: Unpublished share of rows that triggers a new publish
+        """
+        self._shard_pool = pool
+        self._shard_rows = 0
+        self.shard_min_documents = min_documents
+        self.shard_republish_fraction = republish_fraction
+    
+    def _uses_shards(self) -> bool:
+        return self._shard_pool is not None and len(self.documents) >= self.shard_min_documents
+    
+    def _search_rows_sharded(self,
+                             query_embeddings: np.ndarray,
+                             top_k: int,
+                             threshold: Optional[float],
+                             filters: Optional[MetadataFilter]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Per-query top-k rows from the shard workers plus the unpublished tail."""
+        from .sharding import merge_top_k
+        
+        pool = self._shard_pool
+        n = len(self.documents)
+        if n - self._shard_rows > self._shard_rows * self.shard_republish_fraction:
+            pool.publish(self.export_state(), n)
+            self._shard_rows = n
+        published = self._shard_rows
+        
+        tail_mask = None
+        if filters is not None and not filters.is_empty():
+            tail_mask = build_filter_mask(
+                filters,
+                self.court_type_codes[published:n],
+                self.chamber_codes[published:n],
+                self.date_ordinals[published:n],
+                self.court_type_vocab,
+                self.chamber_vocab
+            )
+        tail = top_k_rows(self._matrix[published:n], query_embeddings, top_k, threshold, tail_mask)
+        per_query = pool.search_batch(
+            query_embeddings, top_k, threshold, filters, dict(self.court_type_vocab), dict(self.chamber_vocab)
+        )
+        return [
+            merge_top_k(partials + [(tail_rows + published, tail_scores)], top_k)
+            for partials, (tail_rows, tail_scores) in zip(per_query, tail)
+        ]
+    
+    def search_batch(self,
+                     query_embeddings: np.ndarray,
+                     top_k: int = 10,
+                     threshold: Optional[float] = None,
+                     filters: Optional[MetadataFilter] = None) -> List[List[Tuple[Document, float]]]:
+        """
+        Search for several queries at once.
+        
+        All queries are scored against the store with a single matrix-matrix
+        product and ranked with a vectorized per-row top-k, which is much
+        cheaper than calling search() once per query. Large stores with an
+        attached shard pool are searched by its worker processes.
+        
+        Args:
+            query_embeddings: Query embedding matrix (Q x dimension)
+            top_k: Number of results to return per query
+            threshold: Optional similarity threshold (0-1)
+            filters: Optional metadata prefilter shared by all queries
+            
+        Returns:
+            One list of (Document, similarity_score) tuples per query, in query order
+        """
+        query_embeddings = np.atleast_2d(query_embeddings)
+        num_queries = query_embeddings.shape[0]
+        if not self.index_built or self.embeddings is None:
+            logger.warning("No documents in vector store")
+            return [[] for _ in range(num_queries)]
+        
+        if self._uses_shards():
+            ranked_rows = self._search_rows_sharded(query_embeddings, top_k, threshold, filters)
+        else:
+            mask = self.build_mask(filters)
+            if mask is not None and not mask.any():
+                logger.info("No documents match the metadata filter")
+                return [[] for _ in range(num_queries)]
+            ranked_rows = top_k_rows(self.embeddings, query_embeddings, top_k, threshold, mask)
+        
+        results = [
+            [(self.documents[row], float(score)) for row, score in zip(rows.tolist(), scores.tolist())]
+            for rows, scores in ranked_rows
+        ]
+        
+        logger.info(f"Batch search returned {sum(len(r) for r in results)} results for {num_queries} queries (top_k={top_k})")
+        return results
+    
     def hybrid_search(self,
                      query_embedding: np.ndarray,
                      keyword_scores: Dict[str, float],
@@ -200,8 +568,16 @@ class VectorStore:
     def clear(self):
         """Clear all documents from the store."""
         self.documents = []
-        self.embeddings = None
+        self._matrix = np.empty((0, self.dimension), dtype=np.float32)
         self.index_built = False
+        self.court_type_vocab = {}
+        self.chamber_vocab = {}
+        self.court_type_codes = np.empty(0, dtype=np.int32)
+        self.chamber_codes = np.empty(0, dtype=np.int32)
+        self.date_ordinals = np.empty(0, dtype=np.int32)
+        self._id_index = {}
+        self._shard_rows = 0
+        self.version = next(_versions)
         logger.info("Cleared vector store")
     
     def size(self) -> int:
@@ -210,10 +586,78 @@ class VectorStore:
     
     def get_by_id(self, doc_id: str) -> Optional[Document]:
         """Get document by ID."""
-        for doc in self.documents:
-            if doc.id == doc_id:
-                return doc
-        return None
+        position = self._id_index.get(doc_id)
+        if position is None:
+            return None
+        return self.documents[position]
+    
+    def contains(self, doc_id: str) -> bool:
+        """Check whether a document ID is stored."""
+        return doc_id in self._id_index
+    
+    def get_embeddings(self, docs: List[Document]) -> np.ndarray:
+        """Copy the embeddings of stored documents into a new (N x dimension) array."""
+        return self._matrix[[doc.row for doc in docs]]
+    
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Export the store as plain arrays and lists for serialization.
+        
+        Returns:
+            Dictionary with embeddings, metadata columns, vocabularies and document fields
+        """
+        return {
+            'dimension': self.dimension,
+            'ids': [doc.id for doc in self.documents],
+            'texts': [doc.text for doc in self.documents],
+            'metadata': [doc.metadata for doc in self.documents],
+            'embeddings': self.embeddings if self.embeddings is not None else np.empty((0, self.dimension), dtype=np.float32),
+            'court_type_codes': self.court_type_codes,
+            'chamber_codes': self.chamber_codes,
+            'date_ordinals': self.date_ordinals,
+            'court_type_vocab': dict(self.court_type_vocab),
+            'chamber_vocab': dict(self.chamber_vocab),
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], max_documents: Optional[int] = None) -> 'VectorStore':
+        """
+        Rebuild a store from export_state() output without re-encoding metadata.
+        
+        The embedding array is adopted as the store's matrix, not copied.
+        
+        Args:
+            state: Exported state
+            max_documents: Optional document cap (see __init__)
+            
+        Returns:
+            Populated VectorStore
+        """
+        store = cls(dimension=state['dimension'], max_documents=max_documents)
+        embeddings = np.asarray(state['embeddings'], dtype=np.float32)
+        ids = state['ids']
+        if len(ids) != embeddings.shape[0] or len(ids) != len(state['texts']) or len(ids) != len(state['metadata']):
+            raise ValueError("Inconsistent vector store state")
+        if len(ids) and embeddings.shape[1] != store.dimension:
+            raise ValueError(f"Embedding dimension {embeddings.shape[1]} doesn't match store dimension {store.dimension}")
+        
+        store.documents = [
+            Document(id=doc_id, text=text, metadata=metadata, row=i)
+            for i, (doc_id, text, metadata) in enumerate(zip(ids, state['texts'], state['metadata']))
+        ]
+        store._id_index = {doc.id: i for i, doc in enumerate(store.documents)}
+        store.court_type_vocab = dict(state['court_type_vocab'])
+        store.chamber_vocab = dict(state['chamber_vocab'])
+        store.court_type_codes = np.asarray(state['court_type_codes'], dtype=np.int32)
+        store.chamber_codes = np.asarray(state['chamber_codes'], dtype=np.int32)
+        store.date_ordinals = np.asarray(state['date_ordinals'], dtype=np.int32)
+        if store.documents:
+            store._matrix = embeddings
+            store.index_built = True
+        store.version = next(_versions)
+        
+        logger.info(f"Restored VectorStore with {len(store.documents)} documents")
+        return store
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector store."""
@@ -223,10 +667,14 @@ class VectorStore:
             'index_built': self.index_built,
             'memory_usage_mb': 0
         }
+        if self._shard_pool is not None:
+            stats['sharded'] = self._uses_shards()
+            stats['shards'] = self._shard_pool.get_stats()
         
         if self.embeddings is not None:
-            # Estimate memory usage
-            memory_bytes = self.embeddings.nbytes
+            # Estimate memory usage, counting the matrix's spare rows
+            memory_bytes = self._matrix.nbytes
+            memory_bytes += self.court_type_codes.nbytes + self.chamber_codes.nbytes + self.date_ordinals.nbytes
             for doc in self.documents:
                 memory_bytes += len(doc.text.encode('utf-8'))
                 memory_bytes += len(json.dumps(doc.metadata).encode('utf-8'))
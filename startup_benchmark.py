@@ -0,0 +1,211 @@
+# startup_benchmark.py
+"""
+Cold-start benchmark for the server entry points.
+
+Starts each entry point in a fresh process and reports time-to-ready and
+resident memory (RSS) once ready:
+  - stdio: `python -m mcp_server_main`, ready when it answers the MCP initialize request
+  - asgi:  `uvicorn asgi_app:app`, ready when GET /health returns 200
+
+Each entry point is measured in every configuration:
+  - default:  OPENROUTER_API_KEY unset (semantic search disabled)
+  - semantic: OPENROUTER_API_KEY set to a placeholder (semantic search enabled;
+              startup makes no OpenRouter calls, so the key need not be valid)
+
+Usage:
+    yargi-mcp --bench-startup
+    python startup_benchmark.py --runs 5 --entry stdio --config semantic
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+ROOT = Path(__file__).resolve().parent
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"}
+    }
+}
+
+
+# Environment overrides per configuration (None removes the variable)
+CONFIGURATIONS = {
+    "default": {"OPENROUTER_API_KEY": None},
+    "semantic": {"OPENROUTER_API_KEY": "startup-benchmark-placeholder"},
+}
+
+
+def _environment(overrides: Dict[str, Optional[str]]) -> Dict[str, str]:
+    env = dict(os.environ)
+    for name, value in overrides.items():
+        if value is None:
+            env.pop(name, None)
+        else:
+            env[name] = value
+    return env
+
+
+def get_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc, or psutil when installed)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import psutil
+        return round(psutil.Process(pid).memory_info().rss / (1024 * 1024), 1)
+    except Exception:
+        return None
+
+
+def _stop(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def bench_stdio(timeout: float = 60.0, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Time from spawn until the stdio server answers initialize."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mcp_server_main"],
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        process.stdin.write(json.dumps(INITIALIZE_REQUEST) + "\n")
+        process.stdin.flush()
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"stdio server exited with code {process.poll()} before answering initialize")
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if message.get("id") == 1:
+                ready = time.perf_counter() - start
+                return {"time_to_ready_s": round(ready, 3), "rss_mb": get_rss_mb(process.pid)}
+        raise TimeoutError("stdio server did not answer initialize in time")
+    finally:
+        _stop(process)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def bench_asgi(timeout: float = 60.0, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Time from spawn until asgi_app serves /health."""
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "asgi_app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"asgi server exited with code {process.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        ready = time.perf_counter() - start
+                        return {"time_to_ready_s": round(ready, 3), "rss_mb": get_rss_mb(process.pid)}
+            except OSError:
+                pass
+            time.sleep(0.02)
+        raise TimeoutError("asgi server did not become healthy in time")
+    finally:
+        _stop(process)
+
+
+ENTRY_POINTS = {"stdio": bench_stdio, "asgi": bench_asgi}
+
+
+def run_startup_benchmark(entries: List[str],
+                          runs: int = 3,
+                          timeout: float = 60.0,
+                          configs: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Run each entry point `runs` times per configuration and report median time-to-ready and RSS."""
+    report = {}
+    for entry in entries:
+        for config in configs or list(CONFIGURATIONS):
+            env = _environment(CONFIGURATIONS[config])
+            samples, errors = [], []
+            for _ in range(runs):
+                try:
+                    samples.append(ENTRY_POINTS[entry](timeout, env))
+                except Exception as e:
+                    errors.append(str(e))
+            times = [s["time_to_ready_s"] for s in samples]
+            rss = [s["rss_mb"] for s in samples if s["rss_mb"] is not None]
+            report[f"{entry}/{config}"] = {
+                "runs": len(samples),
+                "time_to_ready_s": round(statistics.median(times), 3) if times else None,
+                "time_to_ready_min_s": min(times) if times else None,
+                "rss_mb": round(statistics.median(rss), 1) if rss else None,
+                "errors": errors,
+            }
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Time-to-ready and RSS of the stdio and ASGI entry points")
+    parser.add_argument("--bench-startup", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append",
+                        help="Entry point to benchmark (repeatable; default: all)")
+    parser.add_argument("--config", choices=sorted(CONFIGURATIONS), action="append",
+                        help="Configuration to benchmark (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    report = run_startup_benchmark(args.entry or list(ENTRY_POINTS), args.runs, args.timeout, args.config)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'entry':<15} {'runs':>4} {'ready s (median)':>17} {'ready s (min)':>14} {'RSS MB':>8}")
+    for entry, result in report.items():
+        print(f"{entry:<15} {result['runs']:>4} {str(result['time_to_ready_s']):>17} "
+              f"{str(result['time_to_ready_min_s']):>14} {str(result['rss_mb']):>8}")
+        for error in result["errors"]:
+            print(f"{'':<16}error: {error}")
+
+
+if __name__ == "__main__":
+    main()
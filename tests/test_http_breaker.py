@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from http_transport.breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from http_transport.transport import HostPool, PoolConfig, is_overload_status
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure("HTTP 503")
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("example.org", failure_threshold=3)
+    breaker.record_failure("timeout")
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("example.org", failure_threshold=2)
+    breaker.record_failure("timeout")
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED
+
+
+def test_open_circuit_rejects_requests():
+    breaker = CircuitBreaker("example.org", failure_threshold=1, recovery_timeout=30)
+    open_breaker(breaker)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request()
+    assert excinfo.value.host == "example.org"
+    assert 0 < excinfo.value.retry_in <= 30
+    assert breaker.rejected == 1
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker("example.org", failure_threshold=1, recovery_timeout=30)
+    open_breaker(breaker)
+    breaker.opened_at = time.monotonic() - 31
+    assert breaker.before_request() is True
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_probe_outcome_closes_or_reopens():
+    breaker = CircuitBreaker("example.org", failure_threshold=1, recovery_timeout=30)
+    open_breaker(breaker)
+    breaker.opened_at = time.monotonic() - 31
+    breaker.record_failure("HTTP 503", probe=breaker.before_request())
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+    breaker.opened_at = time.monotonic() - 31
+    breaker.record_success(probe=breaker.before_request())
+    assert breaker.state == CLOSED
+    assert breaker.before_request() is False
+
+
+def test_released_probe_can_be_retaken():
+    breaker = CircuitBreaker("example.org", failure_threshold=1, recovery_timeout=30)
+    open_breaker(breaker)
+    breaker.opened_at = time.monotonic() - 31
+    assert breaker.before_request() is True
+    breaker.release_probe()
+    assert breaker.before_request() is True
+
+
+@pytest.mark.parametrize("status_code, overload", [
+    (200, False), (404, False), (429, True), (500, True), (501, False),
+    (502, True), (503, True), (504, True), (505, False),
+])
+def test_overload_statuses(status_code, overload):
+    assert is_overload_status(status_code) is overload
+
+
+def send_statuses(host: str, status_codes):
+    """Send one request per status code through a HostPool answering with it."""
+    replies = iter(status_codes)
+    pool = HostPool(host, "default", PoolConfig())
+    pool.breaker.failure_threshold = 2
+    pool.transport = httpx.MockTransport(lambda request: httpx.Response(next(replies)))
+
+    async def scenario():
+        for _ in status_codes:
+            await pool.handle_async_request(httpx.Request("GET", f"https://{host}/"))
+
+    asyncio.run(scenario())
+    return pool.breaker
+
+
+def test_pool_counts_backend_failures():
+    breaker = send_statuses("breaker-503.test", [503, 500])
+    assert breaker.state == OPEN
+
+
+def test_pool_ignores_other_server_errors():
+    breaker = send_statuses("breaker-501.test", [501, 505, 501])
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
@@ -0,0 +1,146 @@
+import asyncio
+
+import httpx
+
+from http_transport.cache import HttpCache, CACHE_IMMUTABLE, CACHE_REVALIDATE, STALE_WARNING, http_cache
+from http_transport.retry import RetryPolicy
+from http_transport.transport import SharedTransport, get_host_pool
+
+
+def request(url: str = "https://example.org/decision/1", **headers) -> httpx.Request:
+    return httpx.Request("GET", url, headers=headers)
+
+
+def test_key_includes_url_and_representation_headers():
+    base = HttpCache.make_key(request())
+    assert base != HttpCache.make_key(request("https://example.org/decision/2"))
+    assert base != HttpCache.make_key(request(accept="application/json"))
+    assert base != HttpCache.make_key(request(**{"accept-language": "tr"}))
+    assert base == HttpCache.make_key(request(**{"user-agent": "other"}))
+
+
+def test_key_separates_sessions_without_storing_cookies():
+    first = HttpCache.make_key(request(cookie="ASP.NET_SessionId=abc"))
+    second = HttpCache.make_key(request(cookie="ASP.NET_SessionId=def"))
+    assert first != second
+    assert "abc" not in first
+    assert first == HttpCache.make_key(request(cookie="ASP.NET_SessionId=abc"))
+
+
+def store(cache: HttpCache, req: httpx.Request, mode: str = "revalidate", **headers) -> bool:
+    response = httpx.Response(200, headers={"etag": '"v1"', **headers}, content=b"body")
+    return cache.put(cache.make_key(req), req, response, b"body", mode)
+
+
+def test_put_requires_validators_unless_immutable():
+    cache = HttpCache()
+    req = request()
+    assert not cache.put(cache.make_key(req), req, httpx.Response(200, content=b"x"), b"x", "revalidate")
+    assert cache.put(cache.make_key(req), req, httpx.Response(200, content=b"x"), b"x", "immutable")
+
+
+def test_no_store_and_vary_star_are_not_cached():
+    cache = HttpCache()
+    assert not store(cache, request(), **{"cache-control": "no-store"})
+    assert not store(cache, request(), vary="*")
+    assert len(cache) == 0
+
+
+def test_vary_headers_must_match():
+    cache = HttpCache()
+    req = request(**{"x-client": "a"})
+    assert store(cache, req, vary="X-Client, Accept")
+    key = cache.make_key(req)
+    assert cache.get(key, req) is not None
+    assert cache.get(key, request(**{"x-client": "b"})) is None
+    assert cache.get(key, request()) is None
+
+
+def test_lru_eviction_by_size():
+    cache = HttpCache(max_bytes=80)
+    for i in range(3):
+        req = request(f"https://example.org/{i}")
+        response = httpx.Response(200, headers={"etag": '"v"'})
+        assert cache.put(cache.make_key(req), req, response, b"x" * 10, "revalidate")
+    cache.get(cache.make_key(request("https://example.org/0")))
+    req = request("https://example.org/3")
+    cache.put(cache.make_key(req), req, httpx.Response(200, headers={"etag": '"v"'}), b"x" * 10, "revalidate")
+    assert cache.size_bytes == 40
+    cache.max_bytes = 30
+    req = request("https://example.org/4")
+    cache.put(cache.make_key(req), req, httpx.Response(200, headers={"etag": '"v"'}), b"x" * 10, "revalidate")
+    assert cache.get(cache.make_key(request("https://example.org/0"))) is not None
+    assert cache.get(cache.make_key(request("https://example.org/1"))) is None
+
+
+def test_stale_response_is_marked():
+    cache = HttpCache(max_stale=60)
+    req = request()
+    store(cache, req)
+    entry = cache.get(cache.make_key(req), req)
+    assert cache.can_serve_stale(entry)
+    response = entry.to_response(req, stale=True)
+    assert response.headers["warning"] == STALE_WARNING
+    assert response.extensions["stale"] is True
+    assert "warning" not in entry.to_response(req).headers
+
+    entry.stored_at -= 61
+    assert not cache.can_serve_stale(entry)
+
+
+def fetch_twice(monkeypatch, host: str, second_reply: httpx.Response, mode=CACHE_REVALIDATE, max_stale: float = 60):
+    """Cache a page, then request it again while the server answers with second_reply."""
+    replies = iter([httpx.Response(200, headers={"etag": '"v1"'}, stream=httpx.ByteStream(b"cached")), second_reply])
+    seen = []
+
+    class Upstream(httpx.AsyncBaseTransport):
+        # Unlike httpx.MockTransport, leaves the body unread as a network transport does
+        async def handle_async_request(self, req):
+            seen.append(req)
+            return next(replies)
+
+    pool = get_host_pool(host, "default")
+    pool.transport = Upstream()
+    if pool.breaker is not None:
+        pool.breaker.failure_threshold = 100
+    transport = SharedTransport(retry_policy=RetryPolicy(max_attempts=1))
+    monkeypatch.setattr(http_cache, "max_stale", max_stale)
+
+    async def scenario():
+        first = await transport.handle_async_request(httpx.Request("GET", f"https://{host}/d", extensions=mode))
+        await first.aread()
+        second = await transport.handle_async_request(httpx.Request("GET", f"https://{host}/d", extensions=mode))
+        await second.aread()
+        return second
+
+    return asyncio.run(scenario()), seen
+
+
+def test_not_modified_is_served_from_cache(monkeypatch):
+    response, seen = fetch_twice(monkeypatch, "cache-304.test", httpx.Response(304))
+    assert response.status_code == 200
+    assert response.content == b"cached"
+    assert seen[1].headers["if-none-match"] == '"v1"'
+    assert "warning" not in response.headers
+
+
+def test_backend_failure_serves_stale_copy(monkeypatch):
+    response, _ = fetch_twice(monkeypatch, "cache-503.test", httpx.Response(503))
+    assert response.status_code == 200
+    assert response.headers["warning"] == STALE_WARNING
+
+
+def test_other_server_errors_are_passed_through(monkeypatch):
+    response, _ = fetch_twice(monkeypatch, "cache-501.test", httpx.Response(501))
+    assert response.status_code == 501
+
+
+def test_stale_copy_is_not_served_past_max_stale(monkeypatch):
+    response, _ = fetch_twice(monkeypatch, "cache-max-stale.test", httpx.Response(503), max_stale=0)
+    assert response.status_code == 503
+
+
+def test_immutable_pages_are_served_without_a_request(monkeypatch):
+    response, seen = fetch_twice(monkeypatch, "cache-immutable.test", httpx.Response(500), mode=CACHE_IMMUTABLE)
+    assert response.content == b"cached"
+    assert len(seen) == 1
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from http_transport.limiter import AdaptiveConcurrencyLimiter
+
+
+def test_overload_cuts_limit_multiplicatively():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=20)
+    limiter.on_overload(time.monotonic())
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+
+def test_overload_from_requests_started_before_the_last_cut_is_ignored():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+    started_at = time.monotonic()
+    limiter.on_overload(time.monotonic())
+    limiter.on_overload(started_at)
+    assert limiter.limit == 4
+    assert limiter.decreases == 1
+
+
+def test_limit_never_drops_below_minimum():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+    for _ in range(5):
+        limiter.on_overload(time.monotonic())
+    assert limiter.limit == 1
+
+
+def test_limit_grows_only_when_saturated():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=20)
+    limiter.on_success(0.1, time.monotonic())
+    assert limiter.limit == 4
+
+    limiter.in_flight = 3
+    limiter.on_success(0.1, time.monotonic())
+    assert limiter.limit == 4.25
+    assert limiter.increases == 1
+
+
+def test_slow_response_counts_as_congestion():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_tolerance=3.0)
+    limiter.on_success(0.1, time.monotonic())
+    limiter.on_success(1.0, time.monotonic())
+    assert limiter.limit == 9
+    assert limiter.baseline_latency == 0.1
+
+
+def test_waiters_run_when_slots_free_up():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        running = 0
+        peak = 0
+
+        async def request():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        return limiter, peak
+
+    limiter, peak = asyncio.run(scenario())
+    assert peak == 2
+    assert limiter.in_flight == 0
+    assert limiter.max_waiting == 4
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        limiter.release()
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.in_flight == 0
+    assert limiter.get_stats()["waiting"] == 0
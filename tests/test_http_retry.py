@@ -0,0 +1,109 @@
+import asyncio
+import email.utils
+import time
+
+import httpx
+import pytest
+
+from http_transport.retry import (
+    RetryPolicy,
+    RetryBudget,
+    is_retryable_error,
+    is_retryable_request,
+    parse_retry_after,
+)
+from http_transport.transport import SharedTransport, get_host_pool
+
+
+def test_backoff_is_full_jitter_capped_exponential():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=8.0)
+    for attempt, ceiling in [(1, 0.5), (2, 1.0), (3, 2.0), (6, 8.0), (10, 8.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("12", 12.0), (" 3 ", 3.0), ("soon", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    value = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= parse_retry_after(value) <= 30
+    past = email.utils.formatdate(time.time() - 30, usegmt=True)
+    assert parse_retry_after(past) == 0.0
+
+
+def test_retryable_requests():
+    assert is_retryable_request(httpx.Request("GET", "https://example.org/"))
+    assert not is_retryable_request(httpx.Request("POST", "https://example.org/"))
+    assert is_retryable_request(httpx.Request("POST", "https://example.org/"), idempotent_post=True)
+    assert not is_retryable_request(httpx.Request("GET", "https://example.org/", extensions={"retry": False}))
+    assert is_retryable_request(httpx.Request("POST", "https://example.org/", extensions={"retry": True}))
+
+
+def test_retryable_errors():
+    assert is_retryable_error(httpx.ConnectError("refused"))
+    assert is_retryable_error(httpx.ReadTimeout("slow"))
+    assert not is_retryable_error(httpx.PoolTimeout("pool full"))
+    assert not is_retryable_error(ValueError("bad"))
+
+
+def test_retry_budget_limits_retries_to_a_ratio_of_requests():
+    budget = RetryBudget(ratio=0.5, min_tokens=2)
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+    budget.on_request()
+    budget.on_request()
+    assert budget.try_spend()
+    assert budget.get_stats() == {"tokens": 0.0, "retries": 3, "budget_exhausted": 1}
+
+
+def send(host: str, method: str, replies, **transport_kwargs):
+    """Send one request through SharedTransport to a pool answering with `replies` in turn."""
+    replies = iter(replies)
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return next(replies)
+
+    pool = get_host_pool(host, "default")
+    pool.transport = httpx.MockTransport(handler)
+    if pool.breaker is not None:
+        pool.breaker.failure_threshold = 100
+    transport = SharedTransport(retry_policy=RetryPolicy(backoff_base=0.01), **transport_kwargs)
+
+    async def scenario():
+        return await transport.handle_async_request(httpx.Request(method, f"https://{host}/"))
+
+    return asyncio.run(scenario()), seen
+
+
+def test_get_is_retried_after_retry_after():
+    response, seen = send("retry-get.test", "GET", [
+        httpx.Response(503, headers={"Retry-After": "0"}),
+        httpx.Response(200),
+    ])
+    assert response.status_code == 200
+    assert len(seen) == 2
+
+
+def test_post_is_not_retried_unless_idempotent():
+    response, seen = send("retry-post.test", "POST", [httpx.Response(503), httpx.Response(200)])
+    assert response.status_code == 503
+    assert len(seen) == 1
+
+    response, seen = send("retry-post-idempotent.test", "POST", [httpx.Response(503), httpx.Response(200)],
+                          idempotent_post=True)
+    assert response.status_code == 200
+    assert len(seen) == 2
+
+
+def test_non_retryable_status_is_returned_at_once():
+    response, seen = send("retry-500.test", "GET", [httpx.Response(500), httpx.Response(200)])
+    assert response.status_code == 500
+    assert len(seen) == 1
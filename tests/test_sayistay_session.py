@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+
+from http_transport import deadline_scope, remaining
+from sayistay_mcp_module.client import SayistayApiClient
+from sayistay_mcp_module.session import SayistaySessionManager, SessionInitError
+
+PAGE = '<form><input name="__RequestVerificationToken" value="token-{}"></form>'
+
+
+def make_manager(handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://example.test")
+    return SayistaySessionManager(client, {"daire": "/Daire"}, **kwargs)
+
+
+def html(status_code, text, content_type="text/html; charset=utf-8"):
+    return httpx.Response(status_code, text=text, headers={"content-type": content_type})
+
+
+@pytest.mark.parametrize("response, expired", [
+    (html(403, "Forbidden"), True),
+    (html(400, 'The required anti-forgery form field "__RequestVerificationToken" is not present.'), True),
+    (html(400, '{"error": "invalid date"}', "application/json"), False),
+    (html(200, '<a href="/Account/Login">Giriş</a>'), True),
+    (html(200, '{"data": []}', "application/json"), False),
+    (html(500, "__RequestVerificationToken"), False),
+    (html(502, "Bad Gateway"), False),
+])
+def test_is_session_expired(response, expired):
+    assert SayistayApiClient._is_session_expired(response) is expired
+
+
+def test_concurrent_callers_share_one_initialization():
+    requests = []
+
+    async def scenario():
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return html(200, PAGE.format(len(requests)))
+
+        manager = make_manager(handler)
+        tokens = await asyncio.gather(*(manager.get_token("daire") for _ in range(5)))
+        return manager, tokens
+
+    manager, tokens = asyncio.run(scenario())
+    assert len(requests) == 1
+    assert tokens == ["token-1"] * 5
+    assert manager.initializations == 1
+
+
+def test_invalidate_drops_only_the_rejected_token():
+    async def scenario():
+        calls = []
+        manager = make_manager(lambda request: calls.append(request) or html(200, PAGE.format(len(calls))))
+        first = await manager.get_token("daire")
+        manager.invalidate("daire", "stale-token")
+        assert await manager.get_token("daire") == first
+        manager.invalidate("daire", first)
+        return manager, await manager.get_token("daire")
+
+    manager, token = asyncio.run(scenario())
+    assert token == "token-2"
+    assert manager.invalidations == 1
+
+
+def test_missing_token_and_unknown_endpoint_raise():
+    async def scenario():
+        manager = make_manager(lambda request: html(200, "<form></form>"))
+        with pytest.raises(SessionInitError):
+            await manager.get_token("daire")
+        with pytest.raises(ValueError):
+            await manager.get_token("genel_kurul")
+
+    asyncio.run(scenario())
+
+
+def test_initialization_does_not_inherit_the_caller_deadline():
+    seen = []
+
+    async def scenario():
+        def handler(request):
+            seen.append(remaining())
+            return html(200, PAGE.format(1))
+
+        manager = make_manager(handler)
+        with deadline_scope(5):
+            assert remaining() is not None
+            await manager.get_token("daire")
+
+    asyncio.run(scenario())
+    assert seen == [None]
+
+
+def test_old_tokens_are_refreshed_in_the_background(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("sayistay_mcp_module.session.time.monotonic", lambda: now[0])
+
+    async def scenario():
+        calls = []
+        manager = make_manager(lambda request: calls.append(request) or html(200, PAGE.format(len(calls))), max_age=100)
+        first = await manager.get_token("daire")
+        now[0] += 90
+        # Still valid: the current token is returned while a refresh starts
+        assert await manager.get_token("daire") == first
+        await manager._pending["daire"]
+        refreshed = await manager.get_token("daire")
+        now[0] += 200
+        expired = await manager.get_token("daire")
+        return manager, refreshed, expired
+
+    manager, refreshed, expired = asyncio.run(scenario())
+    assert (refreshed, expired) == ("token-2", "token-3")
+    assert manager.background_refreshes == 1
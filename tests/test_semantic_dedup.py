@@ -0,0 +1,61 @@
+import pytest
+
+from semantic_search.dedup import NearDuplicateIndex
+
+DECISION = (
+    "Davacı vekili dava dilekçesinde müvekkilinin davalı şirkette uzun yıllar çalıştığını, "
+    "iş sözleşmesinin haklı bir neden olmaksızın feshedildiğini, kıdem ve ihbar tazminatı ile "
+    "fazla mesai ücretlerinin ödenmediğini ileri sürerek alacakların faiziyle birlikte tahsilini "
+    "talep etmiştir. Mahkemece davanın kısmen kabulüne karar verilmiş, hüküm davalı vekili "
+    "tarafından istinaf edilmiştir. Dosya kapsamına göre istinaf başvurusunun esastan reddine "
+    "oybirliğiyle karar verildi."
+)
+REPUBLISHED = DECISION.replace("oybirliğiyle karar verildi.", "oybirliğiyle karar verildi. Esas No 2023/15")
+UNRELATED = (
+    "Anayasa Mahkemesi başvurucunun ifade özgürlüğünün ihlal edildiğine, yeniden yargılama "
+    "yapılmak üzere kararın bir örneğinin ilgili mahkemeye gönderilmesine ve başvurucuya manevi "
+    "tazminat ödenmesine karar vermiştir."
+)
+
+
+def test_republished_decision_is_a_duplicate():
+    index = NearDuplicateIndex()
+    for doc_id, text in (("yerel", DECISION), ("istinaf", REPUBLISHED), ("aym", UNRELATED)):
+        assert index.add(doc_id, text)
+    assert index.duplicates_of("yerel") == ["istinaf"]
+    assert index.duplicates_of("aym") == []
+    assert index.similarity("yerel", "istinaf") >= index.threshold
+    assert index.similarity("yerel", "missing") is None
+
+
+def test_add_skips_known_and_empty_documents():
+    index = NearDuplicateIndex()
+    assert index.add("1", DECISION)
+    assert not index.add("1", UNRELATED)
+    assert not index.add("2", "")
+    assert not index.add("3", "  ... ")
+    assert len(index) == 1 and "1" in index
+
+
+def test_collapse_keeps_the_best_ranked_copy():
+    index = NearDuplicateIndex()
+    index.add("yerel", DECISION)
+    index.add("istinaf", REPUBLISHED)
+    index.add("aym", UNRELATED)
+    kept, collapsed = index.collapse(["istinaf", "aym", "unindexed", "yerel"])
+    assert kept == ["istinaf", "aym", "unindexed"]
+    assert collapsed == {"istinaf": ["yerel"]}
+
+
+def test_oldest_signatures_are_evicted_with_their_buckets():
+    index = NearDuplicateIndex(max_entries=1)
+    index.add("yerel", DECISION)
+    index.add("istinaf", REPUBLISHED)
+    assert "yerel" not in index
+    assert index.duplicates_of("istinaf") == []
+    assert index.get_stats()["buckets"] == index.bands
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=100, bands=16)
@@ -0,0 +1,70 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from semantic_search.dispatcher import EmbeddingDispatcher
+
+
+class FakeEmbedder:
+    """Embeds a text as a one-hot vector of its length; texts containing 'bad' fail the call."""
+    dimension = 16
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        if any("bad" in text for text in texts):
+            raise RuntimeError("provider rejected the batch")
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        vectors[np.arange(len(texts)), [len(text) % self.dimension for text in texts]] = 1.0
+        return vectors
+
+
+def run(dispatcher, *requests):
+    async def scenario():
+        return await asyncio.gather(*(dispatcher.embed_texts(texts) for texts in requests), return_exceptions=True)
+    return asyncio.run(scenario())
+
+
+def test_concurrent_requests_share_one_call_and_get_their_own_rows():
+    embedder = FakeEmbedder()
+    dispatcher = EmbeddingDispatcher(embedder, max_batch_size=10, max_wait_ms=20)
+    first, second = run(dispatcher, ["a", "bb"], ["ccc"])
+    assert len(embedder.calls) == 1
+    assert first.shape == (2, 16) and second.shape == (1, 16)
+    assert first[1, 2] == 1.0 and second[0, 3] == 1.0
+    assert dispatcher.get_stats()["avg_texts_per_call"] == 3
+
+
+def test_large_batches_are_split_into_calls_of_max_batch_size():
+    embedder = FakeEmbedder()
+    dispatcher = EmbeddingDispatcher(embedder, max_batch_size=2, max_wait_ms=20)
+    (result,) = run(dispatcher, ["a", "b", "c", "d", "e"])
+    assert result.shape == (5, 16)
+    assert [len(call) for call in embedder.calls] == [2, 2, 1]
+
+
+def test_failed_batch_fails_only_the_bad_request():
+    embedder = FakeEmbedder()
+    dispatcher = EmbeddingDispatcher(embedder, max_batch_size=10, max_wait_ms=20)
+    good, bad, other = run(dispatcher, ["a"], ["bad input"], ["ccc"])
+    assert isinstance(bad, RuntimeError)
+    assert good.shape == (1, 16) and other.shape == (1, 16)
+    assert dispatcher.split_retries == 1
+    assert len(embedder.calls) == 4
+
+
+def test_single_request_failure_is_raised():
+    dispatcher = EmbeddingDispatcher(FakeEmbedder(), max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        asyncio.run(dispatcher.embed_texts(["bad"]))
+    assert dispatcher.split_retries == 0
+
+
+def test_empty_request_needs_no_call():
+    embedder = FakeEmbedder()
+    dispatcher = EmbeddingDispatcher(embedder)
+    assert asyncio.run(dispatcher.embed_texts([])).shape == (0, 16)
+    assert embedder.calls == []
@@ -0,0 +1,32 @@
+from semantic_search.rerank import fuse_with_upstream_order
+
+
+def test_fusion_without_scores_keeps_upstream_order():
+    upstream = ["a", "b", "c", "d"]
+    assert fuse_with_upstream_order(upstream, []) == upstream
+
+
+def test_fusion_returns_every_upstream_item_once():
+    upstream = [f"d{i}" for i in range(30)]
+    fused = fuse_with_upstream_order(upstream, ["d29", "d15", "d3"])
+    assert sorted(fused) == sorted(upstream)
+
+
+def test_similarity_pulls_a_late_item_forward():
+    upstream = [f"d{i}" for i in range(100)]
+    fused = fuse_with_upstream_order(upstream, ["d90"] + upstream[:20])
+    assert fused.index("d90") < 20
+
+
+def test_upstream_order_breaks_ties_between_equally_scored_items():
+    upstream = [f"d{i}" for i in range(10)]
+    fused = fuse_with_upstream_order(upstream, list(upstream))
+    assert fused == upstream
+
+
+def test_unscored_items_sit_between_best_and_worst_scored():
+    upstream = [f"d{i}" for i in range(20)]
+    scored = ["d19", "d18"] + [f"d{i}" for i in range(10)]
+    fused = fuse_with_upstream_order(upstream, scored)
+    assert fused.index("d19") < fused.index("d12") < fused.index("d9")
+
@@ -0,0 +1,69 @@
+import numpy as np
+
+from semantic_search.cache import ResultCache
+from semantic_search.vector_store import VectorStore
+
+
+def test_make_key_normalizes_strings_and_sets():
+    assert ResultCache.make_key("v1", "  kira   tespiti ", ["b", "a", "a "]) == \
+        ResultCache.make_key("v1", "kira tespiti", ["a", "b"])
+
+
+def test_make_key_keeps_tuple_order_and_boundaries():
+    assert ResultCache.make_key("v1", ("a", "b")) != ResultCache.make_key("v1", ("b", "a"))
+    assert ResultCache.make_key("v1", ("a b", "c")) != ResultCache.make_key("v1", ("a", "b c"))
+    assert ResultCache.make_key("v1", (" a  b ",)) == ResultCache.make_key("v1", ("a b",))
+
+
+def test_make_key_depends_on_version_and_scalars():
+    assert ResultCache.make_key("v1", "q", 10) != ResultCache.make_key("v2", "q", 10)
+    assert ResultCache.make_key("v1", "q", 10) != ResultCache.make_key("v1", "q", 11)
+    assert ResultCache.make_key("v1", "q", None) != ResultCache.make_key("v1", "q", "")
+
+
+def test_get_returns_copies():
+    cache = ResultCache()
+    response = {"results": [{"id": "1"}]}
+    cache.put("k", response)
+    response["results"].append({"id": "2"})
+    cached = cache.get("k")
+    assert cached == {"results": [{"id": "1"}]}
+    cached["results"].clear()
+    assert cache.get("k") == {"results": [{"id": "1"}]}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("semantic_search.cache.time.monotonic", lambda: now[0])
+    cache = ResultCache(ttl_seconds=60)
+    cache.put("k", {"ok": True})
+    now[0] += 59
+    assert cache.get("k") == {"ok": True}
+    now[0] += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+    stats = cache.get_stats()
+    assert stats["expired"] == 1 and stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {})
+    cache.put("b", {})
+    cache.get("a")
+    cache.put("c", {})
+    assert cache.get("b") is None
+    assert cache.get("a") == {} and cache.get("c") == {}
+
+
+def test_store_version_changes_on_add_and_clear():
+    store = VectorStore(dimension=4)
+    versions = [store.version]
+    store.add_documents(["1"], ["text"], np.eye(4, dtype=np.float32)[:1])
+    versions.append(store.version)
+    store.add_documents([], [], np.empty((0, 4), dtype=np.float32))
+    assert store.version == versions[-1]
+    store.clear()
+    versions.append(store.version)
+    assert len(set(versions)) == 3
+    assert VectorStore(dimension=4).version not in versions
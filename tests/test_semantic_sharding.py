@@ -0,0 +1,75 @@
+import numpy as np
+
+from semantic_search.sharding import ShardPool, merge_top_k
+from semantic_search.vector_store import top_k_rows
+
+
+def unit_rows(count, dimension=8, seed=0):
+    rows = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def test_merge_top_k_orders_across_shards():
+    partials = [
+        (np.array([0, 1]), np.array([0.9, 0.2], dtype=np.float32)),
+        (np.array([5, 6]), np.array([0.95, 0.5], dtype=np.float32)),
+    ]
+    indices, scores = merge_top_k(partials, 3)
+    assert indices.tolist() == [5, 0, 6]
+    assert np.allclose(scores, [0.95, 0.9, 0.5])
+
+
+def test_merge_top_k_skips_empty_shards_and_short_results():
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+    indices, scores = merge_top_k([empty, (np.array([3]), np.array([0.4], dtype=np.float32))], 10)
+    assert indices.tolist() == [3]
+    indices, scores = merge_top_k([empty, empty], 5)
+    assert len(indices) == 0 and len(scores) == 0
+
+
+def test_merged_shards_match_a_single_search():
+    embeddings = unit_rows(50)
+    queries = unit_rows(3, seed=1)
+    expected = top_k_rows(embeddings, queries, 7)
+    bounds = [0, 17, 33, 50]
+    per_shard = [
+        [(rows + start, scores) for rows, scores in top_k_rows(embeddings[start:end], queries, 7)]
+        for start, end in zip(bounds, bounds[1:])
+    ]
+    for q, (rows, scores) in enumerate(expected):
+        indices, merged = merge_top_k([partials[q] for partials in per_shard], 7)
+        assert indices.tolist() == rows.tolist()
+        assert np.allclose(merged, scores)
+
+
+def test_top_k_rows_applies_mask_and_threshold():
+    embeddings = np.eye(4, dtype=np.float32)
+    query = np.array([[1.0, 0.5, 0.0, 0.0]], dtype=np.float32)
+    (rows, scores), = top_k_rows(embeddings, query, 4, threshold=0.1)
+    assert rows.tolist() == [0, 1]
+    (rows, _), = top_k_rows(embeddings, query, 4, mask=np.array([False, True, True, True]))
+    assert rows[0] == 1 and 0 not in rows.tolist()
+
+
+def test_shard_pool_search_matches_store_rows(tmp_path):
+    embeddings = unit_rows(20)
+    state = {
+        "embeddings": embeddings,
+        "court_type_codes": np.zeros(20, dtype=np.int32),
+        "chamber_codes": np.zeros(20, dtype=np.int32),
+        "date_ordinals": np.arange(20, dtype=np.int32),
+    }
+    queries = unit_rows(2, seed=2)
+    pool = ShardPool(2, directory=str(tmp_path))
+    try:
+        pool.publish(state, 20)
+        results = pool.search_batch(queries, 5, None, None, {}, {})
+        # Rows added after a publish stay out of the shards until the next one
+        pool.publish(state, 10)
+        partial = pool.search_batch(queries, 5, None, None, {}, {})
+    finally:
+        pool.close()
+    for q, (rows, _) in enumerate(top_k_rows(embeddings, queries, 5)):
+        assert merge_top_k(results[q], 5)[0].tolist() == rows.tolist()
+        assert max(merge_top_k(partial[q], 5)[0]) < 10
+    assert len(list(tmp_path.iterdir())) == 1
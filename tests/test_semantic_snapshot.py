@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+
+import numpy as np
+import pytest
+
+from semantic_search.cache import PreviewCache, EmbeddingCache
+from semantic_search.snapshot import save_snapshot, load_snapshot, CURRENT_NAME, MANIFEST_NAME, KEEP_VERSIONS
+from semantic_search.vector_store import VectorStore, MetadataFilter
+
+DIMENSION = 8
+MODEL = "test-model"
+
+
+def unit_rows(count: int, seed: int = 0) -> np.ndarray:
+    rows = np.random.default_rng(seed).normal(size=(count, DIMENSION)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+def build_store() -> VectorStore:
+    store = VectorStore(dimension=DIMENSION)
+    store.add_documents(
+        ids=["a", "b", "c"],
+        texts=["first", "second", "third"],
+        embeddings=unit_rows(3),
+        metadata=[
+            {"court_type": "YARGITAYKARARI", "birim_adi": "1. Hukuk Dairesi", "karar_tarihi": "01.02.2020"},
+            {"court_type": "DANISTAYKARAR", "birim_adi": "5. Daire", "karar_tarihi": "2021-03-04"},
+            {"court_type": "YARGITAYKARARI", "birim_adi": "2. Hukuk Dairesi"},
+        ],
+    )
+    return store
+
+
+def save(directory, store=None, **kwargs):
+    return save_snapshot(str(directory), store or build_store(), model=MODEL, **kwargs)
+
+
+def load(directory, **kwargs):
+    kwargs.setdefault("model", MODEL)
+    kwargs.setdefault("dimension", DIMENSION)
+    return asyncio.run(load_snapshot(str(directory), **kwargs))
+
+
+def test_round_trip_restores_documents_and_search(tmp_path):
+    store = build_store()
+    previews = PreviewCache()
+    previews.put("a", "preview of a")
+    query_cache = EmbeddingCache()
+    query_cache.put("kira", unit_rows(1, seed=1)[0])
+    manifest = save(tmp_path, store, preview_cache=previews, embedding_cache=query_cache)
+    assert manifest["num_documents"] == 3
+
+    snapshot = load(tmp_path)
+    restored = snapshot.vector_store
+    assert restored.size() == 3
+    assert restored.get_by_id("b").metadata["birim_adi"] == "5. Daire"
+    np.testing.assert_array_equal(restored.embeddings, store.embeddings)
+    assert snapshot.previews == {"a": "preview of a"}
+    assert snapshot.query_embedding_keys == ["kira"]
+    np.testing.assert_allclose(snapshot.query_embeddings[0], query_cache.get("kira"))
+
+    query = unit_rows(1, seed=2)[0]
+    expected = [(doc.id, score) for doc, score in store.search(query, top_k=3)]
+    assert [(doc.id, score) for doc, score in restored.search(query, top_k=3)] == expected
+
+    filters = MetadataFilter(court_types=["YARGITAYKARARI"], date_from="2020-01-01")
+    assert [doc.id for doc, _ in restored.search(query, top_k=3, filters=filters)] == ["a"]
+
+
+def test_restored_store_accepts_new_documents(tmp_path):
+    save(tmp_path)
+    restored = load(tmp_path, max_documents=10).vector_store
+    version = restored.version
+    restored.add_documents(["d"], ["fourth"], unit_rows(1, seed=3), [{"court_type": "DANISTAYKARAR"}])
+    assert restored.size() == 4
+    assert restored.version != version
+    assert [doc.id for doc, _ in restored.search(unit_rows(1, seed=3)[0], top_k=1)] == ["d"]
+
+
+def test_current_points_to_newest_version_and_old_versions_are_pruned(tmp_path):
+    for _ in range(KEEP_VERSIONS + 2):
+        save(tmp_path)
+    versions = sorted(name for name in os.listdir(tmp_path) if os.path.isdir(tmp_path / name))
+    assert len(versions) == KEEP_VERSIONS
+    assert (tmp_path / CURRENT_NAME).read_text() == versions[-1]
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"model": "other-model"}, "model"),
+    ({"dimension": DIMENSION * 2}, "dimension"),
+])
+def test_snapshot_for_another_embedding_space_is_refused(tmp_path, kwargs, message):
+    save(tmp_path)
+    with pytest.raises(ValueError, match=message):
+        load(tmp_path, **kwargs)
+
+
+def current_version(directory):
+    return directory / (directory / CURRENT_NAME).read_text()
+
+
+def test_unknown_format_version_is_refused(tmp_path):
+    save(tmp_path)
+    manifest_path = current_version(tmp_path) / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest["format_version"] = 999
+    manifest_path.write_text(json.dumps(manifest))
+    with pytest.raises(ValueError, match="format version"):
+        load(tmp_path)
+
+
+def test_corrupted_file_is_refused(tmp_path):
+    save(tmp_path)
+    documents = current_version(tmp_path) / "documents.json"
+    documents.write_text(documents.read_text().replace("first", "FIRST"))
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        load(tmp_path)
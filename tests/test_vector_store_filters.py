@@ -0,0 +1,63 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from semantic_search.vector_store import MISSING_CODE, MetadataFilter, build_filter_mask, to_day_ordinal
+
+COURT_TYPES = {"YARGITAYKARARI": 0, "DANISTAYKARAR": 1}
+CHAMBERS = {"1. Hukuk Dairesi": 0, "5. Daire": 1}
+
+
+@pytest.mark.parametrize("value", [
+    "15.06.2021", "2021-06-15", "15/06/2021", "2021-06-15T00:00:00.000Z", " 2021-06-15 ",
+    date(2021, 6, 15), datetime(2021, 6, 15, 13, 30),
+])
+def test_to_day_ordinal_formats(value):
+    assert to_day_ordinal(value) == date(2021, 6, 15).toordinal()
+
+
+@pytest.mark.parametrize("value", [None, "", "yesterday", "31.02.2021", "2021/06/15"])
+def test_to_day_ordinal_unparseable(value):
+    assert to_day_ordinal(value) == MISSING_CODE
+
+
+def mask(filters):
+    court_type_codes = np.array([0, 1, 0, MISSING_CODE], dtype=np.int32)
+    chamber_codes = np.array([0, 1, MISSING_CODE, 0], dtype=np.int32)
+    date_ordinals = np.array([
+        to_day_ordinal("01.01.2020"), to_day_ordinal("01.01.2021"), MISSING_CODE, to_day_ordinal("01.01.2022"),
+    ], dtype=np.int32)
+    result = build_filter_mask(filters, court_type_codes, chamber_codes, date_ordinals, COURT_TYPES, CHAMBERS)
+    return None if result is None else result.tolist()
+
+
+def test_empty_filter_selects_everything():
+    assert mask(None) is None
+    assert mask(MetadataFilter()) is None
+    assert mask(MetadataFilter(court_types=[], chambers=[])) is None
+
+
+def test_categorical_filters():
+    assert mask(MetadataFilter(court_types=["YARGITAYKARARI"])) == [True, False, True, False]
+    assert mask(MetadataFilter(chambers=["5. Daire", "1. Hukuk Dairesi"])) == [True, True, False, True]
+    assert mask(MetadataFilter(court_types=["YARGITAYKARARI"], chambers=["1. Hukuk Dairesi"])) == [True, False, False, False]
+
+
+def test_unknown_category_matches_nothing():
+    assert mask(MetadataFilter(court_types=["ISTINAFHUKUK"])) == [False, False, False, False]
+
+
+def test_date_range_is_inclusive_and_skips_undated_rows():
+    assert mask(MetadataFilter(date_from="2021-01-01")) == [False, True, False, True]
+    assert mask(MetadataFilter(date_to="01.01.2021")) == [True, True, False, False]
+    assert mask(MetadataFilter(date_from="2020-06-01", date_to="2021-06-01")) == [False, True, False, False]
+
+
+@pytest.mark.parametrize("filters", [
+    MetadataFilter(date_from="last year"),
+    MetadataFilter(date_to="2021-13-01"),
+])
+def test_unparseable_date_bound_is_rejected(filters):
+    with pytest.raises(ValueError, match="Unrecognized"):
+        mask(filters)
@@ -1,15 +1,15 @@
 # uyusmazlik_mcp_module/client.py
 
 import httpx 
-from bs4 import BeautifulSoup
 from typing import Dict, Any, List, Optional, Union, Tuple 
 import logging
 import html
 import re
 import io
-from markitdown import MarkItDown
 from urllib.parse import urljoin
 
+from http_transport import create_http_client, CACHE_IMMUTABLE
+from lazy_imports import lazy_import
 from .models import (
     UyusmazlikSearchRequest,
     UyusmazlikApiDecisionEntry,
@@ -20,6 +20,9 @@ from .models import (
     UyusmazlikKararSonucuEnum
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 if not logger.hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -57,8 +60,9 @@ class UyusmazlikApiClient:
     def __init__(self, request_timeout: float = 30.0):
         self.request_timeout = request_timeout
         # Create shared httpx client for all requests
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
+            idempotent_post=True,  # Search/document POSTs are read-only
             headers={
                 "Accept": "*/*",
                 "Accept-Encoding": "gzip, deflate, br, zstd", 
@@ -68,7 +72,14 @@ class UyusmazlikApiClient:
                 "Referer": self.BASE_URL + "/",
             },
             timeout=request_timeout,
-            verify=False
+            tls_profile="insecure"
+        )
+        # Document pages are plain HTML GETs without the XHR headers; the client
+        # shares the host's connection pool with http_client
+        self.document_client = create_http_client(
+            headers={"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"},
+            timeout=request_timeout,
+            tls_profile="insecure"
         )
 
 
@@ -143,7 +154,7 @@ class UyusmazlikApiClient:
             raise
 
         # --- HTML Parsing (remains the same as previous version) ---
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = bs4.BeautifulSoup(html_content, 'html.parser')
         total_records_text_div = soup.find("div", class_="pull-right label label-important")
         total_records = None
         if total_records_text_div:
@@ -208,7 +219,7 @@ class UyusmazlikApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_text = conversion_result.text_content
             logger.info("UyusmazlikApiClient: HTML to Markdown conversion successful.")
@@ -222,9 +233,7 @@ class UyusmazlikApiClient:
         """
         logger.info(f"UyusmazlikApiClient (httpx for docs): Fetching Uyuşmazlık document for Markdown from URL: {document_url}")
         try:
-            # Using a new httpx.AsyncClient instance for this GET request for simplicity
-            async with httpx.AsyncClient(verify=False, timeout=self.request_timeout) as doc_fetch_client:
-                 get_response = await doc_fetch_client.get(document_url, headers={"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"})
+            get_response = await self.document_client.get(document_url, extensions=CACHE_IMMUTABLE)
             get_response.raise_for_status()
             html_content_from_api = get_response.text
 
@@ -245,6 +254,7 @@ class UyusmazlikApiClient:
         """Close the shared httpx client session."""
         if hasattr(self, 'http_client') and self.http_client:
             await self.http_client.aclose()
+            await self.document_client.aclose()
             logger.info("UyusmazlikApiClient: HTTP client session closed.")
         else:
             logger.info("UyusmazlikApiClient: No persistent client session from __init__ to close.")
\ No newline at end of file
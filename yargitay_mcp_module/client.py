@@ -1,14 +1,14 @@
 # yargitay_mcp_module/client.py
 
 import httpx
-from bs4 import BeautifulSoup # Still needed for pre-processing HTML before markitdown
 from typing import Dict, Any, List, Optional
 import logging
 import html
 import re
 import io
-from markitdown import MarkItDown
 
+from http_transport import create_http_client
+from lazy_imports import lazy_import
 from .models import (
     YargitayDetailedSearchRequest,
     YargitayApiSearchResponse,      
@@ -17,6 +17,9 @@ from .models import (
     CompactYargitaySearchResult 
 )
 
+markitdown = lazy_import("markitdown")
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 # Basic logging configuration if no handlers are configured
 if not logger.hasHandlers():
@@ -34,8 +37,9 @@ class YargitayOfficialApiClient:
     DOCUMENT_ENDPOINT = "/getDokuman"
 
     def __init__(self, request_timeout: float = 60.0):
-        self.http_client = httpx.AsyncClient(
+        self.http_client = create_http_client(
             base_url=self.BASE_URL,
+            idempotent_post=True,  # Search/document POSTs are read-only
             headers={
                 "Content-Type": "application/json; charset=UTF-8",
                 "Accept": "application/json, text/plain, */*",
@@ -44,7 +48,7 @@ class YargitayOfficialApiClient:
                 "Referer": f"{self.BASE_URL}/" # Some APIs might check referer
             },
             timeout=request_timeout,
-            verify=False # SSL verification disabled as per original user code - use with caution
+            tls_profile="insecure" # SSL verification disabled as per original user code - use with caution
         )
 
     async def search_detailed_decisions(
@@ -126,7 +130,7 @@ class YargitayOfficialApiClient:
             html_stream = io.BytesIO(html_bytes)
             
             # Pass BytesIO stream to MarkItDown to avoid temp file creation
-            md_converter = MarkItDown()
+            md_converter = markitdown.MarkItDown()
             conversion_result = md_converter.convert(html_stream)
             markdown_output = conversion_result.text_content
             